@@ -2,55 +2,113 @@
 import asyncio
 import json
 import logging
-from typing import List
+import queue
+import threading
+import uuid
+from typing import Any, Coroutine, Optional, TypeVar
 
 import streamlit as st
 from pydantic import BaseModel
 
+from janus import events
 from janus.agent import StandardPlannerAgent
-from janus.memory import InMemoryWorkingMemory
-from janus.models import ChatMessage, Role
+from janus.events import EventPipeline, PipelineHandler, RingBufferSink
+from janus.memory import BaseMemory
+from janus.models import ChatMessage, EventType, Role
 from janus.orchestrator import AsyncLocalOrchestrator
+from janus.sqlite_memory import SQLiteMemoryStore
 from janus.tool import ToolRegistry, agent_tool
 
 # Configure logging
-class ListLogHandler(logging.Handler):
-    def __init__(self, log_list):
-        super().__init__()
-        self.log_list = log_list
+@st.cache_resource
+def get_event_log() -> RingBufferSink:
+    """
+    Routes janus logs and events, once per server, through a bounded
+    pipeline that formats and stores them off the event loop.
+    """
+    log_sink = RingBufferSink(capacity=500)
+    pipeline = EventPipeline([log_sink], sample_rates={"memory.add": 0.1})
+    pipeline.start()
+    events.set_pipeline(pipeline)
+    app_logger = logging.getLogger("janus")
+    app_logger.addHandler(PipelineHandler(pipeline))
+    app_logger.setLevel(logging.INFO)
+    return log_sink
+
+
+log_sink = get_event_log()
+
+T = TypeVar("T")
+
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    One event loop per server, running on a background thread. Every turn
+    runs on it, so the pooled LLM client and its keep-alive connections
+    (kept per event loop) are reused across turns and sessions, and the
+    shared memory store and tool registry only ever see this loop.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="janus-loop", daemon=True).start()
+    return loop
 
-    def emit(self, record):
-        self.log_list.append(self.format(record))
 
-log_messages: List[str] = []
-list_handler = ListLogHandler(log_messages)
-app_logger = logging.getLogger("janus")
-app_logger.addHandler(list_handler)
-app_logger.setLevel(logging.INFO)
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a coroutine on the shared loop and waits for its result.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
 
 # Define a demo tool
 class GetWeatherArgs(BaseModel):
     location: str
 
-@agent_tool(args_schema=GetWeatherArgs)
+@agent_tool(
+    args_schema=GetWeatherArgs, cacheable=True, cache_ttl=300, side_effect_free=True
+)
 async def get_weather(location: str) -> str:
     """Gets the weather for a given location."""
     # In a real scenario, this would call a weather API
     return f"The weather in {location} is sunny."
 
 
+@st.cache_resource
+def get_tool_registry() -> ToolRegistry:
+    """
+    One tool registry per server, so cached tool results are shared across
+    sessions and turns.
+    """
+    tool_registry = ToolRegistry()
+    tool_registry.register(get_weather)
+    return tool_registry
+
+
+@st.cache_resource
+def get_memory_store() -> SQLiteMemoryStore:
+    """
+    One durable memory store shared by every browser session of this server.
+    """
+    return SQLiteMemoryStore("janus_memory.db")
+
+
 async def run_orchestration(
-    api_key: str, memory: InMemoryWorkingMemory, user_prompt: str
+    api_key: str,
+    memory: BaseMemory,
+    user_prompt: str,
+    updates: "queue.Queue[Optional[str]]",
 ):
     """
-    Sets up and runs the agent orchestration for a single turn.
+    Sets up and runs the agent orchestration for a single turn, putting the
+    text to display into ``updates`` as the reply is generated, then None.
+    Streamlit elements can only be updated from the script thread, not
+    from the loop thread this runs on.
     """
     # Initialize tools
-    tool_registry = ToolRegistry()
-    tool_registry.register(get_weather)
+    tool_registry = get_tool_registry()
 
     # Initialize agent and orchestrator
-    agent = StandardPlannerAgent(api_key=api_key)
+    agent = StandardPlannerAgent(api_key=api_key, speculative_tools=True)
     orchestrator = AsyncLocalOrchestrator(
         agent=agent,
         tools=tool_registry,
@@ -62,8 +120,18 @@ async def run_orchestration(
 
     # Run the orchestrator. The agent will get the full message history from memory.
     initial_state = {}
-    async for _ in orchestrator.run(initial_state):
-        pass
+    reply = ""
+    try:
+        async for event in orchestrator.run_stream(initial_state):
+            if event.type == EventType.TOKEN:
+                reply += event.data["delta"]
+                updates.put(reply)
+            elif event.type == EventType.TOOL_CALL_STARTED:
+                updates.put(f"Calling `{event.data['name']}`...")
+            elif event.type == EventType.STEP_DONE:
+                reply = ""
+    finally:
+        updates.put(None)
 
 
 # Streamlit UI
@@ -86,31 +154,36 @@ with col1:
         if not api_key:
             st.warning("Please enter your OpenAI API Key in the sidebar.")
         else:
-            log_messages.clear()
+            log_sink.clear()
             with st.spinner("Agent is thinking..."):
                 # Initialize memory
-                if "memory" not in st.session_state:
-                    st.session_state.memory = InMemoryWorkingMemory()
-                memory = st.session_state.memory
+                if "session_id" not in st.session_state:
+                    st.session_state.session_id = uuid.uuid4().hex
+                memory = get_memory_store().session(st.session_state.session_id)
 
                 # Run the orchestration logic
-                asyncio.run(run_orchestration(api_key, memory, user_prompt))
+                output = st.empty()
+                updates: "queue.Queue[Optional[str]]" = queue.Queue()
+                turn = asyncio.run_coroutine_threadsafe(
+                    run_orchestration(api_key, memory, user_prompt, updates),
+                    get_event_loop(),
+                )
+                for text in iter(updates.get, None):
+                    output.markdown(text)
+                turn.result()
 
                 # Update UI
-                log_container.text("\n".join(log_messages))
+                events.get_pipeline().flush()
+                log_container.text("\n".join(log_sink.lines()))
 
 with col2:
     st.header("Agent Memory (Pillar 4)")
-    if "memory" in st.session_state:
-        for msg in st.session_state.memory.entries:
-            with st.chat_message(msg.role.value):
-                if msg.content:
-                    st.write(msg.content)
-                if msg.tool_calls:
-                    st.code(
-                        json.dumps(
-                            [tool_call.dict() for tool_call in msg.tool_calls],
-                            indent=2,
-                        ),
-                        language="json",
-                    )
+    if "session_id" in st.session_state:
+        memory = get_memory_store().session(st.session_state.session_id)
+        context = run_async(memory.get_context())
+        for msg in context["messages"]:
+            with st.chat_message(msg["role"]):
+                if msg["content"]:
+                    st.write(msg["content"])
+                if msg["tool_calls"]:
+                    st.code(json.dumps(msg["tool_calls"], indent=2), language="json")
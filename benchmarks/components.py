@@ -0,0 +1,257 @@
+# benchmarks/components.py
+"""
+Microbenchmarks of janus' own overhead, with the LLM replaced by an
+in-process fake backend.
+
+    python benchmarks/components.py                   # run and print
+    python benchmarks/components.py --save            # record a baseline
+    python benchmarks/components.py --compare         # fail on regressions
+
+Each benchmark reports the best time per operation over several rounds,
+which is the least sensitive to noise from other processes.
+``--compare`` exits with status 1 if any benchmark is slower than the
+baseline by more than ``--tolerance`` (a fraction).
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from pydantic import BaseModel
+
+from janus.agent import StandardPlannerAgent
+from janus.fake_llm import FakeChatBackend
+from janus.memory import BaseMemory, InMemoryWorkingMemory
+from janus.message_store import CompactWorkingMemory
+from janus.models import ChatMessage, Role
+from janus.orchestrator import AsyncLocalOrchestrator
+from janus.tool import ToolRegistry, agent_tool
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+class LookupArgs(BaseModel):
+    key: str
+    limit: int = 10
+
+
+@agent_tool(args_schema=LookupArgs)
+async def lookup(key: str, limit: int = 10) -> str:
+    """Looks a key up."""
+    return f"{key}:{limit}"
+
+
+def make_registry(extra_tools: int = 20) -> ToolRegistry:
+    registry = ToolRegistry()
+    registry.register(lookup)
+    for i in range(extra_tools):
+
+        async def tool(key: str, limit: int = 10) -> str:
+            return key
+
+        tool.__name__ = f"tool_{i}"
+        tool.__doc__ = f"Tool number {i}."
+        registry.register(agent_tool(args_schema=LookupArgs)(tool))
+    return registry
+
+
+def make_message(i: int) -> ChatMessage:
+    role = Role.USER if i % 2 == 0 else Role.ASSISTANT
+    return ChatMessage(role=role, content=f"Message number {i} of the conversation.")
+
+
+async def filled_memory(
+    size: int, memory_class: Callable[[], BaseMemory] = InMemoryWorkingMemory
+) -> BaseMemory:
+    memory = memory_class()
+    for i in range(size):
+        await memory.add(make_message(i))
+    return memory
+
+
+async def measure(
+    operation: Callable[[], Awaitable[Any]], ops: int, rounds: int
+) -> float:
+    """
+    Returns the best seconds per call of ``operation`` over ``rounds``
+    rounds of ``ops`` calls each.
+    """
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(ops):
+            await operation()
+        timings.append((time.perf_counter() - started) / ops)
+    return min(timings)
+
+
+async def bench_get_schemas(rounds: int) -> float:
+    registry = make_registry()
+
+    async def op():
+        registry.get_schemas()
+
+    return await measure(op, 100000, rounds)
+
+
+async def bench_execute(rounds: int) -> float:
+    registry = make_registry()
+
+    async def op():
+        await registry.execute("lookup", key="a", limit=3)
+
+    return await measure(op, 2000, rounds)
+
+
+async def bench_execute_json(rounds: int) -> float:
+    registry = make_registry()
+
+    async def op():
+        await registry.execute_json("lookup", '{"key": "a", "limit": 3}')
+
+    return await measure(op, 2000, rounds)
+
+
+def bench_memory_add(
+    size: int, memory_class: Callable[[], BaseMemory] = InMemoryWorkingMemory
+) -> Callable[[int], Awaitable[float]]:
+    async def run(rounds: int) -> float:
+        timings = []
+        messages = [make_message(i) for i in range(size)]
+        for _ in range(rounds):
+            memory = memory_class()
+            started = time.perf_counter()
+            for message in messages:
+                await memory.add(message)
+            timings.append((time.perf_counter() - started) / size)
+        return min(timings)
+
+    return run
+
+
+def bench_get_context(
+    size: int, memory_class: Callable[[], BaseMemory] = InMemoryWorkingMemory
+) -> Callable[[int], Awaitable[float]]:
+    async def run(rounds: int) -> float:
+        memory = await filled_memory(size, memory_class)
+
+        async def op():
+            # What an agent does with the context: copy it into a request.
+            context = await memory.get_context()
+            [*context["messages"]]
+
+        return await measure(op, max(2_000_000 // size, 10), rounds)
+
+    return run
+
+
+async def bench_orchestrator_step(rounds: int) -> float:
+    backend = FakeChatBackend(
+        [
+            {"tool_calls": [{"name": "lookup", "arguments": {"key": "a"}}]},
+            {"content": "Found it."},
+        ]
+    )
+    registry = make_registry()
+    pool = backend.client_pool()
+    user = {"messages": [{"role": "user", "content": "Find a."}]}
+
+    async def op():
+        agent = StandardPlannerAgent(api_key="fake", client_pool=pool)
+        orchestrator = AsyncLocalOrchestrator(
+            agent, registry, InMemoryWorkingMemory()
+        )
+        async for _ in orchestrator.run(user):
+            pass
+
+    # Each run is two steps: a tool call, then the answer.
+    return await measure(op, 200, rounds) / 2
+
+
+BENCHMARKS: Dict[str, Callable[[int], Awaitable[float]]] = {
+    "tool_registry.get_schemas": bench_get_schemas,
+    "tool_registry.execute": bench_execute,
+    "tool_registry.execute_json": bench_execute_json,
+    "memory.add@10k": bench_memory_add(10_000),
+    "memory.add@100k": bench_memory_add(100_000),
+    "memory.get_context@10k": bench_get_context(10_000),
+    "memory.get_context@100k": bench_get_context(100_000),
+    "compact_memory.add@100k": bench_memory_add(100_000, CompactWorkingMemory),
+    "compact_memory.get_context@100k": bench_get_context(
+        100_000, CompactWorkingMemory
+    ),
+    "orchestrator.step": bench_orchestrator_step,
+}
+
+
+async def run_suite(names: List[str], rounds: int) -> Dict[str, float]:
+    results = {}
+    for name in names:
+        # Like timeit, keep garbage collection pauses out of the timings.
+        gc.collect()
+        gc.disable()
+        try:
+            results[name] = await BENCHMARKS[name](rounds)
+        finally:
+            gc.enable()
+        print(f"{name:32} {results[name] * 1e6:12.2f} us/op")
+    return results
+
+
+def compare(results: Dict[str, float], path: str, tolerance: float) -> bool:
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    ok = True
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        change = seconds / before - 1
+        regressed = change > tolerance
+        ok = ok and not regressed
+        mark = "REGRESSION" if regressed else "ok"
+        print(f"{name:32} {change * 100:+8.1f}%  {mark}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default all)")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the baseline")
+    parser.add_argument("--compare", action="store_true", help="check the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args()
+
+    names = args.names or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    results = asyncio.run(run_suite(names, args.rounds))
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+    if args.compare and not compare(results, args.baseline, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# benchmarks/import_time.py
+"""
+Import-time budget for janus and its submodules.
+
+    python benchmarks/import_time.py               # check every module
+    python benchmarks/import_time.py janus.agent   # check some modules
+    python benchmarks/import_time.py --scale 2     # on a slow machine
+
+Every module of the package, found with ``pkgutil``, is imported in a
+fresh interpreter under ``-X importtime``, and the best cumulative time
+over ``--rounds`` runs is compared to its budget (``DEFAULT_BUDGET``
+unless listed in ``BUDGETS``). Exits with status 1 if a module is over
+budget, or if importing it loads a provider SDK, which must only be
+imported when a client is created.
+"""
+import argparse
+import os
+import pkgutil
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Milliseconds. Most of each budget is asyncio and pydantic, which every
+# module needs; a provider SDK alone takes longer than any of them.
+DEFAULT_BUDGET = 500
+BUDGETS: Dict[str, float] = {
+    "janus": 20,
+    "janus.cache": 150,
+    "janus.concurrency": 150,
+    "janus.events": 150,
+    "janus.tracing": 150,
+    "janus.providers": 150,
+    "janus.termination": 250,
+    "janus.llm_client": 250,
+    "janus.resilience": 250,
+    "janus.models": 400,
+    "janus.tool": 400,
+    "janus.memory": 400,
+    "janus.message_store": 400,
+    "janus.response_cache": 400,
+    "janus.vector_memory": 600,
+}
+
+PROVIDER_SDKS = ("openai", "anthropic", "httpx")
+
+
+def janus_modules() -> List[str]:
+    """
+    Returns janus and every one of its submodules.
+    """
+    sys.path.insert(0, SRC)
+    import janus
+
+    return ["janus"] + sorted(
+        info.name for info in pkgutil.walk_packages(janus.__path__, "janus.")
+    )
+
+
+def measure(module: str) -> Tuple[float, List[str]]:
+    """
+    Imports ``module`` in a new interpreter. Returns the cumulative import
+    time in milliseconds and the provider SDKs it loaded.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([SRC, *sys.path[1:]])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    cumulative = None
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        name = name.strip()
+        if name.split(".")[0] in PROVIDER_SDKS:
+            loaded.add(name.split(".")[0])
+        if name == module:
+            cumulative = int(total) / 1000
+    if cumulative is None:
+        raise RuntimeError(f"No import time reported for {module}.")
+    return cumulative, sorted(loaded)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", help="modules to check (default all)")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="multiply every budget"
+    )
+    args = parser.parse_args()
+
+    modules = args.modules or janus_modules()
+    ok = True
+    for module in modules:
+        runs = [measure(module) for _ in range(args.rounds)]
+        best = min(ms for ms, _ in runs)
+        loaded = runs[0][1]
+        budget = BUDGETS.get(module, DEFAULT_BUDGET) * args.scale
+        if loaded:
+            mark = f"LOADS {', '.join(loaded)}"
+        elif best > budget:
+            mark = "OVER BUDGET"
+        else:
+            mark = "ok"
+        ok = ok and mark == "ok"
+        print(f"{module:24} {best:8.1f} ms  (budget {budget:6.0f} ms)  {mark}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
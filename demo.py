@@ -48,22 +48,14 @@ async def run_demo():
 
     # 5. Run the orchestrator
     final_state = {}
+    # The run stops on its own once the assistant answers without tools.
     async for state in orchestrator.run(initial_state):
         final_state = state
-        # Simple termination condition for the demo
-        if "What's the weather" in initial_state.get("messages", [{}])[0].get(
-            "content", ""
-        ):
-            if any(
-                "Result: Sunny" in msg.get("content", "")
-                for msg in state.get("messages", [])
-            ):
-                logging.info("Demo condition met. Terminating.")
-                break
+    logging.info(f"Stopped: {final_state.get('stop_reason')}")
 
     # 6. Print the final state
     print("--- Final State ---")
-    print(json.dumps(final_state, indent=2))
+    print(json.dumps(final_state, indent=2, default=list))
 
 
 if __name__ == "__main__":
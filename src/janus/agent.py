@@ -1,15 +1,24 @@
 # src/janus/agent.py
+import asyncio
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 
-from janus.models import ChatMessage, Role
-from janus.tool import ToolRegistry
-from openai import AsyncOpenAI
+from janus import tracing
+from janus.concurrency import llm_slot
+from janus.llm_client import LLMClientPool, RateLimiter, default_client_pool
+from janus.memory import estimate_tokens
+from janus.models import AgentEvent, ChatMessage, EventType, Role, to_wire
+from janus.resilience import ResilientCaller
+from janus.response_cache import LLMResponseCache
+from janus.tool import ToolArgumentsError, ToolRegistry
 
 logger = logging.getLogger(__name__)
 
+EventCallback = Callable[[AgentEvent], None]
+
 
 class BaseAgent(ABC):
     """
@@ -25,36 +34,325 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def stream(
+        self, state: Dict[str, Any], tools: "ToolRegistry"
+    ) -> AsyncIterator[AgentEvent]:
+        """
+        Executes the agent's logic, yielding events as they happen. The last
+        event is always a ``STEP_DONE`` carrying the agent's output.
+
+        The default implementation runs ``execute`` and yields its result.
+        """
+        output = await self.execute(state, tools)
+        yield AgentEvent(type=EventType.STEP_DONE, data=output)
+
+
+class ToolCancelPolicy(str, Enum):
+    """
+    What to do with the remaining tool calls of a turn when one of them fails.
+    """
+
+    CONTINUE = "continue"
+    CANCEL_REMAINING = "cancel_remaining"
+
+
+def _tool_call_parts(tool_call: Any) -> Tuple[Optional[str], str, str]:
+    """
+    Returns ``(id, name, arguments)`` of a tool call given either as a dict
+    in wire format or as an object with a ``function`` attribute.
+    """
+    if isinstance(tool_call, dict):
+        function = tool_call.get("function") or {}
+        return tool_call.get("id"), function.get("name", ""), function.get(
+            "arguments", ""
+        )
+    call_id = getattr(tool_call, "id", None)
+    return (
+        call_id if isinstance(call_id, str) else None,
+        tool_call.function.name,
+        tool_call.function.arguments,
+    )
+
+
+def _usage_dict(usage: Any) -> Dict[str, int]:
+    """
+    Converts a provider usage object into plain token counts.
+    """
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+    }
+
+
+def _content_chars(messages: Any) -> int:
+    return sum(len(message.get("content") or "") for message in messages)
+
+
+def _annotate_llm_span(span: Any, message: ChatMessage, usage: Dict[str, int]):
+    """
+    Records the token counts and response size of a finished LLM call.
+    """
+    if not span.recording:
+        return
+    span.set("prompt_tokens", usage.get("prompt_tokens", 0))
+    span.set("completion_tokens", usage.get("completion_tokens", 0))
+    span.set("response_chars", len(message.content or ""))
+    span.set("tool_calls", len(message.tool_calls or ()))
+
+
+class _StreamAssembler:
+    """
+    Rebuilds an assistant message from streamed completion deltas.
+    Argument fragments are buffered per tool call and joined once.
+    """
+
+    def __init__(self):
+        self._content: List[str] = []
+        self._calls: Dict[int, Dict[str, Any]] = {}
+        self._arguments: Dict[int, List[str]] = {}
+        self._maybe_complete: Set[int] = set()
+        self._reported: Set[int] = set()
+
+    def feed(self, delta: Any) -> Optional[str]:
+        """
+        Consumes one delta and returns its text content, if any.
+        """
+        text = getattr(delta, "content", None)
+        if text:
+            self._content.append(text)
+        for call_delta in getattr(delta, "tool_calls", None) or []:
+            index = call_delta.index
+            call = self._calls.get(index)
+            if call is None:
+                call = {"id": None, "type": "function", "function": {"name": ""}}
+                self._calls[index] = call
+                self._arguments[index] = []
+            if call_delta.id:
+                call["id"] = call_delta.id
+            function = call_delta.function
+            if function is not None:
+                if function.name:
+                    call["function"]["name"] += function.name
+                if function.arguments:
+                    self._arguments[index].append(function.arguments)
+                    if function.arguments.rstrip().endswith("}"):
+                        self._maybe_complete.add(index)
+        return text
+
+    def complete_calls(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Returns the tool calls whose arguments have become a complete JSON
+        object since the last call. A JSON object cannot be extended and
+        stay valid, so these arguments are final unless the stream breaks
+        its own format; callers must still compare with ``message()``.
+        """
+        ready = []
+        for index in sorted(self._maybe_complete - self._reported):
+            arguments = "".join(self._arguments[index])
+            try:
+                parsed = json.loads(arguments)
+            except ValueError:
+                continue
+            if isinstance(parsed, dict):
+                self._reported.add(index)
+                call = self._calls[index]
+                ready.append(
+                    (
+                        index,
+                        {
+                            "id": call["id"],
+                            "type": "function",
+                            "function": {
+                                "name": call["function"]["name"],
+                                "arguments": arguments,
+                            },
+                        },
+                    )
+                )
+        self._maybe_complete.clear()
+        return ready
+
+    def message(self) -> ChatMessage:
+        """
+        Returns the assembled assistant message.
+        """
+        tool_calls = []
+        for index in sorted(self._calls):
+            call = self._calls[index]
+            call["function"]["arguments"] = "".join(self._arguments[index])
+            tool_calls.append(call)
+        return ChatMessage(
+            role=Role.ASSISTANT,
+            content="".join(self._content) or None,
+            tool_calls=tool_calls or None,
+        )
+
 
 class StandardPlannerAgent(BaseAgent):
     """
     A simple planner agent that uses a live OpenAI client to call tools.
+
+    ``provider`` picks the client factory from ``janus.providers`` (the
+    client pool's default, ``"openai"``, if unset); any provider whose
+    client speaks the chat-completions interface works. Its SDK is only
+    imported when the first request is made.
+
+    When ``parallel_tool_calls`` is enabled, the tool calls of a single LLM
+    turn are dispatched concurrently (at most ``max_concurrent_tools`` at a
+    time). Results are always appended in the original ``tool_calls`` order.
+
+    With ``speculative_tools``, ``stream`` starts each side-effect-free
+    tool as soon as its streamed arguments form a complete JSON object, so
+    tool latency overlaps with the rest of the generation. The run is kept
+    only if the final response contains the same call.
+
+    With ``coalesce_requests``, identical concurrent completion requests
+    from agents sharing credentials (same model, messages and tools) are
+    sent once and the response is shared; only the agent whose request
+    went out reports its token usage. Streaming requests are not
+    coalesced.
+
+    Given a ``ResilientCaller``, non-streaming requests get adaptive
+    timeouts, a hedged duplicate when they run past the p95 latency, and
+    jittered retries on transient errors. The client pool should then
+    pass ``client_options={"max_retries": 0}``, so the SDK does not retry
+    as well.
     """
 
-    def __init__(self, api_key: str, system_prompt: str = "You are a helpful assistant."):
-        self.client = AsyncOpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        system_prompt: str = "You are a helpful assistant.",
+        parallel_tool_calls: bool = False,
+        max_concurrent_tools: Optional[int] = None,
+        tool_timeout: Optional[float] = None,
+        tool_timeouts: Optional[Dict[str, float]] = None,
+        cancel_policy: ToolCancelPolicy = ToolCancelPolicy.CONTINUE,
+        base_url: Optional[str] = None,
+        client_pool: Optional[LLMClientPool] = None,
+        expected_completion_tokens: int = 256,
+        model: str = "gpt-4o",
+        response_cache: Optional[LLMResponseCache] = None,
+        speculative_tools: bool = False,
+        coalesce_requests: bool = False,
+        resilience: Optional[ResilientCaller] = None,
+        provider: Optional[str] = None,
+    ):
+        if max_concurrent_tools is not None and max_concurrent_tools < 1:
+            raise ValueError("max_concurrent_tools must be at least 1.")
+        self.api_key = api_key
+        self.base_url = base_url
+        self.provider = provider
+        self.client_pool = client_pool or default_client_pool()
+        self.expected_completion_tokens = expected_completion_tokens
+        self.model = model
+        self.response_cache = response_cache
         self.system_prompt = ChatMessage(role=Role.SYSTEM, content=system_prompt)
+        self._system_wire: Tuple[ChatMessage, Dict[str, Any]] = (
+            self.system_prompt,
+            to_wire(self.system_prompt),
+        )
+        self.parallel_tool_calls = parallel_tool_calls
+        self.max_concurrent_tools = max_concurrent_tools
+        self.tool_timeout = tool_timeout
+        self.tool_timeouts = tool_timeouts or {}
+        self.cancel_policy = ToolCancelPolicy(cancel_policy)
+        self.speculative_tools = speculative_tools
+        self.speculation_stats = {"started": 0, "used": 0, "discarded": 0}
+        self.coalesce_requests = coalesce_requests
+        self.resilience = resilience
+
+    @property
+    def client(self) -> Any:
+        """
+        The pooled client for this agent's provider and credentials.
+        """
+        return self.client_pool.client(self.api_key, self.base_url, self.provider)
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """
+        The rate limiter shared by every agent with these credentials.
+        """
+        return self.client_pool.rate_limiter(
+            self.api_key, self.base_url, self.provider
+        )
+
+    def _estimate_request_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        return (
+            sum(estimate_tokens(message) for message in messages)
+            + self.expected_completion_tokens
+        )
+
+    def _system_message(self) -> Dict[str, Any]:
+        """
+        Returns the system prompt in wire format, serialized once.
+        """
+        prompt, wire = self._system_wire
+        if prompt is not self.system_prompt:
+            self._system_wire = (self.system_prompt, to_wire(self.system_prompt))
+            wire = self._system_wire[1]
+        return wire
 
     async def _call_openai_api(
-        self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        usage: Optional[Dict[str, int]] = None,
     ) -> ChatMessage:
         """
         Calls the OpenAI API with the given messages and tools.
+        Token usage reported by the provider is written into ``usage``.
         """
-        formatted_messages = [self.system_prompt.model_dump()] + messages
-        response = await self.client.chat.completions.create(
-            model="gpt-4o",
+        formatted_messages = [self._system_message(), *messages]
+        estimated_tokens = self._estimate_request_tokens(formatted_messages)
+        limiter = self.rate_limiter
+        await limiter.acquire(estimated_tokens)
+        raw_response = await self.client.chat.completions.with_raw_response.create(
+            model=self.model,
             messages=formatted_messages,
             tools=tools,
         )
+        limiter.update_from_headers(raw_response.headers)
+        response = raw_response.parse()
+        if response.usage is not None:
+            limiter.settle(estimated_tokens, response.usage.total_tokens)
+            if usage is not None:
+                usage.update(_usage_dict(response.usage))
         response_message = response.choices[0].message
         if response_message.tool_calls:
             return ChatMessage(
                 role=Role.ASSISTANT,
-                tool_calls=response_message.tool_calls,
+                tool_calls=[
+                    tool_call.model_dump() for tool_call in response_message.tool_calls
+                ],
             )
         return ChatMessage(role=Role.ASSISTANT, content=response_message.content)
 
+    async def _stream_openai_api(
+        self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]
+    ) -> AsyncIterator[Any]:
+        """
+        Calls the OpenAI API in streaming mode and yields completion chunks.
+        """
+        formatted_messages = [self._system_message(), *messages]
+        estimated_tokens = self._estimate_request_tokens(formatted_messages)
+        limiter = self.rate_limiter
+        await limiter.acquire(estimated_tokens)
+        raw_response = await self.client.chat.completions.with_raw_response.create(
+            model=self.model,
+            messages=formatted_messages,
+            tools=tools,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        limiter.update_from_headers(raw_response.headers)
+        async for chunk in raw_response.parse():
+            if getattr(chunk, "usage", None) is not None:
+                limiter.settle(estimated_tokens, chunk.usage.total_tokens)
+            yield chunk
+
     async def execute(
         self, state: Dict[str, Any], tools: "ToolRegistry"
     ) -> Dict[str, Any]:
@@ -63,31 +361,424 @@ class StandardPlannerAgent(BaseAgent):
         """
         messages = state.get("messages", [])
         tool_schemas = tools.get_schemas()
-        llm_response_message = await self._call_openai_api(messages, tool_schemas)
+        cache_key, llm_response_message = await self._cached_response(
+            messages, tool_schemas
+        )
+        usage: Dict[str, int] = {}
+        if llm_response_message is None:
+            llm_response_message = await self._complete(
+                messages, tool_schemas, usage, cache_key
+            )
+            await self._record_response(cache_key, llm_response_message)
         messages_to_add = [llm_response_message]
         if llm_response_message.tool_calls:
-            for tool_call in llm_response_message.tool_calls:
-                tool_name = tool_call.function.name
+            messages_to_add.extend(
+                await self._execute_tool_calls(llm_response_message.tool_calls, tools)
+            )
+        return {"messages_to_add": messages_to_add, "usage": usage}
+
+    async def stream(
+        self, state: Dict[str, Any], tools: "ToolRegistry"
+    ) -> AsyncIterator[AgentEvent]:
+        """
+        Executes a planning step, streaming the completion as ``TOKEN``
+        events and reporting each tool call as it starts and finishes.
+        """
+        messages = state.get("messages", [])
+        tool_schemas = tools.get_schemas()
+        cache_key, llm_response_message = await self._cached_response(
+            messages, tool_schemas
+        )
+        usage: Dict[str, int] = {}
+        # Tool calls started before the response finished, by index.
+        speculative: Dict[int, Tuple[Dict[str, Any], "asyncio.Future[Any]"]] = {}
+        try:
+            if llm_response_message is not None:
+                if llm_response_message.content:
+                    yield AgentEvent(
+                        type=EventType.TOKEN,
+                        data={"delta": llm_response_message.content},
+                    )
+            else:
+                assembler = _StreamAssembler()
+                llm_span = self._llm_span(messages, streaming=True)
                 try:
-                    tool_args = json.loads(tool_call.function.arguments)
-                    tool_result = await tools.execute(tool_name, **tool_args)
-                    messages_to_add.append(
-                        ChatMessage(role=Role.TOOL, content=str(tool_result))
+                    async with llm_slot():
+                        async for chunk in self._stream_openai_api(
+                            messages, tool_schemas
+                        ):
+                            if getattr(chunk, "usage", None) is not None:
+                                usage.update(_usage_dict(chunk.usage))
+                            if not chunk.choices:
+                                continue
+                            text = assembler.feed(chunk.choices[0].delta)
+                            if self.speculative_tools:
+                                self._speculate(assembler, tools, speculative)
+                            if text:
+                                yield AgentEvent(
+                                    type=EventType.TOKEN, data={"delta": text}
+                                )
+                    llm_response_message = assembler.message()
+                    _annotate_llm_span(llm_span, llm_response_message, usage)
+                except Exception as e:
+                    llm_span.finish(e)
+                    raise
+                finally:
+                    llm_span.finish()
+                await self._record_response(cache_key, llm_response_message)
+            messages_to_add = [llm_response_message]
+
+            if llm_response_message.tool_calls:
+                prestarted = self._claim_speculative(
+                    llm_response_message.tool_calls, speculative
+                )
+                events: "asyncio.Queue[Optional[AgentEvent]]" = asyncio.Queue()
+                runner = asyncio.ensure_future(
+                    self._execute_tool_calls(
+                        llm_response_message.tool_calls,
+                        tools,
+                        events.put_nowait,
+                        prestarted,
                     )
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse tool arguments: {e}")
-                    messages_to_add.append(
-                        ChatMessage(
-                            role=Role.TOOL,
-                            content=f"Error parsing arguments for tool {tool_name}: {e}",
-                        )
+                )
+                runner.add_done_callback(lambda _: events.put_nowait(None))
+                try:
+                    event = await events.get()
+                    while event is not None:
+                        yield event
+                        event = await events.get()
+                finally:
+                    if not runner.done():
+                        runner.cancel()
+                messages_to_add.extend(await runner)
+        finally:
+            for _, task in speculative.values():
+                task.cancel()
+
+        yield AgentEvent(
+            type=EventType.STEP_DONE,
+            data={"messages_to_add": messages_to_add, "usage": usage},
+        )
+
+    async def _cached_response(
+        self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]
+    ) -> Tuple[Optional[str], Optional[ChatMessage]]:
+        """
+        Looks the request up in the response cache, if one is configured.
+        Returns the cache key and the recorded response (None on a miss).
+        """
+        if self.response_cache is None:
+            return None, None
+        key = self.response_cache.key(
+            self.model, [self._system_message(), *messages], tools
+        )
+        return key, await self.response_cache.get(key)
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        usage: Dict[str, int],
+        key: Optional[str] = None,
+    ) -> ChatMessage:
+        """
+        Calls the LLM, coalescing the call with identical in-flight ones.
+        """
+        if not self.coalesce_requests:
+            message, call_usage = await self._request(messages, tools)
+            usage.update(call_usage)
+            return message
+
+        if key is None:
+            key = LLMResponseCache.key(
+                self.model, [self._system_message(), *messages], tools
+            )
+        flights = self.client_pool.single_flight(
+            self.api_key, self.base_url, self.provider
+        )
+        (message, call_usage), shared = await flights.do(
+            (asyncio.get_running_loop(), key),
+            lambda: self._request(messages, tools),
+        )
+        if shared:
+            # Each agent adds the response to its own memory.
+            return message.model_copy(deep=True)
+        usage.update(call_usage)
+        return message
+
+    async def _request(
+        self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]
+    ) -> Tuple[ChatMessage, Dict[str, int]]:
+        """
+        Sends one logical LLM request, through the resilience layer if any.
+        Each attempt gets its own usage dict, so a cancelled hedge or a
+        failed attempt never leaks into the usage reported, and its own LLM
+        slot, so a hedge never runs past the concurrency limits.
+        """
+
+        async def attempt() -> Tuple[ChatMessage, Dict[str, int]]:
+            attempt_usage: Dict[str, int] = {}
+            async with llm_slot():
+                message = await self._call_openai_api(
+                    messages, tools, usage=attempt_usage
+                )
+            return message, attempt_usage
+
+        with self._llm_span(messages, streaming=False) as span:
+            if self.resilience is None:
+                message, usage = await attempt()
+            else:
+                message, usage = await self.resilience.call(attempt)
+            _annotate_llm_span(span, message, usage)
+        return message, usage
+
+    def _llm_span(self, messages: List[Dict[str, Any]], streaming: bool) -> Any:
+        span = tracing.span(
+            "llm.call", model=self.model, messages=len(messages), streaming=streaming
+        )
+        if span.recording:
+            span.set("request_chars", _content_chars(messages))
+        return span
+
+    async def _record_response(self, key: Optional[str], message: ChatMessage):
+        if self.response_cache is not None and key is not None:
+            await self.response_cache.put(key, message)
+
+    def _speculate(
+        self,
+        assembler: _StreamAssembler,
+        tools: "ToolRegistry",
+        speculative: Dict[int, Tuple[Dict[str, Any], "asyncio.Future[Any]"]],
+    ):
+        """
+        Starts side-effect-free tool calls whose arguments are complete
+        while the rest of the response is still streaming.
+        """
+        for index, tool_call in assembler.complete_calls():
+            _, tool_name, _ = _tool_call_parts(tool_call)
+            if index in speculative or not tools.is_side_effect_free(tool_name):
+                continue
+            logger.info("Speculatively starting tool %s", tool_name)
+            task = asyncio.ensure_future(self._invoke_tool(tool_call, tools))
+            # Discarded speculations are never awaited; don't warn about them.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            speculative[index] = (tool_call, task)
+            self.speculation_stats["started"] += 1
+
+    def _claim_speculative(
+        self,
+        tool_calls: List[Any],
+        speculative: Dict[int, Tuple[Dict[str, Any], "asyncio.Future[Any]"]],
+    ) -> Dict[int, "asyncio.Future[Any]"]:
+        """
+        Pairs speculative runs with the final tool calls. A run is used only
+        if the final call has the same name and arguments; any other run is
+        cancelled.
+        """
+        prestarted: Dict[int, "asyncio.Future[Any]"] = {}
+        for index, (started_call, task) in list(speculative.items()):
+            del speculative[index]
+            final = tool_calls[index] if index < len(tool_calls) else None
+            same_call = final is not None and (
+                _tool_call_parts(final)[1:] == _tool_call_parts(started_call)[1:]
+            )
+            if same_call:
+                prestarted[index] = task
+                self.speculation_stats["used"] += 1
+            else:
+                task.cancel()
+                self.speculation_stats["discarded"] += 1
+        return prestarted
+
+    async def _execute_tool_calls(
+        self,
+        tool_calls: List[Any],
+        tools: "ToolRegistry",
+        on_event: Optional[EventCallback] = None,
+        prestarted: Optional[Dict[int, "asyncio.Future[Any]"]] = None,
+    ) -> List[ChatMessage]:
+        """
+        Runs the tool calls of one LLM turn in the configured dispatch mode.
+        Calls in ``prestarted`` are already running; their results are
+        awaited instead of starting them again.
+        """
+        prestarted = prestarted or {}
+        try:
+            if self.parallel_tool_calls:
+                return await self._execute_tool_calls_parallel(
+                    tool_calls, tools, on_event, prestarted
+                )
+            return await self._execute_tool_calls_sequential(
+                tool_calls, tools, on_event, prestarted
+            )
+        finally:
+            for task in prestarted.values():
+                task.cancel()
+
+    async def _run_tool_call(
+        self,
+        index: int,
+        tool_call: Any,
+        tools: "ToolRegistry",
+        prestarted: Dict[int, "asyncio.Future[Any]"],
+    ) -> Any:
+        task = prestarted.pop(index, None)
+        if task is not None:
+            return await task
+        return await self._invoke_tool(tool_call, tools)
+
+    async def _invoke_tool(self, tool_call: Any, tools: "ToolRegistry") -> Any:
+        """
+        Runs a tool call under its timeout. The registry parses and validates
+        the raw JSON arguments in a single pass.
+        """
+        _, tool_name, arguments = _tool_call_parts(tool_call)
+        timeout = self.tool_timeouts.get(tool_name, self.tool_timeout)
+        return await asyncio.wait_for(
+            tools.execute_json(tool_name, arguments), timeout=timeout
+        )
+
+    def _tool_error_message(self, tool_call: Any, error: BaseException) -> ChatMessage:
+        """
+        Turns a failed or cancelled tool call into a tool message for the LLM.
+        """
+        call_id, tool_name, _ = _tool_call_parts(tool_call)
+        if isinstance(error, ToolArgumentsError):
+            logger.error(f"Failed to parse tool arguments: {error}")
+            content = f"Error parsing arguments for tool {tool_name}: {error}"
+        elif isinstance(error, asyncio.TimeoutError):
+            timeout = self.tool_timeouts.get(tool_name, self.tool_timeout)
+            logger.error(f"Tool {tool_name} timed out after {timeout}s")
+            content = f"Error executing tool {tool_name}: timed out after {timeout}s"
+        elif isinstance(error, asyncio.CancelledError):
+            logger.warning(f"Tool {tool_name} was cancelled")
+            content = f"Tool {tool_name} was cancelled after another tool call failed"
+        else:
+            logger.error(f"Tool execution failed: {error}")
+            content = f"Error executing tool {tool_name}: {error}"
+        return ChatMessage(role=Role.TOOL, content=content, tool_call_id=call_id)
+
+    def _tool_result_message(self, tool_call: Any, result: Any) -> ChatMessage:
+        """
+        Wraps a tool's return value in a tool message for the LLM.
+        """
+        call_id, _, _ = _tool_call_parts(tool_call)
+        return ChatMessage(role=Role.TOOL, content=str(result), tool_call_id=call_id)
+
+    @staticmethod
+    def _notify(
+        on_event: Optional[EventCallback],
+        event_type: EventType,
+        index: int,
+        tool_call: Any,
+        message: Optional[ChatMessage] = None,
+    ):
+        """
+        Reports a tool call starting or finishing to ``on_event``, if set.
+        """
+        if on_event is None:
+            return
+        call_id, tool_name, arguments = _tool_call_parts(tool_call)
+        data: Dict[str, Any] = {"index": index, "id": call_id, "name": tool_name}
+        if message is None:
+            data["arguments"] = arguments
+        else:
+            data["content"] = message.content
+        on_event(AgentEvent(type=event_type, data=data))
+
+    async def _execute_tool_calls_sequential(
+        self,
+        tool_calls: List[Any],
+        tools: "ToolRegistry",
+        on_event: Optional[EventCallback] = None,
+        prestarted: Optional[Dict[int, "asyncio.Future[Any]"]] = None,
+    ) -> List[ChatMessage]:
+        """
+        Runs tool calls one after the other.
+        """
+        results: List[ChatMessage] = []
+        failed = False
+        for index, tool_call in enumerate(tool_calls):
+            if failed:
+                message = self._tool_error_message(tool_call, asyncio.CancelledError())
+            else:
+                self._notify(on_event, EventType.TOOL_CALL_STARTED, index, tool_call)
+                try:
+                    tool_result = await self._run_tool_call(
+                        index, tool_call, tools, prestarted or {}
                     )
+                    message = self._tool_result_message(tool_call, tool_result)
                 except Exception as e:
-                    logger.error(f"Tool execution failed: {e}")
-                    messages_to_add.append(
-                        ChatMessage(
-                            role=Role.TOOL,
-                            content=f"Error executing tool {tool_name}: {e}",
-                        )
+                    message = self._tool_error_message(tool_call, e)
+                    failed = self.cancel_policy == ToolCancelPolicy.CANCEL_REMAINING
+            self._notify(
+                on_event, EventType.TOOL_CALL_FINISHED, index, tool_call, message
+            )
+            results.append(message)
+        return results
+
+    async def _execute_tool_calls_parallel(
+        self,
+        tool_calls: List[Any],
+        tools: "ToolRegistry",
+        on_event: Optional[EventCallback] = None,
+        prestarted: Optional[Dict[int, "asyncio.Future[Any]"]] = None,
+    ) -> List[ChatMessage]:
+        """
+        Runs tool calls concurrently, bounded by ``max_concurrent_tools``.
+        """
+        semaphore = (
+            asyncio.Semaphore(self.max_concurrent_tools)
+            if self.max_concurrent_tools
+            else None
+        )
+
+        prestarted = prestarted if prestarted is not None else {}
+
+        async def run_one(index: int, tool_call: Any) -> Any:
+            if semaphore is None or index in prestarted:
+                self._notify(on_event, EventType.TOOL_CALL_STARTED, index, tool_call)
+                return await self._run_tool_call(index, tool_call, tools, prestarted)
+            async with semaphore:
+                self._notify(on_event, EventType.TOOL_CALL_STARTED, index, tool_call)
+                return await self._run_tool_call(index, tool_call, tools, prestarted)
+
+        tasks = [
+            asyncio.ensure_future(run_one(index, tool_call))
+            for index, tool_call in enumerate(tool_calls)
+        ]
+        indices = {task: index for index, task in enumerate(tasks)}
+        results: List[Optional[ChatMessage]] = [None] * len(tasks)
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=indices.__getitem__):
+                    index = indices[task]
+                    tool_call = tool_calls[index]
+                    if task.cancelled():
+                        error: Optional[BaseException] = asyncio.CancelledError()
+                    else:
+                        error = task.exception()
+                    if error is None:
+                        message = self._tool_result_message(tool_call, task.result())
+                    else:
+                        message = self._tool_error_message(tool_call, error)
+                        if self.cancel_policy == ToolCancelPolicy.CANCEL_REMAINING:
+                            for other in pending:
+                                other.cancel()
+                    results[index] = message
+                    self._notify(
+                        on_event,
+                        EventType.TOOL_CALL_FINISHED,
+                        index,
+                        tool_call,
+                        message,
                     )
-        return {"messages_to_add": messages_to_add}
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        return results
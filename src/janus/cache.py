@@ -0,0 +1,203 @@
+# src/janus/cache.py
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def canonical_hash(value: Any) -> str:
+    """
+    Returns a stable SHA-256 hex digest of a JSON-serializable value.
+    Dict keys are sorted, so equal values always hash the same.
+    """
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate size of a cached value in bytes.
+    """
+    if isinstance(value, bytes):
+        return len(value)
+    return len(str(value).encode())
+
+
+class TTLCache:
+    """
+    An LRU cache bounded by entry count and total bytes, with an optional
+    time-to-live per entry.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, Optional[float]]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not None
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Returns ``(found, value)`` and counts a hit or a miss.
+        """
+        entry = self._lookup(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return True, entry[0]
+
+    def set(self, key: Hashable, value: Any, size: Optional[int] = None):
+        """
+        Stores a value, evicting least recently used entries as needed.
+        Values larger than ``max_bytes`` are not cached.
+        """
+        size = estimate_size(value) if size is None else size
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._remove(key)
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (value, size, expires_at)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every entry. Statistics are kept.
+        """
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns hit/miss/eviction counters and the current size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[Any, int, Optional[float]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at = entry[2]
+        if expires_at is not None and self.clock() >= expires_at:
+            self._remove(key)
+            return None
+        return entry
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+
+class _Flight:
+    __slots__ = ("task", "waiters", "abandoned")
+
+    def __init__(self, task: "asyncio.Future[Any]"):
+        self.task = task
+        self.waiters = 0
+        self.abandoned = False
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight call.
+
+    The first caller of a key starts the call; callers arriving while it
+    runs await the same result (or exception) instead of starting their
+    own. A waiter that is cancelled only stops waiting: the call keeps
+    running for the others, and is cancelled only once every waiter has
+    gone. Keys are forgotten as soon as the call finishes, so this never
+    serves stale results; pair it with a cache for that.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.leaders = 0
+        self.saved = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def __contains__(self, key: Hashable) -> bool:
+        flight = self._flights.get(key)
+        return flight is not None and not flight.abandoned
+
+    async def do(
+        self, key: Hashable, factory: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Returns ``(result, shared)``, where ``shared`` tells whether the
+        result came from a call another caller had already started.
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None and not flight.abandoned
+        if shared:
+            self.saved += 1
+        else:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(
+                lambda task, key=key, flight=flight: self._forget(key, flight)
+            )
+            self.leaders += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.abandoned = True
+                flight.task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns how many calls ran, how many duplicates were saved and how
+        many calls are in flight.
+        """
+        return {
+            "leaders": self.leaders,
+            "saved": self.saved,
+            "in_flight": len(self._flights),
+        }
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Every waiter may have left; do not warn about an unretrieved error.
+        if not flight.task.cancelled():
+            flight.task.exception()
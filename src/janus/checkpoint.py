@@ -0,0 +1,241 @@
+# src/janus/checkpoint.py
+import asyncio
+import logging
+import os
+import shutil
+import string
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + "-_")
+
+
+class CheckpointDelta(BaseModel):
+    """
+    What one orchestrator step changed.
+    """
+
+    step: int
+    messages: List[Dict[str, Any]] = Field(default_factory=list)
+    usage: Dict[str, int] = Field(default_factory=dict)
+    elapsed: float = 0.0
+    pending_tool_calls: List[Dict[str, Any]] = Field(default_factory=list)
+    stop_reason: Optional[str] = None
+
+
+class Checkpoint(BaseModel):
+    """
+    The state of an orchestrator run after its latest completed step.
+    """
+
+    session_id: str
+    max_steps: int
+    step: int = 0
+    state: Dict[str, Any] = Field(default_factory=dict)
+    messages: List[Dict[str, Any]] = Field(default_factory=list)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    elapsed: float = 0.0
+    pending_tool_calls: List[Dict[str, Any]] = Field(default_factory=list)
+    stop_reason: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.stop_reason is not None
+
+    def apply(self, delta: CheckpointDelta):
+        """
+        Advances the checkpoint by one step.
+        """
+        self.step = delta.step
+        self.messages.extend(delta.messages)
+        self.prompt_tokens += delta.usage.get("prompt_tokens", 0)
+        self.completion_tokens += delta.usage.get("completion_tokens", 0)
+        self.elapsed = delta.elapsed
+        self.pending_tool_calls = delta.pending_tool_calls
+        self.stop_reason = delta.stop_reason
+
+
+def pending_tool_calls(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Returns the tool calls in ``messages`` that have no tool result yet.
+    """
+    calls: Dict[Any, Dict[str, Any]] = {}
+    for message in messages:
+        for call in message.get("tool_calls") or []:
+            calls[call.get("id")] = call
+        if message.get("tool_call_id") is not None:
+            calls.pop(message["tool_call_id"], None)
+    return list(calls.values())
+
+
+class CheckpointStore(ABC):
+    """
+    Abstract base class for checkpoint storage.
+    """
+
+    @abstractmethod
+    async def start(self, checkpoint: Checkpoint):
+        """
+        Begins checkpointing a run, replacing any earlier run of the session.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def record(self, session_id: str, delta: CheckpointDelta):
+        """
+        Persists one completed step.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def load(self, session_id: str) -> Optional[Checkpoint]:
+        """
+        Returns the latest checkpoint of a session, or None.
+        """
+        raise NotImplementedError
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    Keeps checkpoints as a full JSON snapshot plus a JSON-lines log of
+    per-step deltas, one directory per session.
+
+    Each step appends only what it changed. Every ``snapshot_every`` steps
+    the deltas are folded into a new snapshot, so loading reads a bounded
+    number of deltas. Snapshots are replaced atomically, and deltas a
+    snapshot already covers are skipped on load, so a crash at any point
+    leaves a loadable checkpoint. File I/O runs off the event loop.
+    """
+
+    def __init__(
+        self, directory: str, snapshot_every: int = 20, durable: bool = True
+    ):
+        if snapshot_every < 1:
+            raise ValueError("snapshot_every must be at least 1.")
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.durable = durable
+        self._latest: Dict[str, Checkpoint] = {}
+        self._deltas_since_snapshot: Dict[str, int] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    async def start(self, checkpoint: Checkpoint):
+        self._latest[checkpoint.session_id] = checkpoint.model_copy(deep=True)
+        self._deltas_since_snapshot[checkpoint.session_id] = 0
+        await self._io(self._write_snapshot, checkpoint.model_copy(deep=True))
+
+    async def record(self, session_id: str, delta: CheckpointDelta):
+        checkpoint = self._latest.get(session_id)
+        if checkpoint is None:
+            checkpoint = await self.load(session_id)
+            if checkpoint is None:
+                raise ValueError(f"Run of session '{session_id}' was not started.")
+        checkpoint.apply(delta)
+        count = self._deltas_since_snapshot.get(session_id, 0) + 1
+        if checkpoint.finished:
+            del self._latest[session_id]
+            self._deltas_since_snapshot.pop(session_id, None)
+            await self._io(self._write_snapshot, checkpoint)
+        elif count >= self.snapshot_every:
+            self._deltas_since_snapshot[session_id] = 0
+            await self._io(self._write_snapshot, checkpoint.model_copy(deep=True))
+        else:
+            self._deltas_since_snapshot[session_id] = count
+            await self._io(self._append_delta, session_id, delta.model_dump_json())
+
+    async def load(self, session_id: str) -> Optional[Checkpoint]:
+        checkpoint, torn = await self._io(self._read, session_id)
+        if checkpoint is None:
+            return None
+        if torn:
+            # Compact now, so new deltas are not appended after a torn line.
+            await self._io(self._write_snapshot, checkpoint.model_copy(deep=True))
+            self._deltas_since_snapshot[session_id] = 0
+        self._latest[session_id] = checkpoint.model_copy(deep=True)
+        return checkpoint
+
+    async def delete(self, session_id: str):
+        """
+        Removes every checkpoint of a session.
+        """
+        self._latest.pop(session_id, None)
+        self._deltas_since_snapshot.pop(session_id, None)
+        await self._io(self._remove, session_id)
+
+    async def _io(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _session_dir(self, session_id: str) -> str:
+        """
+        Maps a session id to its directory. Every byte other than an ASCII
+        letter, digit, ``-`` or ``_`` is escaped as ``%XX``, so distinct ids
+        get distinct directories and none can leave ``directory``.
+
+        Raises:
+            ValueError: If the session id is empty, ``.`` or ``..``.
+        """
+        if session_id in ("", ".", ".."):
+            raise ValueError(f"Invalid session id: '{session_id}'.")
+        safe = "".join(
+            chr(b) if chr(b) in _SAFE_CHARS else f"%{b:02X}"
+            for b in session_id.encode("utf-8")
+        )
+        return os.path.join(self.directory, safe)
+
+    def _write_snapshot(self, checkpoint: Checkpoint):
+        path = self._session_dir(checkpoint.session_id)
+        os.makedirs(path, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(checkpoint.model_dump_json())
+                if self.durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(path, "snapshot.json"))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        # The snapshot covers every delta written so far.
+        with open(os.path.join(path, "deltas.jsonl"), "w", encoding="utf-8"):
+            pass
+
+    def _append_delta(self, session_id: str, payload: str):
+        path = os.path.join(self._session_dir(session_id), "deltas.jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(payload + "\n")
+            if self.durable:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _remove(self, session_id: str):
+        shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    def _read(self, session_id: str) -> Tuple[Optional[Checkpoint], bool]:
+        path = self._session_dir(session_id)
+        try:
+            with open(os.path.join(path, "snapshot.json"), encoding="utf-8") as f:
+                checkpoint = Checkpoint.model_validate_json(f.read())
+        except FileNotFoundError:
+            return None, False
+        try:
+            with open(os.path.join(path, "deltas.jsonl"), encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            lines = []
+        for line in lines:
+            try:
+                delta = CheckpointDelta.model_validate_json(line)
+            except ValueError:
+                # A torn write from a crash mid-append; later steps never ran.
+                logger.warning(f"Ignoring truncated checkpoint delta of {session_id}")
+                return checkpoint, True
+            if delta.step > checkpoint.step:
+                checkpoint.apply(delta)
+        return checkpoint, False
@@ -0,0 +1,169 @@
+# src/janus/concurrency.py
+import asyncio
+import contextvars
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, NamedTuple, Optional
+
+
+class FairLimiter:
+    """
+    A concurrency limiter with a global limit and a per-tenant limit.
+
+    Waiters are granted slots round-robin across tenants (the tenant served
+    least recently goes first) and first-come, first-served within a
+    tenant, so one busy tenant cannot starve others.
+    A limit of ``None`` means unlimited.
+    """
+
+    def __init__(
+        self, limit: Optional[int] = None, per_tenant_limit: Optional[int] = None
+    ):
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1.")
+        if per_tenant_limit is not None and per_tenant_limit < 1:
+            raise ValueError("per_tenant_limit must be at least 1.")
+        self.limit = limit
+        self.per_tenant_limit = per_tenant_limit
+        self.active = 0
+        self._active_by_tenant: Dict[str, int] = {}
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future[None]]]" = OrderedDict()
+        self._last_served: Dict[str, int] = {}
+        self._grants = 0
+
+    @property
+    def waiting(self) -> int:
+        """
+        Number of callers waiting for a slot.
+        """
+        return sum(len(queue) for queue in self._waiters.values())
+
+    def active_for(self, tenant: str) -> int:
+        """
+        Number of slots currently held by a tenant.
+        """
+        return self._active_by_tenant.get(tenant, 0)
+
+    async def acquire(self, tenant: str = "default"):
+        """
+        Waits for a slot for ``tenant``.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(tenant, deque()).append(future)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as we were cancelled.
+                self.release(tenant)
+            else:
+                queue = self._waiters.get(tenant)
+                if queue is not None and future in queue:
+                    queue.remove(future)
+                    if not queue:
+                        del self._waiters[tenant]
+            raise
+
+    def release(self, tenant: str = "default"):
+        """
+        Returns a slot held by ``tenant``.
+        """
+        self.active -= 1
+        remaining = self._active_by_tenant[tenant] - 1
+        if remaining:
+            self._active_by_tenant[tenant] = remaining
+        else:
+            del self._active_by_tenant[tenant]
+            if tenant not in self._waiters:
+                self._last_served.pop(tenant, None)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, tenant: str = "default") -> AsyncIterator[None]:
+        """
+        Holds a slot for the duration of the ``async with`` block.
+        """
+        await self.acquire(tenant)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+
+    def _dispatch(self):
+        while self._waiters:
+            if self.limit is not None and self.active >= self.limit:
+                return
+            eligible = [
+                tenant
+                for tenant in self._waiters
+                if self.per_tenant_limit is None
+                or self.active_for(tenant) < self.per_tenant_limit
+            ]
+            if not eligible:
+                return
+            # Serve the tenant that has waited longest since its last grant.
+            tenant = min(eligible, key=lambda t: self._last_served.get(t, -1))
+            queue = self._waiters[tenant]
+            future = queue.popleft()
+            if not queue:
+                del self._waiters[tenant]
+            if future.done():
+                continue
+            future.set_result(None)
+            self.active += 1
+            self._active_by_tenant[tenant] = self.active_for(tenant) + 1
+            self._grants += 1
+            self._last_served[tenant] = self._grants
+
+
+class _Scope(NamedTuple):
+    tenant: str
+    llm: FairLimiter
+    tools: FairLimiter
+
+
+_current_scope: "contextvars.ContextVar[Optional[_Scope]]" = contextvars.ContextVar(
+    "janus_concurrency_scope", default=None
+)
+
+
+def set_scope(tenant: str, llm: FairLimiter, tools: FairLimiter) -> contextvars.Token:
+    """
+    Makes ``llm_slot`` and ``tool_slot`` use the given limiters for the
+    current task and the tasks it spawns.
+    """
+    return _current_scope.set(_Scope(tenant, llm, tools))
+
+
+def reset_scope(token: contextvars.Token):
+    """
+    Restores the scope that was active before ``set_scope``.
+    """
+    _current_scope.reset(token)
+
+
+@asynccontextmanager
+async def llm_slot() -> AsyncIterator[None]:
+    """
+    Holds an LLM-call slot of the current scope; a no-op outside a scope.
+    """
+    scope = _current_scope.get()
+    if scope is None:
+        yield
+        return
+    async with scope.llm.slot(scope.tenant):
+        yield
+
+
+@asynccontextmanager
+async def tool_slot() -> AsyncIterator[None]:
+    """
+    Holds a tool-call slot of the current scope; a no-op outside a scope.
+    """
+    scope = _current_scope.get()
+    if scope is None:
+        yield
+        return
+    async with scope.tools.slot(scope.tenant):
+        yield
@@ -0,0 +1,446 @@
+# src/janus/distributed.py
+import asyncio
+import itertools
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from janus.agent import BaseAgent
+from janus.memory import BaseMemory
+from janus.models import ChatMessage
+from janus.termination import (
+    Converged,
+    MaxSteps,
+    RunProgress,
+    TerminationPolicy,
+    stop_state,
+)
+from janus.tool import ToolRegistry
+
+logger = logging.getLogger(__name__)
+
+# Must return a new memory object on every call; see Worker.
+MemoryFactory = Callable[[str], BaseMemory]
+
+
+class StepTask(BaseModel):
+    """
+    One orchestrator step of a session, as sent to a worker.
+    """
+
+    task_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    session_id: str
+    step: int
+    state: Dict[str, Any] = Field(default_factory=dict)
+
+
+class StepResult(BaseModel):
+    """
+    The outcome of a ``StepTask``. The messages have already been written
+    to the session's memory by the worker.
+    """
+
+    task_id: str
+    session_id: str
+    messages: List[Dict[str, Any]] = Field(default_factory=list)
+    usage: Dict[str, int] = Field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class StepFailedError(RuntimeError):
+    """
+    Raised by ``DistributedOrchestrator`` when a worker fails a step.
+    """
+
+
+class WorkQueue(ABC):
+    """
+    Carries step tasks to workers and their results back.
+    Tasks and results cross the queue as JSON.
+    """
+
+    @abstractmethod
+    async def put_task(self, task: StepTask):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_task(self) -> StepTask:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def put_result(self, result: StepResult):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_result(self) -> StepResult:
+        raise NotImplementedError
+
+
+class InProcessWorkQueue(WorkQueue):
+    """
+    A queue for workers running on the same event loop as the coordinator.
+    Tasks are still serialized, so anything that works here works across
+    processes.
+    """
+
+    def __init__(self):
+        # Created on first use, inside the running loop: before Python 3.10
+        # a queue binds to the loop that is current when it is created.
+        self._task_queue: Optional["asyncio.Queue[str]"] = None
+        self._result_queue: Optional["asyncio.Queue[str]"] = None
+
+    @property
+    def _tasks(self) -> "asyncio.Queue[str]":
+        if self._task_queue is None:
+            self._task_queue = asyncio.Queue()
+        return self._task_queue
+
+    @property
+    def _results(self) -> "asyncio.Queue[str]":
+        if self._result_queue is None:
+            self._result_queue = asyncio.Queue()
+        return self._result_queue
+
+    async def put_task(self, task: StepTask):
+        await self._tasks.put(task.model_dump_json())
+
+    async def get_task(self) -> StepTask:
+        return StepTask.model_validate_json(await self._tasks.get())
+
+    async def put_result(self, result: StepResult):
+        await self._results.put(result.model_dump_json())
+
+    async def get_result(self) -> StepResult:
+        return StepResult.model_validate_json(await self._results.get())
+
+
+class SocketWorkQueueServer(InProcessWorkQueue):
+    """
+    A queue served over a local TCP socket, for workers in other processes
+    (or on other hosts) that connect with ``SocketWorkQueue``.
+
+    The server is itself a ``WorkQueue``: the coordinator uses it directly,
+    and local workers may too. The protocol is one JSON request and one
+    JSON reply per line. Delivery is at most once: a task handed to a
+    worker that dies is lost, and its session fails after the step times
+    out on the coordinator.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """
+        Starts listening. With ``port=0`` the chosen port is stored in
+        ``self.port``.
+        """
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Work queue listening on {self.host}:{self.port}")
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                request = json.loads(line)
+                op = request.get("op")
+                if op == "put_task":
+                    await self._tasks.put(request["payload"])
+                    reply = None
+                elif op == "get_task":
+                    reply = await self._take(self._tasks, reader)
+                elif op == "put_result":
+                    await self._results.put(request["payload"])
+                    reply = None
+                elif op == "get_result":
+                    reply = await self._take(self._results, reader)
+                else:
+                    reply = None
+                    logger.warning(f"Ignoring unknown work queue op {op!r}")
+                try:
+                    writer.write(json.dumps({"payload": reply}).encode() + b"\n")
+                    await writer.drain()
+                except ConnectionError:
+                    if op == "get_task":
+                        await self._tasks.put(reply)
+                    elif op == "get_result":
+                        await self._results.put(reply)
+                    raise
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.info(f"Work queue client disconnected: {e}")
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _take(queue: "asyncio.Queue[str]", reader: asyncio.StreamReader) -> str:
+        # Clients send nothing while waiting for a reply, so reading here
+        # only completes when the client disconnects. Watching for that
+        # keeps an item from being handed to a client that is gone.
+        get = asyncio.ensure_future(queue.get())
+        eof = asyncio.ensure_future(reader.read(1))
+        try:
+            await asyncio.wait({get, eof}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for pending in (get, eof):
+                if not pending.done():
+                    pending.cancel()
+            # Let the read settle before the connection is read from again.
+            await asyncio.wait({get, eof})
+        if not eof.cancelled():
+            if get.done() and not get.cancelled():
+                queue.put_nowait(get.result())
+            raise ConnectionError("Client disconnected while waiting.")
+        return get.result()
+
+
+class SocketWorkQueue(WorkQueue):
+    """
+    The client side of ``SocketWorkQueueServer``. Each request in flight
+    uses its own connection, so a worker waiting for a task does not hold
+    up the result it is about to send, and idle connections are reused.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def put_task(self, task: StepTask):
+        await self._request("put_task", task.model_dump_json())
+
+    async def get_task(self) -> StepTask:
+        return StepTask.model_validate_json(await self._request("get_task"))
+
+    async def put_result(self, result: StepResult):
+        await self._request("put_result", result.model_dump_json())
+
+    async def get_result(self) -> StepResult:
+        return StepResult.model_validate_json(await self._request("get_result"))
+
+    async def close(self):
+        """
+        Closes the idle connections.
+        """
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    async def _request(self, op: str, payload: Optional[str] = None) -> Any:
+        if self._idle:
+            reader, writer = self._idle.pop()
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            request = {"op": op, "payload": payload}
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("Work queue server closed the connection.")
+        except BaseException:
+            writer.close()
+            raise
+        self._idle.append((reader, writer))
+        return json.loads(line)["payload"]
+
+
+class Worker:
+    """
+    Executes step tasks from a queue. Session state is read from and
+    written to the memory returned by ``memory_for(session_id)``, so any
+    worker sharing that memory can run any step of any session.
+
+    ``memory_for`` must build a new memory for every step, such as
+    ``store.session(session_id)`` on a shared ``SQLiteMemoryStore``. A
+    memory cached per worker would hold a stale tail and sequence numbers
+    once another worker has written to the session, breaking
+    ``SQLiteMemory``'s single-writer rule. A fresh memory reloads both.
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        agent: BaseAgent,
+        tools: ToolRegistry,
+        memory_for: MemoryFactory,
+        concurrency: int = 1,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self.queue = queue
+        self.agent = agent
+        self.tools = tools
+        self.memory_for = memory_for
+        self.concurrency = concurrency
+        self.completed = 0
+        self.failed = 0
+
+    async def run(self):
+        """
+        Processes tasks until cancelled.
+        """
+        loops = [
+            asyncio.ensure_future(self._loop()) for _ in range(self.concurrency)
+        ]
+        try:
+            await asyncio.gather(*loops)
+        finally:
+            for loop in loops:
+                loop.cancel()
+
+    async def run_once(self):
+        """
+        Processes a single task.
+        """
+        task = await self.queue.get_task()
+        await self.queue.put_result(await self._execute(task))
+
+    async def _loop(self):
+        while True:
+            await self.run_once()
+
+    async def _execute(self, task: StepTask) -> StepResult:
+        logger.info(
+            "Worker running step %d of session %s", task.step, task.session_id
+        )
+        try:
+            memory = self.memory_for(task.session_id)
+            context = await memory.get_context()
+            output = await self.agent.execute({**task.state, **context}, self.tools)
+            new_messages = output.get("messages_to_add", [])
+            for message in new_messages:
+                await memory.add(message)
+        except Exception as e:
+            logger.error(f"Step {task.step} of session {task.session_id} failed: {e}")
+            self.failed += 1
+            return StepResult(
+                task_id=task.task_id, session_id=task.session_id, error=str(e)
+            )
+        self.completed += 1
+        return StepResult(
+            task_id=task.task_id,
+            session_id=task.session_id,
+            messages=[
+                m.model_dump(mode="json") if isinstance(m, BaseModel) else m
+                for m in new_messages
+            ],
+            usage=output.get("usage") or {},
+        )
+
+
+class DistributedOrchestrator:
+    """
+    Runs sessions by sending each step to a worker through a ``WorkQueue``.
+
+    It mirrors ``AsyncLocalOrchestrator.run``: initial messages are added
+    to the session memory, the state is yielded after every step, and the
+    termination policy decides when to stop. Because all state lives in
+    the shared memory, a session can be resumed later, from any
+    coordinator, by running it again with its session id. Results are
+    collected from the queue by one coordinator at a time, so close the
+    previous coordinator of a queue before another one takes over.
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        memory_for: MemoryFactory,
+        termination: Optional[TerminationPolicy] = None,
+        step_timeout: Optional[float] = None,
+    ):
+        self.queue = queue
+        self.memory_for = memory_for
+        self.termination = termination if termination is not None else Converged()
+        self.step_timeout = step_timeout
+        self._waiting: Dict[str, "asyncio.Future[StepResult]"] = {}
+        self._collector: Optional["asyncio.Task[None]"] = None
+
+    async def run(
+        self,
+        session_id: str,
+        initial_state: Dict[str, Any],
+        max_steps: int = 5,
+        termination: Optional[TerminationPolicy] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Runs a session step by step on the workers.
+
+        Raises:
+            StepFailedError: If a worker reports an error for a step.
+            asyncio.TimeoutError: If a step takes longer than ``step_timeout``.
+        """
+        state = dict(initial_state)
+        messages = state.pop("messages", [])
+        memory = self.memory_for(session_id)
+        for msg_data in messages:
+            await memory.add(ChatMessage(**msg_data))
+        policy = termination if termination is not None else self.termination
+        policy = policy | MaxSteps(max_steps)
+        progress = RunProgress()
+
+        for step in itertools.count(1):
+            logger.info("Dispatching step %d of session %s", step, session_id)
+            result = await self._submit(
+                StepTask(session_id=session_id, step=step, state=state)
+            )
+            if result.error is not None:
+                raise StepFailedError(
+                    f"Step {step} of session {session_id} failed: {result.error}"
+                )
+            progress.record_step(result.messages, result.usage)
+            context = await self.memory_for(session_id).get_context()
+            reason = policy.check(progress)
+            if reason is None:
+                yield context
+                continue
+            logger.info("Session %s stopping: %s", session_id, reason.value)
+            yield stop_state(context, reason, progress)
+            return
+
+    async def aclose(self):
+        """
+        Stops collecting results. Sessions still running will time out.
+        """
+        if self._collector is not None:
+            self._collector.cancel()
+            await asyncio.gather(self._collector, return_exceptions=True)
+            self._collector = None
+
+    async def _submit(self, task: StepTask) -> StepResult:
+        if self._collector is None or self._collector.done():
+            self._collector = asyncio.ensure_future(self._collect())
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[task.task_id] = future
+        try:
+            await self.queue.put_task(task)
+            return await asyncio.wait_for(future, self.step_timeout)
+        finally:
+            self._waiting.pop(task.task_id, None)
+
+    async def _collect(self):
+        while self._waiting:
+            result = await self.queue.get_result()
+            future = self._waiting.get(result.task_id)
+            if future is None:
+                logger.warning(f"Dropping result of unknown task {result.task_id}")
+            elif not future.done():
+                future.set_result(result)
@@ -0,0 +1,293 @@
+# src/janus/events.py
+import copy
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# name, level, created, payload, renderer
+_Event = Tuple[str, int, float, Any, Optional[Callable[[Any], Any]]]
+
+
+class EventSink(ABC):
+    """
+    Abstract base class for event sinks. Sinks receive rendered events in
+    batches, on the pipeline's flusher thread.
+    """
+
+    @abstractmethod
+    def write(self, events: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class RingBufferSink(EventSink):
+    """
+    Keeps the last ``capacity`` rendered events in memory.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def write(self, events: List[Dict[str, Any]]):
+        with self._lock:
+            self._events.extend(events)
+
+    def events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def lines(self) -> List[str]:
+        """
+        Returns the events as log-style lines.
+        """
+        return [f"{e['level']} {e['name']}: {e['payload']}" for e in self.events()]
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+
+class JSONLinesSink(EventSink):
+    """
+    Appends events to a JSON-lines file, one write per batch.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, events: List[Dict[str, Any]]):
+        self._file.write(
+            "".join(json.dumps(event, default=str) + "\n" for event in events)
+        )
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class EventPipeline:
+    """
+    A bounded, non-blocking pipeline for logs and structured events.
+
+    ``emit`` only appends the raw payload to a ring buffer of
+    ``capacity`` events; when the buffer is full the oldest event is
+    dropped and counted. A background thread renders payloads (calling
+    them if they are callables, formatting log records) and writes them to
+    the sinks in batches of up to ``batch_size``, every
+    ``flush_interval`` seconds or sooner once a batch is waiting, so
+    neither formatting nor I/O runs on the event loop.
+
+    ``sample_rates`` maps event names to the fraction of events to keep;
+    sampling is deterministic, keeping one event in every ``1 / rate``.
+    Payload callables run on another thread and must only read data that
+    is no longer mutated.
+    """
+
+    def __init__(
+        self,
+        sinks: Sequence[EventSink],
+        capacity: int = 10000,
+        batch_size: int = 512,
+        flush_interval: float = 0.25,
+        sample_rates: Optional[Dict[str, float]] = None,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.sinks = list(sinks)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._sample_every: Dict[str, int] = {}
+        for name, rate in (sample_rates or {}).items():
+            self.set_sample_rate(name, rate)
+        self._sample_counts: Dict[str, int] = {}
+        self._buffer: Deque[_Event] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.emitted = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.render_errors = 0
+        self.sink_errors = 0
+
+    def set_sample_rate(self, name: str, rate: float):
+        """
+        Keeps a fraction ``rate`` (0 to 1) of the events called ``name``.
+        """
+        if not 0 <= rate <= 1:
+            raise ValueError("Sample rates must be between 0 and 1.")
+        self._sample_every[name] = round(1 / rate) if rate > 0 else 0
+
+    def emit(
+        self,
+        name: str,
+        payload: Any = None,
+        level: int = logging.INFO,
+        renderer: Optional[Callable[[Any], Any]] = None,
+    ) -> bool:
+        """
+        Queues an event without rendering it. Returns False if the event
+        was sampled out.
+        """
+        every = self._sample_every.get(name)
+        with self._lock:
+            if every is not None:
+                count = self._sample_counts.get(name, 0)
+                self._sample_counts[name] = count + 1
+                if every == 0 or count % every:
+                    self.sampled_out += 1
+                    return False
+            if len(self._buffer) == self.capacity:
+                self.dropped += 1
+            self._buffer.append((name, level, time.time(), payload, renderer))
+            self.emitted += 1
+            pending = len(self._buffer)
+        if pending >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def start(self):
+        """
+        Starts the background flusher thread.
+        """
+        if self._thread is None:
+            self._closed = False
+            self._thread = threading.Thread(
+                target=self._run, name="janus-events", daemon=True
+            )
+            self._thread.start()
+
+    def flush(self):
+        """
+        Renders and writes every queued event now, on the calling thread.
+        """
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    count = min(len(self._buffer), self.batch_size)
+                    batch = [self._buffer.popleft() for _ in range(count)]
+                if not batch:
+                    return
+                self._write(batch)
+
+    def close(self):
+        """
+        Stops the flusher thread, flushes what is left and closes the sinks.
+        """
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "emitted": self.emitted,
+            "sampled_out": self.sampled_out,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "pending": len(self._buffer),
+            "render_errors": self.render_errors,
+            "sink_errors": self.sink_errors,
+        }
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _write(self, batch: List[_Event]):
+        rendered = []
+        for name, level, created, payload, renderer in batch:
+            try:
+                if renderer is not None:
+                    payload = renderer(payload)
+                elif callable(payload):
+                    payload = payload()
+            except Exception as e:
+                self.render_errors += 1
+                payload = f"<render failed: {e!r}>"
+            rendered.append(
+                {
+                    "name": name,
+                    "level": logging.getLevelName(level),
+                    "time": created,
+                    "payload": payload,
+                }
+            )
+        for sink in self.sinks:
+            try:
+                sink.write(rendered)
+            except Exception:
+                # Not logged: the log may feed this very pipeline.
+                self.sink_errors += 1
+        self.flushed += len(rendered)
+
+
+class PipelineHandler(logging.Handler):
+    """
+    A logging handler that queues records on an ``EventPipeline``. The
+    message is merged with its arguments when the record is queued, so
+    later changes to mutable arguments do not show up in the log; the
+    rest of the formatting (timestamps, tracebacks, the format string)
+    happens on the flusher thread. Events are named after the logger.
+    """
+
+    def __init__(self, pipeline: EventPipeline, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.pipeline = pipeline
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            message = record.getMessage()
+        except Exception:
+            self.handleError(record)
+            return
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        self.pipeline.emit(record.name, record, record.levelno, self.format)
+
+
+_pipeline: Optional[EventPipeline] = None
+
+
+def set_pipeline(pipeline: Optional[EventPipeline]):
+    """
+    Installs the process-wide event pipeline; None turns events off.
+    """
+    global _pipeline
+    _pipeline = pipeline
+
+
+def get_pipeline() -> Optional[EventPipeline]:
+    return _pipeline
+
+
+def emit(name: str, payload: Any = None, level: int = logging.INFO) -> bool:
+    """
+    Emits a structured event on the installed pipeline, if any.
+    """
+    if _pipeline is None:
+        return False
+    return _pipeline.emit(name, payload, level)
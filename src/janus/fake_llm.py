@@ -0,0 +1,288 @@
+# src/janus/fake_llm.py
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from pydantic import BaseModel, Field
+
+from janus.llm_client import LLMClientPool
+
+logger = logging.getLogger(__name__)
+
+
+class FakeToolCall(BaseModel):
+    """
+    A scripted tool call. Dict arguments are sent as compact JSON.
+    """
+
+    name: str
+    arguments: Union[str, Dict[str, Any]] = Field(default_factory=dict)
+
+    def arguments_json(self) -> str:
+        if isinstance(self.arguments, str):
+            return self.arguments
+        return json.dumps(self.arguments, separators=(",", ":"), sort_keys=True)
+
+
+class FakeTurn(BaseModel):
+    """
+    One scripted assistant response, and how long it takes to arrive.
+    """
+
+    content: Optional[str] = None
+    tool_calls: List[FakeToolCall] = Field(default_factory=list)
+    latency: Optional[float] = None
+
+
+Responder = Callable[[List[Dict[str, Any]], Sequence[Dict[str, Any]]], FakeTurn]
+
+
+class _Function(BaseModel):
+    name: Optional[str] = None
+    arguments: Optional[str] = None
+
+
+class _ToolCall(BaseModel):
+    id: str
+    type: str = "function"
+    function: _Function
+
+
+class _ToolCallDelta(BaseModel):
+    index: int
+    id: Optional[str] = None
+    type: Optional[str] = None
+    function: _Function
+
+
+class _Message(BaseModel):
+    role: str = "assistant"
+    content: Optional[str] = None
+    tool_calls: Optional[List[_ToolCall]] = None
+
+
+class _Delta(BaseModel):
+    role: Optional[str] = None
+    content: Optional[str] = None
+    tool_calls: Optional[List[_ToolCallDelta]] = None
+
+
+class _Usage(BaseModel):
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+class _Choice(BaseModel):
+    index: int = 0
+    message: Optional[_Message] = None
+    delta: Optional[_Delta] = None
+    finish_reason: Optional[str] = None
+
+
+class _Completion(BaseModel):
+    choices: List[_Choice]
+    usage: Optional[_Usage] = None
+
+
+def _count_tokens(text: str) -> int:
+    return max(len(text) // 4, 1)
+
+
+class FakeChatBackend:
+    """
+    A deterministic, in-process stand-in for a chat-completions provider.
+
+    Responses come from ``script``: the turn used for a request is picked
+    by how many assistant messages the conversation already holds, so each
+    session walks through the script in order no matter how sessions
+    interleave, and wraps around at the end. A ``responder`` function can
+    compute turns instead. Every response is delayed by ``latency``
+    seconds unless its turn sets its own. Tool call ids and token counts
+    derive from the conversation only, so runs are reproducible.
+
+    The last ``record_requests`` requests are kept in ``requests`` for
+    tests to inspect (0 records none), and ``request_count`` counts them
+    all, so a long load test does not grow the backend without bound.
+
+    ``StandardPlannerAgent`` targets it through ``client_pool()``, for both
+    ``execute`` and ``stream``; ``reply`` plugs it into a
+    ``MockChatServer``.
+    """
+
+    def __init__(
+        self,
+        script: Optional[Sequence[Union[FakeTurn, Dict[str, Any]]]] = None,
+        responder: Optional[Responder] = None,
+        latency: float = 0.0,
+        stream_chunk_chars: int = 16,
+        record_requests: int = 100,
+    ):
+        if script is None and responder is None:
+            raise ValueError("A script or a responder is required.")
+        self.script = [FakeTurn.model_validate(turn) for turn in script or []]
+        self.responder = responder
+        self.latency = latency
+        self.stream_chunk_chars = stream_chunk_chars
+        self.requests: Deque[Dict[str, Any]] = deque(maxlen=record_requests)
+        self.request_count = 0
+
+    def turn(
+        self, messages: List[Dict[str, Any]], tools: Sequence[Dict[str, Any]] = ()
+    ) -> FakeTurn:
+        """
+        Returns the scripted response to a conversation.
+        """
+        if self.responder is not None:
+            return self.responder(messages, tools)
+        answered = sum(1 for m in messages if m.get("role") == "assistant")
+        return self.script[answered % len(self.script)]
+
+    def reply(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns the assistant message for a request body, in wire format.
+        """
+        messages = request.get("messages", [])
+        return self._message(messages, self.turn(messages, request.get("tools", ())))
+
+    def client_factory(self, **kwargs: Any) -> "FakeChatClient":
+        return FakeChatClient(self)
+
+    def client_pool(self, **kwargs: Any) -> LLMClientPool:
+        """
+        Returns a client pool whose clients all talk to this backend.
+        """
+        return LLMClientPool(client_factory=self.client_factory, **kwargs)
+
+    async def create(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Sequence[Dict[str, Any]] = (),
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        self.request_count += 1
+        if self.requests.maxlen:
+            self.requests.append({"messages": list(messages), "tools": list(tools)})
+        turn = self.turn(list(messages), tools)
+        latency = turn.latency if turn.latency is not None else self.latency
+        if latency > 0:
+            await asyncio.sleep(latency)
+        message = self._message(messages, turn)
+        usage = _Usage(
+            prompt_tokens=_count_tokens(json.dumps(list(messages), default=str)),
+            completion_tokens=_count_tokens(json.dumps(message)),
+            total_tokens=0,
+        )
+        usage.total_tokens = usage.prompt_tokens + usage.completion_tokens
+        if stream:
+            return self._chunks(message, usage)
+        return _Completion(
+            choices=[
+                _Choice(
+                    message=_Message.model_validate(message),
+                    finish_reason="tool_calls" if turn.tool_calls else "stop",
+                )
+            ],
+            usage=usage,
+        )
+
+    def _message(
+        self, messages: Sequence[Dict[str, Any]], turn: FakeTurn
+    ) -> Dict[str, Any]:
+        message: Dict[str, Any] = {"role": "assistant", "content": turn.content}
+        if turn.tool_calls:
+            message["tool_calls"] = [
+                {
+                    "id": f"call_{len(messages)}_{index}",
+                    "type": "function",
+                    "function": {"name": call.name, "arguments": call.arguments_json()},
+                }
+                for index, call in enumerate(turn.tool_calls)
+            ]
+        return message
+
+    async def _chunks(
+        self, message: Dict[str, Any], usage: _Usage
+    ) -> AsyncIterator[_Completion]:
+        content = message.get("content") or ""
+        size = self.stream_chunk_chars
+        for start in range(0, len(content), size):
+            delta = _Delta(content=content[start : start + size])
+            yield _Completion(choices=[_Choice(delta=delta)])
+        for index, call in enumerate(message.get("tool_calls") or []):
+            arguments = call["function"]["arguments"]
+            half = len(arguments) // 2
+            # Arguments arrive in fragments, as they do from real providers.
+            for position, fragment in enumerate((arguments[:half], arguments[half:])):
+                function = _Function(
+                    name=call["function"]["name"] if position == 0 else None,
+                    arguments=fragment,
+                )
+                tool_call = _ToolCallDelta(
+                    index=index,
+                    id=call["id"] if position == 0 else None,
+                    type="function" if position == 0 else None,
+                    function=function,
+                )
+                yield _Completion(
+                    choices=[_Choice(delta=_Delta(tool_calls=[tool_call]))]
+                )
+        yield _Completion(choices=[], usage=usage)
+
+
+class _RawResponse:
+    def __init__(self, parsed: Any):
+        self.headers: Dict[str, str] = {}
+        self._parsed = parsed
+
+    def parse(self) -> Any:
+        return self._parsed
+
+
+class _RawCompletions:
+    def __init__(self, backend: FakeChatBackend):
+        self._backend = backend
+
+    async def create(self, **kwargs: Any) -> _RawResponse:
+        return _RawResponse(await self._backend.create(**kwargs))
+
+
+class _Completions:
+    def __init__(self, backend: FakeChatBackend):
+        self._backend = backend
+        self.with_raw_response = _RawCompletions(backend)
+
+    async def create(self, **kwargs: Any) -> Any:
+        return await self._backend.create(**kwargs)
+
+
+class _Chat:
+    def __init__(self, backend: FakeChatBackend):
+        self.completions = _Completions(backend)
+
+
+class FakeChatClient:
+    """
+    The subset of the async OpenAI client that agents use, answering from
+    a ``FakeChatBackend``.
+    """
+
+    def __init__(self, backend: FakeChatBackend):
+        self.backend = backend
+        self.chat = _Chat(backend)
+
+    async def close(self):
+        pass
@@ -0,0 +1,323 @@
+# src/janus/graph.py
+import asyncio
+import logging
+from collections.abc import Sequence
+from itertools import chain
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+
+from janus.agent import BaseAgent
+from janus.memory import MessageSequence
+from janus.models import ChatMessage, to_wire
+from janus.tool import ToolRegistry
+
+logger = logging.getLogger(__name__)
+
+END = "__end__"
+
+Route = Union[str, Sequence]
+Router = Callable[[Dict[str, Any]], Route]
+
+
+class GraphError(ValueError):
+    """
+    Raised when a graph definition is invalid.
+    """
+
+
+class GraphRecursionError(RuntimeError):
+    """
+    Raised when a traversal runs more nodes than ``max_node_runs`` allows,
+    usually because of a cycle whose router never reaches ``END``.
+    """
+
+
+class MessageChain(MessageSequence):
+    """
+    A read-only concatenation of message sequences.
+
+    Each node sees the messages it was given plus those its upstream nodes
+    added. The chain only references those segments, so handing state to
+    the next node costs O(number of upstream runs), not O(messages), and
+    parallel branches share the common history instead of copying it.
+    """
+
+    __slots__ = ("_segments", "_length")
+
+    def __init__(self, segments: Tuple[Sequence, ...]):
+        self._segments = tuple(s for s in segments if len(s))
+        self._length = sum(len(s) for s in self._segments)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("MessageChain index out of range")
+        for segment in self._segments:
+            if index < len(segment):
+                return segment[index]
+            index -= len(segment)
+        raise IndexError("MessageChain index out of range")
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return chain.from_iterable(self._segments)
+
+
+class _Run:
+    """
+    One execution of a node within a traversal.
+    """
+
+    __slots__ = ("run_id", "node", "lineage", "order", "messages", "dumped", "usage")
+
+    def __init__(
+        self,
+        run_id: int,
+        node: str,
+        lineage: Tuple[int, ...],
+        order: Tuple[int, ...],
+    ):
+        self.run_id = run_id
+        self.node = node
+        # Ids of the upstream runs whose messages this run saw, in order.
+        self.lineage = lineage
+        # Position in the graph as declared: the upstream run's order plus
+        # this node's index among its targets. Independent of timing.
+        self.order = order
+        self.messages: List[ChatMessage] = []
+        self.dumped: Tuple[Dict[str, Any], ...] = ()
+        self.usage: Dict[str, int] = {}
+
+
+class AgentGraph(BaseAgent):
+    """
+    Runs several agents as a graph within one orchestrator step.
+
+    Nodes are agents; edges route a node's output to the next nodes, either
+    unconditionally or through a router that picks targets from the state.
+    A node whose edges lead to several targets fans out, and the branches
+    run concurrently. ``add_edge((a, b), c)`` fans in: ``c`` runs once,
+    after both ``a`` and ``b``, and sees the messages of both branches.
+    Routing to ``END`` finishes a branch.
+
+    The graph is itself an agent, so it plugs into ``AsyncLocalOrchestrator``
+    (and its memory, termination policies and scheduler) unchanged; every
+    message the nodes add is returned as one step's ``messages_to_add``.
+    """
+
+    def __init__(self, max_node_runs: int = 25):
+        if max_node_runs < 1:
+            raise ValueError("max_node_runs must be at least 1.")
+        self.max_node_runs = max_node_runs
+        self._nodes: Dict[str, BaseAgent] = {}
+        self._edges: Dict[str, List[str]] = {}
+        self._routers: Dict[str, Router] = {}
+        self._joins: Dict[str, Tuple[str, ...]] = {}
+        self._entry: Tuple[str, ...] = ()
+
+    def add_node(self, name: str, agent: BaseAgent) -> "AgentGraph":
+        """
+        Adds a node.
+
+        Raises:
+            GraphError: If the name is reserved or already used.
+        """
+        if name == END or name in self._nodes:
+            raise GraphError(f"Node name '{name}' is reserved or already used.")
+        self._nodes[name] = agent
+        return self
+
+    def add_edge(
+        self, source: Union[str, Tuple[str, ...]], target: str
+    ) -> "AgentGraph":
+        """
+        Routes ``source`` to ``target`` unconditionally. A tuple of sources
+        makes ``target`` a join that waits for all of them.
+
+        Raises:
+            GraphError: If a node is unknown or the target already has a join.
+        """
+        sources = (source,) if isinstance(source, str) else tuple(source)
+        for name in sources:
+            self._check_node(name)
+        if target != END:
+            self._check_node(target)
+        if len(sources) > 1:
+            if target in self._joins:
+                raise GraphError(f"Node '{target}' already has a join.")
+            self._joins[target] = sources
+        for name in sources:
+            self._edges.setdefault(name, []).append(target)
+        return self
+
+    def add_conditional_edges(self, source: str, router: Router) -> "AgentGraph":
+        """
+        Routes ``source`` to the node name (or names) returned by
+        ``router(state)``, where ``state`` includes the node's messages.
+
+        Raises:
+            GraphError: If the node is unknown or already has a router.
+        """
+        self._check_node(source)
+        if source in self._routers:
+            raise GraphError(f"Node '{source}' already has a router.")
+        self._routers[source] = router
+        return self
+
+    def set_entry(self, *names: str) -> "AgentGraph":
+        """
+        Sets the nodes a traversal starts from; several run concurrently.
+
+        Raises:
+            GraphError: If a node is unknown.
+        """
+        for name in names:
+            self._check_node(name)
+        self._entry = names
+        return self
+
+    async def execute(
+        self, state: Dict[str, Any], tools: ToolRegistry
+    ) -> Dict[str, Any]:
+        """
+        Runs one traversal of the graph.
+
+        Raises:
+            GraphError: If no entry node is set or a router returns an
+                unknown node.
+            GraphRecursionError: If more than ``max_node_runs`` nodes run.
+        """
+        if not self._entry:
+            raise GraphError("The graph has no entry node.")
+        base_messages = state.get("messages", ())
+        runs: Dict[int, _Run] = {}
+        finished: List[_Run] = []
+        pending: Dict["asyncio.Future[None]", _Run] = {}
+        arrivals: Dict[str, Dict[str, Tuple[_Run, Tuple[int, ...]]]] = {}
+
+        def schedule(node: str, lineage: Tuple[int, ...], order: Tuple[int, ...]):
+            if len(runs) >= self.max_node_runs:
+                raise GraphRecursionError(
+                    f"Graph exceeded {self.max_node_runs} node runs."
+                )
+            run = _Run(len(runs), node, lineage, order)
+            runs[run.run_id] = run
+            messages = self._messages(base_messages, lineage, runs)
+            node_state = {**state, "messages": messages}
+            task = asyncio.ensure_future(self._run_node(run, node_state, tools))
+            pending[task] = run
+
+        def arrive(target: str, source: _Run, order: Tuple[int, ...]):
+            sources = self._joins.get(target)
+            if sources is None:
+                schedule(target, source.lineage + (source.run_id,), order)
+                return
+            waiting = arrivals.setdefault(target, {})
+            waiting[source.node] = (source, order)
+            if len(waiting) == len(sources):
+                fire_join(target)
+
+        def fire_join(target: str):
+            waiting = arrivals.pop(target)
+            lineage: Dict[int, None] = {}
+            for name in self._joins[target]:
+                if name in waiting:
+                    source, _ = waiting[name]
+                    lineage.update(dict.fromkeys(source.lineage + (source.run_id,)))
+            schedule(target, tuple(lineage), max(o for _, o in waiting.values()))
+
+        for index, node in enumerate(self._entry):
+            schedule(node, (), (index,))
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                completed = sorted(
+                    ((pending.pop(task), task) for task in done),
+                    key=lambda item: item[0].order,
+                )
+                # Retrieve every outcome before raising, so a second failed
+                # branch's exception is never left unretrieved.
+                errors = [
+                    asyncio.CancelledError() if task.cancelled() else task.exception()
+                    for _, task in completed
+                ]
+                error = next((e for e in errors if e is not None), None)
+                if error is not None:
+                    raise error
+                for run, _ in completed:
+                    finished.append(run)
+                    targets = self._targets(run, base_messages, runs, state)
+                    for index, target in enumerate(targets):
+                        if target != END:
+                            arrive(target, run, run.order + (index,))
+                if not pending and arrivals:
+                    # Some join sources were never routed to; run the joins
+                    # with the branches that did arrive.
+                    for target in list(arrivals):
+                        fire_join(target)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        # Merge in declaration order, not completion order, so concurrent
+        # branches give the same transcript on every run.
+        finished.sort(key=lambda run: (run.order, run.run_id))
+        usage: Dict[str, int] = {}
+        for run in finished:
+            for key, value in run.usage.items():
+                usage[key] = usage.get(key, 0) + value
+        return {
+            "messages_to_add": [m for run in finished for m in run.messages],
+            "usage": usage,
+        }
+
+    async def _run_node(
+        self, run: _Run, node_state: Dict[str, Any], tools: ToolRegistry
+    ):
+        logger.info("Running graph node %s", run.node)
+        output = await self._nodes[run.node].execute(node_state, tools)
+        run.messages = list(output.get("messages_to_add", []))
+        run.dumped = tuple(
+            to_wire(m) if isinstance(m, ChatMessage) else m for m in run.messages
+        )
+        run.usage = output.get("usage") or {}
+
+    def _targets(
+        self,
+        run: _Run,
+        base_messages: Sequence,
+        runs: Dict[int, _Run],
+        state: Dict[str, Any],
+    ) -> List[str]:
+        targets = list(self._edges.get(run.node, []))
+        router = self._routers.get(run.node)
+        if router is not None:
+            lineage = run.lineage + (run.run_id,)
+            messages = self._messages(base_messages, lineage, runs)
+            route = router({**state, "messages": messages})
+            targets.extend([route] if isinstance(route, str) else route)
+        for target in targets:
+            if target != END and target not in self._nodes:
+                raise GraphError(
+                    f"Node '{run.node}' routed to unknown node '{target}'."
+                )
+        # The same target reached twice from one run runs once.
+        return list(dict.fromkeys(targets))
+
+    @staticmethod
+    def _messages(
+        base_messages: Sequence, lineage: Tuple[int, ...], runs: Dict[int, _Run]
+    ) -> MessageChain:
+        return MessageChain((base_messages, *(runs[i].dumped for i in lineage)))
+
+    def _check_node(self, name: str):
+        if name not in self._nodes:
+            raise GraphError(f"Unknown node '{name}'.")
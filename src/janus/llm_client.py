@@ -0,0 +1,316 @@
+# src/janus/llm_client.py
+import asyncio
+import logging
+import re
+import time
+import weakref
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from janus.cache import SingleFlight
+from janus.providers import get_provider
+
+logger = logging.getLogger(__name__)
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# provider, api_key, base_url
+_ClientKey = Tuple[str, str, Optional[str]]
+
+
+def parse_reset_duration(value: str) -> Optional[float]:
+    """
+    Parses a rate-limit reset header such as ``"1s"``, ``"6m0s"`` or
+    ``"20ms"`` into seconds.
+    """
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously at ``rate_per_minute``.
+    A rate of ``None`` means unlimited.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: Optional[float] = None,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.clock = clock
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity or 0.0
+        self._updated = clock()
+        self._blocked_until = 0.0
+
+    def delay_for(self, amount: float) -> float:
+        """
+        Seconds to wait until ``amount`` tokens are available.
+        """
+        now = self._refill()
+        blocked = max(self._blocked_until - now, 0.0)
+        if self.rate_per_minute is None:
+            return blocked
+        needed = min(amount, self.capacity)
+        if self.tokens >= needed:
+            return blocked
+        return max(blocked, (needed - self.tokens) * 60.0 / self.rate_per_minute)
+
+    def consume(self, amount: float):
+        """
+        Takes tokens out of the bucket; the balance may go negative.
+        """
+        self._refill()
+        if self.rate_per_minute is not None:
+            self.tokens -= amount
+
+    def update(
+        self,
+        limit: Optional[float] = None,
+        remaining: Optional[float] = None,
+        reset_after: Optional[float] = None,
+    ):
+        """
+        Aligns the bucket with limits reported by the provider.
+        """
+        now = self._refill()
+        if limit is not None and limit != self.rate_per_minute:
+            unlimited = self.rate_per_minute is None
+            self.rate_per_minute = limit
+            self.capacity = limit
+            self.tokens = limit if unlimited else min(self.tokens, limit)
+        if remaining is not None:
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= 0 and reset_after is not None:
+                self._blocked_until = max(self._blocked_until, now + reset_after)
+
+    def _refill(self) -> float:
+        now = self.clock()
+        if self.rate_per_minute is not None:
+            elapsed = now - self._updated
+            self.tokens = min(
+                self.capacity, self.tokens + elapsed * self.rate_per_minute / 60.0
+            )
+        self._updated = now
+        return now
+
+
+class RateLimiter:
+    """
+    Client-side limiter on requests per minute and tokens per minute.
+
+    Callers reserve an estimated token count before a request and settle
+    it with the actual usage afterwards. Limits reported in the provider's
+    ``x-ratelimit-*`` response headers override the configured ones, so
+    requests are held back before the provider would answer with a 429.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.requests = TokenBucket(requests_per_minute, clock=clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock)
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+
+    async def acquire(self, estimated_tokens: int = 0):
+        """
+        Waits until one request and ``estimated_tokens`` tokens are available,
+        then reserves them.
+        """
+        throttled = False
+        while True:
+            delay = max(
+                self.requests.delay_for(1), self.tokens.delay_for(estimated_tokens)
+            )
+            if delay <= 0:
+                break
+            if not throttled:
+                throttled = True
+                self.throttled += 1
+            self.throttled_seconds += delay
+            await asyncio.sleep(delay)
+        self.requests.consume(1)
+        self.tokens.consume(estimated_tokens)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """
+        Corrects a reservation once the actual token usage is known.
+        """
+        self.tokens.consume(actual_tokens - estimated_tokens)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Applies ``x-ratelimit-*`` headers from a provider response.
+        """
+
+        def number(name: str) -> Optional[float]:
+            value = headers.get(name)
+            try:
+                return float(value) if value is not None else None
+            except ValueError:
+                return None
+
+        def duration(name: str) -> Optional[float]:
+            value = headers.get(name)
+            return parse_reset_duration(value) if value is not None else None
+
+        self.requests.update(
+            limit=number("x-ratelimit-limit-requests"),
+            remaining=number("x-ratelimit-remaining-requests"),
+            reset_after=duration("x-ratelimit-reset-requests"),
+        )
+        self.tokens.update(
+            limit=number("x-ratelimit-limit-tokens"),
+            remaining=number("x-ratelimit-remaining-tokens"),
+            reset_after=duration("x-ratelimit-reset-tokens"),
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns throttling counters and the current bucket levels.
+        """
+        return {
+            "throttled": self.throttled,
+            "throttled_seconds": self.throttled_seconds,
+            "requests_available": self.requests.tokens,
+            "tokens_available": self.tokens.tokens,
+        }
+
+
+class LLMClientPool:
+    """
+    Shares LLM clients, and the keep-alive connections they hold, across
+    agents.
+
+    One client is kept per provider, credentials and event loop, since
+    connections cannot outlive the loop that opened them. Rate limiters are
+    kept per provider and credentials only, so every agent in the process
+    sees the same budget. So are the single-flight groups agents use to
+    coalesce identical in-flight requests.
+
+    Clients come from the factory registered for ``provider`` in
+    ``janus.providers``, resolved (and its SDK imported) when the first
+    client is created; ``client_factory`` replaces it for the pool's
+    default provider. ``client_options`` are passed to every factory call.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        client_factory: Optional[Callable[..., Any]] = None,
+        provider: str = "openai",
+        client_options: Optional[Dict[str, Any]] = None,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.client_factory = client_factory
+        self.provider = provider
+        self.client_options = client_options or {}
+        self._clients: "weakref.WeakKeyDictionary[Any, Dict[_ClientKey, Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._limiters: Dict[_ClientKey, RateLimiter] = {}
+        self._flights: Dict[_ClientKey, SingleFlight] = {}
+
+    def client(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> Any:
+        """
+        Returns the shared client for these credentials on the running loop.
+
+        Raises:
+            UnknownProviderError: If ``provider`` is not registered.
+        """
+        loop = asyncio.get_running_loop()
+        clients = self._clients.setdefault(loop, {})
+        key = self._key(api_key, base_url, provider)
+        client = clients.get(key)
+        if client is None:
+            logger.info(
+                f"Creating pooled {key[0]} client for {base_url or 'default'}"
+            )
+            kwargs: Dict[str, Any] = {**self.client_options, "api_key": api_key}
+            if base_url is not None:
+                kwargs["base_url"] = base_url
+            client = self._factory(key[0])(**kwargs)
+            clients[key] = client
+        return client
+
+    def rate_limiter(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> RateLimiter:
+        """
+        Returns the rate limiter shared by every client with these credentials.
+        """
+        key = self._key(api_key, base_url, provider)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(self.requests_per_minute, self.tokens_per_minute)
+            self._limiters[key] = limiter
+        return limiter
+
+    def single_flight(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> SingleFlight:
+        """
+        Returns the single-flight group shared by every agent with these
+        credentials. Callers must include the running loop in their keys.
+        """
+        return self._flights.setdefault(
+            self._key(api_key, base_url, provider), SingleFlight()
+        )
+
+    async def aclose(self):
+        """
+        Closes the clients opened on the running loop.
+        """
+        clients = self._clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            close = getattr(client, "close", None)
+            if close is not None:
+                await close()
+
+    def _key(
+        self, api_key: str, base_url: Optional[str], provider: Optional[str]
+    ) -> _ClientKey:
+        return (provider or self.provider, api_key, base_url)
+
+    def _factory(self, provider: str) -> Callable[..., Any]:
+        if self.client_factory is not None and provider == self.provider:
+            return self.client_factory
+        return get_provider(provider)
+
+
+_default_pool: Optional[LLMClientPool] = None
+
+
+def default_client_pool() -> LLMClientPool:
+    """
+    Returns the process-wide client pool used by agents by default.
+    """
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = LLMClientPool()
+    return _default_pool
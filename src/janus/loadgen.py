@@ -0,0 +1,246 @@
+# src/janus/loadgen.py
+"""
+Drives concurrent orchestrator sessions against a local mock provider to
+find how many sessions one process sustains.
+
+    python -m janus.loadgen --sessions 200 --latency 0.2 --tokens-per-second 80
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from janus.agent import StandardPlannerAgent
+from janus.fake_llm import FakeChatBackend
+from janus.llm_client import LLMClientPool
+from janus.memory import InMemoryWorkingMemory
+from janus.mock_server import MockChatServer
+from janus.models import EventType, WeatherArgs
+from janus.orchestrator import AsyncLocalOrchestrator
+from janus.resilience import ResilientCaller
+from janus.tool import ToolRegistry, agent_tool
+from janus.tracing import LatencyHistogram, Tracer, get_tracer, set_tracer
+
+logger = logging.getLogger(__name__)
+
+# Each turn: the model calls a tool, then answers.
+DEFAULT_SCRIPT = [
+    {"tool_calls": [{"name": "get_weather", "arguments": {"location": "SF"}}]},
+    {"content": "It is sunny in San Francisco, with a light breeze off the bay."},
+]
+
+
+@agent_tool(args_schema=WeatherArgs, side_effect_free=True)
+async def get_weather(location: str) -> str:
+    """Gets the weather for a location."""
+    return f"Sunny in {location}"
+
+
+class LoadReport(BaseModel):
+    sessions: int
+    completed_sessions: int
+    failed_sessions: int
+    steps: int
+    duration: float
+    steps_per_second: float
+    sessions_per_second: float
+    step_latency: Dict[str, Optional[float]] = Field(default_factory=dict)
+    llm_latency: Dict[str, Optional[float]] = Field(default_factory=dict)
+    loop_lag: Dict[str, Optional[float]] = Field(default_factory=dict)
+    rss_per_session_kb: Optional[float] = None
+    server: Dict[str, int] = Field(default_factory=dict)
+    errors: Dict[str, int] = Field(default_factory=dict)
+
+
+def _percentiles(histogram: LatencyHistogram) -> Dict[str, Optional[float]]:
+    return {
+        "p50": histogram.percentile(0.5),
+        "p95": histogram.percentile(0.95),
+        "p99": histogram.percentile(0.99),
+        "max": histogram.max,
+    }
+
+
+def _rss_kb() -> Optional[float]:
+    """
+    The current resident set size, or None where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024
+
+
+class _LoopMonitor:
+    """
+    Measures event-loop lag: how late a periodic wake-up fires. Also
+    tracks the peak resident set size while the load runs.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lag = LatencyHistogram()
+        self.peak_rss_kb = _rss_kb()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag.record(max(loop.time() - expected, 0.0))
+            rss = _rss_kb()
+            if rss is not None and rss > (self.peak_rss_kb or 0.0):
+                self.peak_rss_kb = rss
+
+
+async def run_load(
+    sessions: int = 50,
+    turns: int = 1,
+    latency: float = 0.05,
+    tokens_per_second: Optional[float] = None,
+    error_rate: float = 0.0,
+    retries: int = 2,
+    stream: bool = False,
+    script: Optional[List[Dict[str, Any]]] = None,
+    seed: int = 0,
+) -> LoadReport:
+    """
+    Runs ``sessions`` concurrent sessions of ``turns`` user turns each
+    against a mock server on a background thread, and reports throughput,
+    step latency, event-loop lag and memory per session.
+
+    Streamed sessions are not retried: ``ResilientCaller`` only wraps
+    complete requests, so with ``stream`` an injected error fails the
+    session.
+    """
+    server = MockChatServer(
+        latency=latency,
+        tokens_per_second=tokens_per_second,
+        error_rate=error_rate,
+        reply=FakeChatBackend(script or DEFAULT_SCRIPT).reply,
+        seed=seed,
+    )
+    server.start_in_thread()
+    tools = ToolRegistry()
+    tools.register(get_weather)
+    pool = LLMClientPool(client_options={"max_retries": 0})
+    resilience = ResilientCaller(
+        hedge_percentile=None, max_retries=retries, backoff_base=0.05
+    )
+    previous_tracer = get_tracer()
+    tracer = Tracer()
+    set_tracer(tracer)
+    monitor = _LoopMonitor()
+    errors: Dict[str, int] = {}
+    steps = 0
+
+    async def session(index: int) -> bool:
+        nonlocal steps
+        agent = StandardPlannerAgent(
+            api_key="load-test",
+            base_url=server.base_url,
+            client_pool=pool,
+            resilience=resilience,
+        )
+        orchestrator = AsyncLocalOrchestrator(agent, tools, InMemoryWorkingMemory())
+        try:
+            for turn in range(turns):
+                user = {"messages": [{"role": "user", "content": f"Turn {turn}?"}]}
+                if stream:
+                    async for event in orchestrator.run_stream(user, max_steps=10):
+                        steps += event.type == EventType.STEP_DONE
+                else:
+                    async for _ in orchestrator.run(user, max_steps=10):
+                        steps += 1
+            return True
+        except Exception as e:
+            name = type(e).__name__
+            errors[name] = errors.get(name, 0) + 1
+            logger.debug(f"Session {index} failed: {e!r}")
+            return False
+
+    rss_before = _rss_kb()
+    monitor.start()
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(session(i) for i in range(sessions)))
+    finally:
+        duration = time.perf_counter() - started
+        await monitor.stop()
+        set_tracer(previous_tracer)
+        await pool.aclose()
+        server.stop_thread()
+        tools.shutdown()
+
+    completed = sum(results)
+    rss_per_session = None
+    if rss_before is not None and monitor.peak_rss_kb is not None:
+        rss_per_session = max(monitor.peak_rss_kb - rss_before, 0.0) / sessions
+    return LoadReport(
+        sessions=sessions,
+        completed_sessions=completed,
+        failed_sessions=sessions - completed,
+        steps=steps,
+        duration=duration,
+        steps_per_second=steps / duration,
+        sessions_per_second=completed / duration,
+        step_latency=_percentiles(tracer.histogram("orchestrator.step")),
+        llm_latency=_percentiles(tracer.histogram("llm.call")),
+        loop_lag=_percentiles(monitor.lag),
+        rss_per_session_kb=rss_per_session,
+        server={
+            "requests": server.requests,
+            "completed": server.completed,
+            "errors": server.errors,
+        },
+        errors=errors,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Load-test janus against a local mock provider."
+    )
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = asyncio.run(
+        run_load(
+            sessions=args.sessions,
+            turns=args.turns,
+            latency=args.latency,
+            tokens_per_second=args.tokens_per_second,
+            error_rate=args.error_rate,
+            retries=args.retries,
+            stream=args.stream,
+            seed=args.seed,
+        )
+    )
+    print(report.model_dump_json(indent=2))
+    return 0 if report.failed_sessions == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
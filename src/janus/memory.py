@@ -1,10 +1,27 @@
 # src/janus/memory.py
+import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from collections import deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
 
 from pydantic import BaseModel
 
+from janus import events
+from janus.models import ChatMessage, Role
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,24 +44,307 @@ class BaseMemory(ABC):
         """
         pass
 
+    async def restore(self, messages: Sequence[Dict[str, Any]]):
+        """
+        Adds back messages saved from this memory's context, for example by
+        a checkpoint. Memories whose context holds messages they generated
+        themselves override this to restore them as such.
+        """
+        for message in messages:
+            await self.add(ChatMessage(**message))
+
+
+class MessageSequence(Sequence):
+    """
+    Base class for read-only message sequences that compare equal to, and
+    concatenate with, plain lists of the same messages.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+
+    def __add__(self, other: Sequence) -> List[Dict[str, Any]]:
+        return list(self) + list(other)
+
+    def __radd__(self, other: Sequence) -> List[Dict[str, Any]]:
+        return list(other) + list(self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+
+class MessageView(MessageSequence):
+    """
+    A read-only snapshot of an append-only list of serialized messages.
+
+    The view shares the backing list with the memory and only remembers its
+    length, so creating one is O(1) and later appends never show up in it.
+    The message dicts themselves are shared and must not be mutated.
+    """
+
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, items: List[Dict[str, Any]], length: int):
+        self._items = items
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            return self._items[: self._length][index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("MessageView index out of range")
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        items = self._items
+        for i in range(self._length):
+            yield items[i]
+
 
 class InMemoryWorkingMemory(BaseMemory):
     """
     An in-memory list-based working memory.
+
+    Entries are serialized once, when they are added, and the materialized
+    message list is extended incrementally. ``get_context`` hands out a
+    read-only ``MessageView`` instead of re-dumping the whole history.
     """
 
     def __init__(self):
         self.entries: List[BaseModel] = []
+        self._messages: List[Dict[str, Any]] = []
 
     async def add(self, entry: BaseModel):
         """
         Adds an entry to the in-memory list.
         """
-        logger.info(f"Adding to memory: {entry.model_dump()}")
+        self._sync()
+        message = entry.model_dump()
+        logger.debug("Adding to memory: %s", message)
+        events.emit("memory.add", message)
         self.entries.append(entry)
+        self._messages.append(message)
 
     async def get_context(self) -> Dict[str, Any]:
         """
-        Returns the list of entries.
+        Returns a read-only view of the serialized entries.
+        """
+        self._sync()
+        return {"messages": MessageView(self._messages, len(self._messages))}
+
+    def _sync(self):
+        """
+        Serializes entries appended to ``entries`` directly, bypassing ``add``.
+        """
+        for entry in self.entries[len(self._messages) :]:
+            self._messages.append(entry.model_dump())
+
+
+def estimate_tokens(message: Dict[str, Any]) -> int:
+    """
+    Cheap token estimate for a serialized message (about four characters
+    per token plus a small per-message overhead).
+    """
+    chars = len(message.get("content") or "")
+    tool_calls = message.get("tool_calls")
+    if tool_calls:
+        chars += len(json.dumps(tool_calls, default=str))
+    return chars // 4 + 4
+
+
+class _Turn:
+    """
+    A unit of the sliding window that is never split: a single message, or
+    an assistant tool-call message together with its tool results.
+    """
+
+    __slots__ = ("messages", "tokens", "awaits_tool_results")
+
+    def __init__(self, message: Dict[str, Any], tokens: int):
+        self.messages = [message]
+        self.tokens = tokens
+        self.awaits_tool_results = message.get("role") == Role.ASSISTANT and bool(
+            message.get("tool_calls")
+        )
+
+
+_SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+
+
+class TokenWindowMemory(BaseMemory):
+    """
+    A working memory with a hard token budget.
+
+    Each entry's token count is computed once, when it is added. The newest
+    turns are kept verbatim; older turns are folded into a rolling summary
+    that is returned as a leading system message. An assistant message with
+    tool calls and its tool results are evicted together, so a tool call is
+    never separated from its result.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        summary_max_tokens: Optional[int] = None,
+        token_counter: Callable[[Dict[str, Any]], int] = estimate_tokens,
+        summarizer: Optional[
+            Callable[[Optional[str], List[Dict[str, Any]]], Awaitable[str]]
+        ] = None,
+        summarize: bool = True,
+    ):
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1.")
+        self.max_tokens = max_tokens
+        self.summary_max_tokens = (
+            summary_max_tokens if summary_max_tokens is not None else max_tokens // 4
+        )
+        self.token_counter = token_counter
+        self.summarizer = summarizer or self._fold_summary
+        self.summarize = summarize
+        self.summary: Optional[str] = None
+        self._summary_message: Optional[Dict[str, Any]] = None
+        self._summary_tokens = 0
+        self._turns: Deque[_Turn] = deque()
+        self._window_tokens = 0
+
+    @property
+    def total_tokens(self) -> int:
+        """
+        Tokens currently sent to the LLM, summary included.
+        """
+        return self._window_tokens + self._summary_tokens
+
+    async def add(self, entry: BaseModel):
+        """
+        Adds an entry and evicts the oldest turns if the budget is exceeded.
+        """
+        message = entry.model_dump()
+        tokens = self.token_counter(message)
+        last = self._turns[-1] if self._turns else None
+        if message.get("role") == Role.TOOL and last and last.awaits_tool_results:
+            last.messages.append(message)
+            last.tokens += tokens
+        else:
+            if last:
+                last.awaits_tool_results = False
+            self._turns.append(_Turn(message, tokens))
+        self._window_tokens += tokens
+        await self._enforce_budget()
+
+    async def get_context(self) -> Dict[str, Any]:
+        """
+        Returns the rolling summary (if any) followed by the verbatim window.
+        """
+        messages: List[Dict[str, Any]] = []
+        if self._summary_message is not None:
+            messages.append(self._summary_message)
+        for turn in self._turns:
+            messages.extend(turn.messages)
+        return {"messages": messages}
+
+    async def restore(self, messages: Sequence[Dict[str, Any]]):
+        """
+        Restores saved context. A leading summary message becomes the
+        rolling summary again instead of an ordinary system message.
+        """
+        messages = list(messages)
+        if messages and self._is_summary(messages[0]):
+            content = messages.pop(0)["content"]
+            self.summary = content[len(_SUMMARY_HEADER) :]
+            self._summary_message = {
+                "role": Role.SYSTEM,
+                "content": content,
+                "tool_calls": None,
+            }
+            self._summary_tokens = self.token_counter(self._summary_message)
+        await super().restore(messages)
+
+    @staticmethod
+    def _is_summary(message: Dict[str, Any]) -> bool:
+        return message.get("role") == Role.SYSTEM and (
+            message.get("content") or ""
+        ).startswith(_SUMMARY_HEADER)
+
+    async def _enforce_budget(self):
+        """
+        Evicts whole turns, oldest first, until the window fits the budget.
+        The newest turn is always kept, even if it alone exceeds the budget.
+        """
+        while self.total_tokens > self.max_tokens and len(self._turns) > 1:
+            evicted: List[Dict[str, Any]] = []
+            while self.total_tokens > self.max_tokens and len(self._turns) > 1:
+                turn = self._turns.popleft()
+                self._window_tokens -= turn.tokens
+                evicted.extend(turn.messages)
+            logger.info("Evicting %d messages from the token window", len(evicted))
+            if self.summarize:
+                await self._update_summary(evicted)
+        if self.total_tokens > self.max_tokens:
+            logger.warning(
+                f"Newest turn alone uses {self.total_tokens} tokens, "
+                f"over the budget of {self.max_tokens}"
+            )
+
+    async def _update_summary(self, evicted: List[Dict[str, Any]]):
+        """
+        Folds evicted messages into the rolling summary.
+        """
+        summary = await self.summarizer(self.summary, evicted)
+        header = _SUMMARY_HEADER
+        limit = max(self.summary_max_tokens * 4 - len(header), 0)
+        if len(summary) > limit:
+            # Keep the most recent part of an over-long summary.
+            summary = summary[len(summary) - limit :]
+        message = {"role": Role.SYSTEM, "content": header + summary, "tool_calls": None}
+        tokens = self.token_counter(message)
+        while tokens > self.summary_max_tokens and summary:
+            summary = summary[len(summary) // 2 + 1 :]
+            message["content"] = header + summary
+            tokens = self.token_counter(message)
+        if tokens > self.summary_max_tokens:
+            self.summary = None
+            self._summary_message = None
+            self._summary_tokens = 0
+            return
+        self.summary = summary
+        self._summary_message = message
+        self._summary_tokens = tokens
+
+    async def _fold_summary(
+        self, previous: Optional[str], messages: List[Dict[str, Any]]
+    ) -> str:
+        """
+        Default summarizer: appends one line per evicted message to the
+        previous summary. Length is capped by ``_update_summary``.
         """
-        return {"messages": [entry.model_dump() for entry in self.entries]}
+        lines = [previous] if previous else []
+        for message in messages:
+            role = getattr(message.get("role"), "value", message.get("role"))
+            if message.get("tool_calls"):
+                names = [
+                    call.get("function", {}).get("name", "?")
+                    if isinstance(call, dict)
+                    else "?"
+                    for call in message["tool_calls"]
+                ]
+                lines.append(f"{role} called tools: {', '.join(names)}")
+            elif message.get("content"):
+                lines.append(f"{role}: {message['content']}")
+        return "\n".join(lines)
@@ -0,0 +1,134 @@
+# src/janus/message_store.py
+import logging
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List
+
+from pydantic import BaseModel
+
+from janus.memory import BaseMemory, MessageView
+from janus.models import ChatMessage, Role
+
+logger = logging.getLogger(__name__)
+
+_ROLES = tuple(Role)
+_ROLE_CODES = {role: code for code, role in enumerate(_ROLES)}
+_ROLE_NAMES = tuple(sys.intern(role.value) for role in _ROLES)
+
+
+class MessageStore:
+    """
+    An append-only message log for long sessions.
+
+    Each message is turned into its wire-format dict exactly once, when it
+    is appended: short contents are interned so repeated texts
+    (acknowledgements, identical tool results) are stored once, and tool
+    calls are kept in the form the provider returned them. ``wire()``
+    hands out an O(1) snapshot of that list, so building a request never
+    re-serializes the history. Roles also live in a byte array and the
+    positions of tool-call messages in an integer array, so role counts
+    and tool-call scans never touch the dicts.
+    """
+
+    __slots__ = ("intern_max_length", "_roles", "_tool_call_positions", "_wire")
+
+    def __init__(self, intern_max_length: int = 256):
+        self.intern_max_length = intern_max_length
+        self._roles = array("B")
+        self._tool_call_positions = array("L")
+        self._wire: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._wire)
+
+    def append(self, message: Any):
+        """
+        Appends a ``ChatMessage`` or a wire-format message dict.
+        """
+        if isinstance(message, ChatMessage):
+            role = message.role
+            content = message.content
+            tool_calls = message.tool_calls
+            tool_call_id = message.tool_call_id
+        elif isinstance(message, dict):
+            role = Role(message["role"])
+            content = message.get("content")
+            tool_calls = message.get("tool_calls")
+            tool_call_id = message.get("tool_call_id")
+        else:
+            raise ValueError(
+                f"Cannot store a {type(message).__name__} as a message."
+            )
+        code = _ROLE_CODES[role]
+        if isinstance(content, str) and len(content) <= self.intern_max_length:
+            content = sys.intern(content)
+        wire: Dict[str, Any] = {"role": _ROLE_NAMES[code], "content": content}
+        if tool_calls:
+            wire["tool_calls"] = tool_calls
+            self._tool_call_positions.append(len(self._wire))
+        if tool_call_id is not None:
+            wire["tool_call_id"] = tool_call_id
+        self._roles.append(code)
+        self._wire.append(wire)
+
+    def extend(self, messages: Iterable[Any]):
+        for message in messages:
+            self.append(message)
+
+    def message(self, index: int) -> Dict[str, Any]:
+        """
+        Returns the wire-format dict of one message.
+        """
+        return self._wire[index]
+
+    def role(self, index: int) -> Role:
+        """
+        Returns the role of a message.
+        """
+        return _ROLES[self._roles[index]]
+
+    def count(self, role: Role) -> int:
+        """
+        Returns how many messages have ``role``.
+        """
+        return self._roles.count(_ROLE_CODES[role])
+
+    def tool_call_positions(self) -> List[int]:
+        """
+        Returns the indices of assistant messages that requested tools.
+        """
+        return self._tool_call_positions.tolist()
+
+    def wire(self) -> MessageView:
+        """
+        Returns a read-only snapshot of the wire-format messages.
+        """
+        return MessageView(self._wire, len(self._wire))
+
+
+class CompactWorkingMemory(BaseMemory):
+    """
+    A working memory backed by a ``MessageStore``.
+
+    Unlike ``InMemoryWorkingMemory`` it keeps no pydantic models around,
+    only one compact wire dict per message, which makes it the better fit
+    for sessions with thousands of turns.
+    """
+
+    def __init__(self, intern_max_length: int = 256):
+        self.store = MessageStore(intern_max_length=intern_max_length)
+
+    async def add(self, entry: BaseModel):
+        """
+        Appends an entry to the store.
+        """
+        self.store.append(
+            entry if isinstance(entry, ChatMessage) else entry.model_dump()
+        )
+        logger.debug("Added message %d to memory", len(self.store))
+
+    async def get_context(self) -> Dict[str, Any]:
+        """
+        Returns a read-only view of the stored messages.
+        """
+        return {"messages": self.store.wire()}
@@ -0,0 +1,326 @@
+# src/janus/mock_server.py
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+Reply = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    500: "Internal Server Error",
+}
+_STREAM_CHUNK_TOKENS = 4
+
+
+def echo_reply(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Answers with the content of the last message.
+    """
+    messages = request.get("messages") or [{}]
+    return {"role": "assistant", "content": f"echo: {messages[-1].get('content')}"}
+
+
+def _count_tokens(value: Any) -> int:
+    return max(len(json.dumps(value)) // 4, 1)
+
+
+class MockChatServer:
+    """
+    A local HTTP server speaking the chat-completions protocol, for tests
+    and benchmarks that must not reach a real provider.
+
+    ``latency`` is a delay in seconds, or a function of the request number
+    (from 0) returning one. With ``tokens_per_second``, completions also
+    take as long as generating their tokens would, and streamed ones
+    (``"stream": true``, sent as server-sent events) arrive at that pace.
+    ``status`` may map a request number to an HTTP error status to answer
+    with instead; ``error_rate`` answers a random fraction of requests
+    with ``error_status``. ``reply`` builds the assistant message from the
+    request body; if it raises, the request is answered with a 500 and
+    counted in ``errors``. Point a client at ``base_url``.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Union[float, Callable[[int], float]] = 0.0,
+        status: Optional[Callable[[int], Optional[int]]] = None,
+        reply: Reply = echo_reply,
+        model: str = "mock-model",
+        tokens_per_second: Optional[float] = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.status = status
+        self.reply = reply
+        self.model = model
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self.requests = 0
+        self.completed = 0
+        self.errors = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+        self._handlers: Set["asyncio.Task[None]"] = set()
+        # Created in start(): before Python 3.10 an event binds to the loop
+        # that is current when it is created.
+        self._closing: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        self._closing = asyncio.Event()
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Mock chat server listening on {self.base_url}")
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            self._closing.set()
+            for writer in self._connections:
+                writer.close()
+            if self._handlers:
+                await asyncio.wait(self._handlers)
+            await self._server.wait_closed()
+            self._server = None
+
+    def start_in_thread(self):
+        """
+        Serves from a background thread with its own event loop, so the
+        server's work stays off the caller's loop. Returns once listening.
+        """
+        loop = asyncio.new_event_loop()
+        started: "asyncio.Future[None]" = loop.create_future()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+                started.set_result(None)
+            except Exception as e:
+                started.set_exception(e)
+            ready.set()
+            if started.exception() is None:
+                loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(
+            target=run, name="janus-mock-server", daemon=True
+        )
+        self._thread_loop = loop
+        self._thread.start()
+        ready.wait()
+        started.result()
+
+    def stop_thread(self):
+        """
+        Closes a server started with ``start_in_thread``.
+        """
+        if self._thread is None:
+            return
+        loop = self._thread_loop
+        asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    async def __aenter__(self) -> "MockChatServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any):
+        await self.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1").strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                await self._handle(writer, method, path, body)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            self._handlers.discard(handler)
+            writer.close()
+
+    async def _handle(
+        self, writer: asyncio.StreamWriter, method: str, path: str, body: bytes
+    ):
+        if method != "POST" or not path.rstrip("/").endswith("/chat/completions"):
+            error = {"error": {"message": f"No route for {method} {path}"}}
+            self._write(writer, 404, error)
+            return
+        number = self.requests
+        self.requests += 1
+        latency = self.latency(number) if callable(self.latency) else self.latency
+        await self._pause(latency)
+        status = self.status(number) if self.status is not None else None
+        if status is None and self.error_rate and self._rng.random() < self.error_rate:
+            status = self.error_status
+        if status is not None:
+            self.errors += 1
+            error = {"error": {"message": "Injected error", "code": status}}
+            self._write(writer, status, error)
+            return
+        try:
+            request = json.loads(body)
+        except ValueError:
+            self._write(writer, 400, {"error": {"message": "Body is not JSON."}})
+            return
+        try:
+            message = self.reply(request)
+        except Exception as e:
+            logger.error("Reply to request %d failed: %r", number, e)
+            self.errors += 1
+            error = {"error": {"message": f"Reply failed: {e}", "code": 500}}
+            self._write(writer, 500, error)
+            return
+        prompt_tokens = _count_tokens(request.get("messages"))
+        completion_tokens = _count_tokens(message)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        completion = {
+            "id": f"chatcmpl-mock-{number}",
+            "created": int(time.time()),
+            "model": request.get("model", self.model),
+        }
+        finish_reason = "tool_calls" if message.get("tool_calls") else "stop"
+        if request.get("stream"):
+            await self._stream(writer, completion, message, finish_reason, usage)
+        else:
+            if self.tokens_per_second:
+                await self._pause(completion_tokens / self.tokens_per_second)
+            completion.update(
+                object="chat.completion",
+                choices=[
+                    {"index": 0, "message": message, "finish_reason": finish_reason}
+                ],
+                usage=usage,
+            )
+            self._write(writer, 200, completion)
+        self.completed += 1
+
+    async def _stream(
+        self,
+        writer: asyncio.StreamWriter,
+        completion: Dict[str, Any],
+        message: Dict[str, Any],
+        finish_reason: str,
+        usage: Dict[str, int],
+    ):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"\r\n"
+        )
+        base = {**completion, "object": "chat.completion.chunk"}
+
+        async def send(choices: List[Dict[str, Any]], **extra: Any):
+            event = json.dumps({**base, "choices": choices, **extra})
+            self._write_chunk(writer, f"data: {event}\n\n".encode())
+            await writer.drain()
+
+        def delta(fields: Dict[str, Any], finish: Optional[str] = None):
+            return [{"index": 0, "delta": fields, "finish_reason": finish}]
+
+        await send(delta({"role": "assistant", "content": ""}))
+        content = message.get("content") or ""
+        step = _STREAM_CHUNK_TOKENS * 4
+        for start in range(0, len(content), step):
+            if self.tokens_per_second:
+                await self._pause(_STREAM_CHUNK_TOKENS / self.tokens_per_second)
+            await send(delta({"content": content[start : start + step]}))
+        for index, call in enumerate(message.get("tool_calls") or []):
+            function = call["function"]
+            opening = {"name": function["name"], "arguments": ""}
+            await send(
+                delta(
+                    {
+                        "tool_calls": [
+                            {
+                                "index": index,
+                                "id": call["id"],
+                                "type": "function",
+                                "function": opening,
+                            }
+                        ]
+                    }
+                )
+            )
+            arguments = function["arguments"]
+            for start in range(0, len(arguments), step):
+                if self.tokens_per_second:
+                    await self._pause(_STREAM_CHUNK_TOKENS / self.tokens_per_second)
+                fragment = {"arguments": arguments[start : start + step]}
+                await send(
+                    delta({"tool_calls": [{"index": index, "function": fragment}]})
+                )
+        await send(delta({}, finish_reason))
+        await send([], usage=usage)
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        self._write_chunk(writer, b"")
+
+    async def _pause(self, seconds: float):
+        if seconds <= 0:
+            return
+        # Stalled requests end early when the server closes.
+        try:
+            await asyncio.wait_for(self._closing.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def _write(self, writer: asyncio.StreamWriter, status: int, payload: Any):
+        body = json.dumps(payload).encode()
+        reason = _REASONS.get(status, "Error")
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    def _write_chunk(self, writer: asyncio.StreamWriter, data: bytes):
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
@@ -2,7 +2,7 @@
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Role(str, Enum):
@@ -16,6 +16,34 @@ class ChatMessage(BaseModel):
     role: Role
     content: Optional[str] = None
     tool_calls: Optional[List[Dict[str, Any]]] = None
+    tool_call_id: Optional[str] = None
+
+
+def to_wire(message: ChatMessage) -> Dict[str, Any]:
+    """
+    Returns the provider wire format of a message: a plain dict without the
+    fields that are unset. Unlike ``model_dump`` it does not walk or copy
+    the tool calls, which are already plain dicts.
+    """
+    wire: Dict[str, Any] = {"role": message.role.value, "content": message.content}
+    if message.tool_calls is not None:
+        wire["tool_calls"] = message.tool_calls
+    if message.tool_call_id is not None:
+        wire["tool_call_id"] = message.tool_call_id
+    return wire
+
+
+class EventType(str, Enum):
+    TOKEN = "token"
+    TOOL_CALL_STARTED = "tool_call_started"
+    TOOL_CALL_FINISHED = "tool_call_finished"
+    STEP_DONE = "step_done"
+
+
+class AgentEvent(BaseModel):
+    type: EventType
+    step: int = 0
+    data: Dict[str, Any] = Field(default_factory=dict)
 
 
 class WeatherArgs(BaseModel):
@@ -1,18 +1,66 @@
 # src/janus/orchestrator.py
 import logging
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+from pydantic import BaseModel
+
+from janus import tracing
 from janus.agent import BaseAgent
+from janus.checkpoint import (
+    Checkpoint,
+    CheckpointDelta,
+    CheckpointStore,
+    pending_tool_calls,
+)
 from janus.memory import BaseMemory
-from janus.models import ChatMessage
+from janus.models import AgentEvent, ChatMessage, EventType, Role
+from janus.termination import (
+    Converged,
+    MaxSteps,
+    RunProgress,
+    StopReason,
+    TerminationPolicy,
+    stop_state,
+)
 from janus.tool import ToolRegistry
 
 logger = logging.getLogger(__name__)
 
 
+def _json_messages(messages: Any) -> List[Dict[str, Any]]:
+    return [
+        m.model_dump(mode="json") if isinstance(m, BaseModel) else dict(m)
+        for m in messages
+    ]
+
+
+def _json_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    # Messages are checkpointed separately; the rest must be JSON-friendly.
+    return {key: value for key, value in state.items() if key != "messages"}
+
+
+def _annotate_step(
+    span: Any, messages: List[Any], usage: Optional[Dict[str, int]]
+):
+    span.set("messages_added", len(messages))
+    if usage:
+        span.set("prompt_tokens", usage.get("prompt_tokens", 0))
+        span.set("completion_tokens", usage.get("completion_tokens", 0))
+
+
 class AsyncLocalOrchestrator:
     """
     Manages the in-memory execution of an agentic graph.
+
+    A run stops when its termination policy fires (by default, once the
+    assistant answers without requesting tools) or after ``max_steps``.
+    The last state yielded carries the ``stop_reason`` and the run's
+    ``progress`` (steps, elapsed time and token usage).
+
+    Given a ``CheckpointStore``, runs started with a ``session_id`` are
+    checkpointed after every step and can be continued with ``resume``.
+    A run with ``max_steps`` below 1 adds the initial messages to memory
+    and yields nothing.
     """
 
     def __init__(
@@ -20,40 +68,292 @@ class AsyncLocalOrchestrator:
         agent: BaseAgent,
         tools: ToolRegistry,
         memory: BaseMemory,
+        termination: Optional[TerminationPolicy] = None,
+        checkpoints: Optional[CheckpointStore] = None,
     ):
         self.agent = agent
         self.tools = tools
         self.memory = memory
+        self.termination = termination if termination is not None else Converged()
+        self.checkpoints = checkpoints
 
     async def run(
-        self, initial_state: Dict[str, Any], max_steps: int = 5
+        self,
+        initial_state: Dict[str, Any],
+        max_steps: int = 5,
+        termination: Optional[TerminationPolicy] = None,
+        session_id: Optional[str] = None,
     ):
         """
-        Runs the agentic graph.
+        Runs the agentic graph. With a checkpoint store and a ``session_id``,
+        every completed step is checkpointed so the run can be resumed.
         """
         state = initial_state.copy()
+        progress = RunProgress()
 
         # Add initial messages to memory
         if "messages" in state:
             for msg_data in state["messages"]:
                 await self.memory.add(ChatMessage(**msg_data))
+        if max_steps < 1:
+            return
+
+        policy = self._policy(termination, max_steps)
+        session_id = await self._start_checkpoint(session_id, state, max_steps)
+        async for context in self._steps(state, policy, progress, session_id):
+            yield context
+
+    async def _start_checkpoint(
+        self, session_id: Optional[str], state: Dict[str, Any], max_steps: int
+    ) -> Optional[str]:
+        """
+        Checkpoints the start of a run. Returns the session id to checkpoint
+        the run's steps under, or None if the run is not checkpointed.
+        """
+        if self.checkpoints is None or session_id is None:
+            return None
+        context = await self.memory.get_context()
+        await self.checkpoints.start(
+            Checkpoint(
+                session_id=session_id,
+                max_steps=max_steps,
+                state=_json_state(state),
+                messages=_json_messages(context.get("messages", [])),
+            )
+        )
+        return session_id
+
+    async def resume(
+        self,
+        session_id: str,
+        termination: Optional[TerminationPolicy] = None,
+        max_steps: Optional[int] = None,
+        restore_memory: bool = True,
+    ):
+        """
+        Continues a checkpointed run after its last completed step. Yields
+        nothing if the run had already finished.
+
+        With ``restore_memory``, the checkpointed messages are restored into
+        the memory with ``BaseMemory.restore``, so the memory should start
+        out empty; pass False when the memory is durable and still holds
+        them. Tool calls the checkpoint records as pending (requested, with
+        no result yet) are run before the next step, and their results are
+        checkpointed with that step.
+
+        Raises:
+            ValueError: If there is no checkpoint store or no checkpoint
+                for the session.
+        """
+        if self.checkpoints is None:
+            raise ValueError("Resuming requires a checkpoint store.")
+        checkpoint = await self.checkpoints.load(session_id)
+        if checkpoint is None:
+            raise ValueError(f"No checkpoint for session '{session_id}'.")
+        if checkpoint.finished:
+            logger.info(
+                f"Session {session_id} already stopped: {checkpoint.stop_reason}"
+            )
+            return
+        logger.info("Resuming session %s after step %d", session_id, checkpoint.step)
+        if restore_memory:
+            await self.memory.restore(checkpoint.messages)
+        carried: List[ChatMessage] = []
+        if checkpoint.pending_tool_calls:
+            carried = await self._run_pending_tool_calls(checkpoint.pending_tool_calls)
+            await self._add_messages(carried)
+        progress = RunProgress()
+        progress.steps = checkpoint.step
+        progress.prompt_tokens = checkpoint.prompt_tokens
+        progress.completion_tokens = checkpoint.completion_tokens
+        progress.started_at -= checkpoint.elapsed
+        policy = self._policy(termination, max_steps or checkpoint.max_steps)
+        async for context in self._steps(
+            dict(checkpoint.state), policy, progress, session_id, carried
+        ):
+            yield context
+
+    async def _run_pending_tool_calls(
+        self, tool_calls: List[Dict[str, Any]]
+    ) -> List[ChatMessage]:
+        """
+        Runs tool calls left without a result when a run was checkpointed.
+        """
+        results = []
+        for call in tool_calls:
+            function = call.get("function") or {}
+            name = function.get("name", "")
+            logger.info("Running pending tool call %s (%s)", call.get("id"), name)
+            try:
+                result = await self.tools.execute_json(
+                    name, function.get("arguments") or "{}"
+                )
+                content = str(result)
+            except Exception as e:
+                content = f"Error executing tool {name}: {e}"
+            results.append(
+                ChatMessage(
+                    role=Role.TOOL, content=content, tool_call_id=call.get("id")
+                )
+            )
+        return results
+
+    async def _steps(
+        self,
+        state: Dict[str, Any],
+        policy: TerminationPolicy,
+        progress: RunProgress,
+        session_id: Optional[str],
+        carried: Optional[List[Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Runs steps until the policy stops the run. ``carried`` messages were
+        added to memory before the first step and are checkpointed with it.
+        """
+        carried = carried or []
+        while True:
+            step = progress.steps + 1
+            logger.info("Orchestrator Step %d", step)
+
+            with tracing.span("orchestrator.step", step=step) as step_span:
+                # Get current context from memory
+                memory_context = await self._get_context()
+                current_state = {**state, **memory_context}
+
+                # Execute the agent
+                agent_output = await self.agent.execute(current_state, self.tools)
+
+                # Update state and memory
+                new_messages = agent_output.get("messages_to_add", [])
+                await self._add_messages(new_messages)
+                usage = agent_output.get("usage")
+                progress.record_step(new_messages, usage)
+                _annotate_step(step_span, new_messages, usage)
+
+                context = await self._get_context()
+                reason = policy.check(progress)
+                if session_id is not None:
+                    await self._checkpoint(
+                        session_id,
+                        progress,
+                        [*carried, *new_messages],
+                        agent_output,
+                        reason,
+                    )
+                    carried = []
+            if reason is None:
+                yield context
+                continue
+            logger.info("Orchestration stopping: %s", reason.value)
+            yield stop_state(context, reason, progress)
+            break
+
+        logger.info("Orchestration finished.")
+
+    async def _checkpoint(
+        self,
+        session_id: str,
+        progress: RunProgress,
+        new_messages: List[Any],
+        agent_output: Dict[str, Any],
+        reason: Optional[StopReason],
+    ):
+        messages = _json_messages(new_messages)
+        await self.checkpoints.record(
+            session_id,
+            CheckpointDelta(
+                step=progress.steps,
+                messages=messages,
+                usage=agent_output.get("usage") or {},
+                elapsed=progress.elapsed,
+                pending_tool_calls=pending_tool_calls(messages),
+                stop_reason=reason.value if reason is not None else None,
+            ),
+        )
+
+    async def run_stream(
+        self,
+        initial_state: Dict[str, Any],
+        max_steps: int = 5,
+        termination: Optional[TerminationPolicy] = None,
+        session_id: Optional[str] = None,
+    ) -> AsyncIterator[AgentEvent]:
+        """
+        Runs the agentic graph, yielding fine-grained events as they happen:
+        token deltas, tool calls starting and finishing, and one ``STEP_DONE``
+        per step whose data holds the new messages and the memory context.
+        Steps are checkpointed as in ``run``; a checkpointed stream is
+        continued with ``resume``.
+        """
+        state = initial_state.copy()
+        progress = RunProgress()
+
+        if "messages" in state:
+            for msg_data in state["messages"]:
+                await self.memory.add(ChatMessage(**msg_data))
+        if max_steps < 1:
+            return
+
+        policy = self._policy(termination, max_steps)
+        session_id = await self._start_checkpoint(session_id, state, max_steps)
 
         for step in range(max_steps):
-            logger.info(f"Orchestrator Step {step + 1}/{max_steps}")
+            logger.info("Orchestrator Step %d/%d", step + 1, max_steps)
 
-            # Get current context from memory
-            memory_context = await self.memory.get_context()
+            memory_context = await self._get_context()
             current_state = {**state, **memory_context}
 
-            # Execute the agent
-            agent_output = await self.agent.execute(current_state, self.tools)
+            reason = None
+            step_span = tracing.span("orchestrator.step", step=step + 1)
+            try:
+                async for event in self.agent.stream(current_state, self.tools):
+                    event.step = step + 1
+                    if event.type != EventType.STEP_DONE:
+                        yield event
+                        continue
+                    new_messages = event.data.get("messages_to_add", [])
+                    await self._add_messages(new_messages)
+                    usage = event.data.get("usage")
+                    progress.record_step(new_messages, usage)
+                    _annotate_step(step_span, new_messages, usage)
+                    context = await self._get_context()
+                    reason = policy.check(progress)
+                    if session_id is not None:
+                        await self._checkpoint(
+                            session_id, progress, new_messages, event.data, reason
+                        )
+                    if reason is not None:
+                        logger.info("Orchestration stopping: %s", reason.value)
+                        context = stop_state(context, reason, progress)
+                    step_span.finish()
+                    yield AgentEvent(
+                        type=EventType.STEP_DONE,
+                        step=step + 1,
+                        data={**event.data, "state": context},
+                    )
+            except Exception as e:
+                step_span.finish(e)
+                raise
+            finally:
+                step_span.finish()
+            if reason is not None:
+                break
 
-            # Update state and memory
-            if "messages_to_add" in agent_output:
-                for new_msg in agent_output["messages_to_add"]:
-                    await self.memory.add(new_msg)
+        logger.info("Orchestration finished.")
 
-            yield await self.memory.get_context()
+    async def _add_messages(self, messages: List[Any]):
+        with tracing.span("memory.add", messages=len(messages)):
+            for message in messages:
+                await self.memory.add(message)
 
+    async def _get_context(self) -> Dict[str, Any]:
+        with tracing.span("memory.get_context") as span:
+            context = await self.memory.get_context()
+            span.set("messages", len(context.get("messages", ())))
+            return context
 
-        logger.info("Orchestration finished.")
+    def _policy(
+        self, termination: Optional[TerminationPolicy], max_steps: int
+    ) -> TerminationPolicy:
+        policy = termination if termination is not None else self.termination
+        return policy | MaxSteps(max_steps)
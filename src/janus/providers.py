@@ -0,0 +1,93 @@
+# src/janus/providers.py
+import importlib
+import logging
+from typing import Any, Callable, Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+ClientFactory = Callable[..., Any]
+
+
+class UnknownProviderError(ValueError):
+    """
+    Raised when no provider is registered under a name.
+    """
+
+
+class _LazyFactory:
+    """
+    A client factory named as ``"module:attribute"``, imported on first use.
+    """
+
+    __slots__ = ("path", "_factory")
+
+    def __init__(self, path: str):
+        module, _, attribute = path.partition(":")
+        if not module or not attribute:
+            raise ValueError(f"Expected 'module:attribute', got '{path}'.")
+        self.path = path
+        self._factory: Any = None
+
+    def resolve(self) -> ClientFactory:
+        if self._factory is None:
+            module, _, attribute = self.path.partition(":")
+            logger.debug("Importing LLM provider %s", self.path)
+            try:
+                self._factory = getattr(importlib.import_module(module), attribute)
+            except ImportError as e:
+                raise ImportError(
+                    f"{self.path} could not be imported; is the '{module}' "
+                    "package installed?"
+                ) from e
+        return self._factory
+
+
+# Providers are registered by import path, so their SDKs load only when a
+# client is first created.
+_providers: Dict[str, _LazyFactory] = {
+    "openai": _LazyFactory("openai:AsyncOpenAI"),
+    "azure_openai": _LazyFactory("openai:AsyncAzureOpenAI"),
+}
+_factories: Dict[str, ClientFactory] = {}
+
+
+def register_provider(name: str, factory: Union[str, ClientFactory]):
+    """
+    Registers a client factory under ``name``, replacing any previous one.
+
+    The factory is called with ``api_key`` and, if set, ``base_url``, and
+    must return a client with the async OpenAI client's
+    ``chat.completions`` interface. Pass it as a ``"module:attribute"``
+    string to defer importing the SDK until a client is needed.
+    """
+    if isinstance(factory, str):
+        _providers[name] = _LazyFactory(factory)
+        _factories.pop(name, None)
+    else:
+        _factories[name] = factory
+        _providers.pop(name, None)
+
+
+def get_provider(name: str) -> ClientFactory:
+    """
+    Returns the client factory registered under ``name``, importing its
+    SDK if this is the first use.
+
+    Raises:
+        UnknownProviderError: If no provider is registered under ``name``.
+        ImportError: If the provider's SDK is not installed.
+    """
+    factory = _factories.get(name)
+    if factory is not None:
+        return factory
+    lazy = _providers.get(name)
+    if lazy is None:
+        raise UnknownProviderError(
+            f"Unknown LLM provider '{name}'. "
+            f"Registered providers: {', '.join(available_providers())}."
+        )
+    return lazy.resolve()
+
+
+def available_providers() -> List[str]:
+    return sorted({*_providers, *_factories})
@@ -0,0 +1,240 @@
+# src/janus/resilience.py
+import asyncio
+import logging
+import math
+import random
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504})
+_RETRYABLE_NAMES = frozenset({"APIConnectionError", "APITimeoutError"})
+
+
+class LLMTimeoutError(asyncio.TimeoutError):
+    """
+    Raised when an LLM call exceeds its adaptive timeout.
+    """
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether an error is transient: a timeout, a dropped connection, or a
+    provider status such as 429 or 503. Provider errors are recognised by
+    their ``status_code`` or class name, so no SDK has to be imported.
+    """
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in _RETRYABLE_NAMES:
+        return True
+    return getattr(error, "status_code", None) in _RETRYABLE_STATUS
+
+
+class LatencyTracker:
+    """
+    Keeps the latencies of the last ``window`` successful calls and
+    answers percentile queries over them.
+    """
+
+    def __init__(self, window: int = 256):
+        if window < 1:
+            raise ValueError("window must be at least 1.")
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Returns the ``q`` quantile (0 to 1) by nearest rank, or None if
+        nothing was recorded.
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(math.ceil(q * len(ordered)), 1)
+        return ordered[min(rank, len(ordered)) - 1]
+
+
+class ResilientCaller:
+    """
+    Runs LLM calls with adaptive timeouts, hedging and jittered retries.
+
+    Once ``min_samples`` latencies are known, each attempt gets a timeout
+    of ``timeout_multiplier`` times the p99 latency, clamped to
+    ``[min_timeout, max_timeout]``; before that, ``default_timeout``
+    applies. If an attempt is still running after the p95 latency, one
+    hedged duplicate is sent and whichever succeeds first wins; the other
+    is cancelled. Attempts that fail with a retryable error are retried
+    up to ``max_retries`` times after a "full jitter" backoff: a random
+    delay of up to ``backoff_base * 2 ** retry``, capped at
+    ``backoff_max``.
+    """
+
+    def __init__(
+        self,
+        hedge_percentile: Optional[float] = 0.95,
+        timeout_percentile: float = 0.99,
+        timeout_multiplier: float = 3.0,
+        default_timeout: Optional[float] = 60.0,
+        min_timeout: float = 1.0,
+        max_timeout: float = 120.0,
+        min_samples: int = 20,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        retryable: Callable[[BaseException], bool] = is_retryable,
+        window: int = 256,
+        rng: Optional[random.Random] = None,
+    ):
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative.")
+        if min_timeout > max_timeout:
+            raise ValueError("min_timeout must not exceed max_timeout.")
+        self.hedge_percentile = hedge_percentile
+        self.timeout_percentile = timeout_percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retryable = retryable
+        self.rng = rng or random.Random()
+        self.latencies = LatencyTracker(window)
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+        self.timeouts = 0
+
+    def timeout(self) -> Optional[float]:
+        """
+        The timeout of the next attempt in seconds, or None for no timeout.
+        """
+        if len(self.latencies) < self.min_samples:
+            return self.default_timeout
+        latency = self.latencies.percentile(self.timeout_percentile)
+        return min(
+            max(latency * self.timeout_multiplier, self.min_timeout),
+            self.max_timeout,
+        )
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Seconds after which a hedged duplicate is sent, or None for none.
+        """
+        if self.hedge_percentile is None or len(self.latencies) < self.min_samples:
+            return None
+        return self.latencies.percentile(self.hedge_percentile)
+
+    def backoff(self, retry: int) -> float:
+        """
+        The jittered delay before retry number ``retry`` (from 0).
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * 2**retry)
+        return self.rng.uniform(0, ceiling)
+
+    async def call(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Calls ``factory()`` until an attempt succeeds, hedging slow ones.
+        ``factory`` must start a fresh request on every call.
+
+        Raises:
+            LLMTimeoutError: If the last attempt timed out.
+            Exception: The last attempt's error, if it was not retryable
+                or the retries ran out.
+        """
+        self.calls += 1
+        retry = 0
+        while True:
+            try:
+                return await self._attempt(factory)
+            except Exception as e:
+                if retry >= self.max_retries or not self.retryable(e):
+                    raise
+                delay = self.backoff(retry)
+                retry += 1
+                self.retries += 1
+                logger.warning(
+                    f"LLM call failed ({type(e).__name__}); "
+                    f"retry {retry}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns call, hedge, retry and timeout counters and the latency
+        percentiles that drive them.
+        """
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "p50": self.latencies.percentile(0.5),
+            "p95": self.latencies.percentile(0.95),
+            "p99": self.latencies.percentile(0.99),
+        }
+
+    async def _attempt(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        timeout = self.timeout()
+        hedge_delay = self.hedge_delay()
+        started = loop.time()
+        deadline = started + timeout if timeout is not None else None
+        first = asyncio.ensure_future(factory())
+        tasks: Set["asyncio.Future[Any]"] = {first}
+        # Latency is measured from when each attempt started, so a winning
+        # hedge does not count the time before it was sent.
+        started_at: Dict["asyncio.Future[Any]", float] = {first: started}
+        hedge: Optional["asyncio.Future[Any]"] = None
+        error: Optional[BaseException] = None
+        try:
+            while tasks:
+                now = loop.time()
+                waits = []
+                if deadline is not None:
+                    waits.append(deadline - now)
+                if hedge is None and hedge_delay is not None:
+                    waits.append(started + hedge_delay - now)
+                done, tasks = await asyncio.wait(
+                    tasks,
+                    timeout=max(min(waits), 0) if waits else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self.latencies.record(loop.time() - started_at[task])
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+                now = loop.time()
+                if tasks and deadline is not None and now >= deadline:
+                    self.timeouts += 1
+                    raise LLMTimeoutError(f"LLM call timed out after {timeout:.2f}s")
+                if (
+                    tasks
+                    and hedge is None
+                    and hedge_delay is not None
+                    and now - started >= hedge_delay
+                ):
+                    self.hedges += 1
+                    logger.info("Hedging LLM call after %.3fs", hedge_delay)
+                    hedge = asyncio.ensure_future(factory())
+                    started_at[hedge] = now
+                    tasks.add(hedge)
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks)
@@ -0,0 +1,133 @@
+# src/janus/response_cache.py
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Optional, Sequence
+
+from janus.cache import TTLCache, canonical_hash
+from janus.models import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayMissError(LookupError):
+    """
+    Raised in replay-only mode when a request has no recorded response.
+    """
+
+
+class LLMResponseCache:
+    """
+    A content-addressed cache of LLM responses.
+
+    Responses are keyed by a stable hash of the model, the full message
+    list (system prompt included) and the tool schemas. Lookups go to an
+    in-memory LRU first and then to an optional on-disk store of one JSON
+    file per response. In ``replay_only`` mode a miss raises
+    ``ReplayMissError`` instead of reaching the network, so test suites and
+    benchmarks can run the whole agent loop offline and deterministically.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_entries: int = 1024,
+        replay_only: bool = False,
+    ):
+        self.directory = directory
+        self.replay_only = replay_only
+        self._memory = TTLCache(max_entries=max_entries)
+        self.disk_hits = 0
+        self.writes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(
+        model: str,
+        messages: Sequence[Dict[str, Any]],
+        tools: Sequence[Dict[str, Any]],
+    ) -> str:
+        """
+        Returns the content address of a request.
+        """
+        return canonical_hash(
+            {"model": model, "messages": list(messages), "tools": list(tools)}
+        )
+
+    async def get(self, key: str) -> Optional[ChatMessage]:
+        """
+        Returns the recorded response for ``key``, or None on a miss.
+
+        Raises:
+            ReplayMissError: On a miss in replay-only mode.
+        """
+        found, payload = self._memory.get(key)
+        if not found and self.directory is not None:
+            payload = await asyncio.get_running_loop().run_in_executor(
+                None, self._read, key
+            )
+            if payload is not None:
+                found = True
+                self.disk_hits += 1
+                self._memory.set(key, payload, size=0)
+        if not found:
+            if self.replay_only:
+                raise ReplayMissError(f"No recorded LLM response for request {key}.")
+            return None
+        return ChatMessage.model_validate(payload)
+
+    async def put(self, key: str, message: ChatMessage):
+        """
+        Records a response. Does nothing in replay-only mode.
+        """
+        if self.replay_only:
+            return
+        payload = message.model_dump(mode="json")
+        self._memory.set(key, payload, size=0)
+        if self.directory is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write, key, payload
+            )
+        self.writes += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns hit/miss counters for both tiers.
+        """
+        memory = self._memory.stats()
+        return {
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": memory["misses"] - self.disk_hits,
+            "writes": self.writes,
+            "memory_entries": memory["entries"],
+        }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)["message"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable cached response {key}: {e}")
+            return None
+
+    def _write(self, key: str, payload: Dict[str, Any]):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "message": payload}, f, sort_keys=True)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
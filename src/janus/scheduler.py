@@ -0,0 +1,308 @@
+# src/janus/scheduler.py
+import asyncio
+import logging
+from collections import deque
+from enum import Enum
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+
+from janus.concurrency import FairLimiter, reset_scope, set_scope
+from janus.orchestrator import AsyncLocalOrchestrator
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerFullError(RuntimeError):
+    """
+    Raised when a session is submitted while both the active set and the
+    admission queue are full.
+    """
+
+
+class SessionStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class SessionHandle:
+    """
+    Tracks one session submitted to a ``SessionScheduler``.
+
+    Iterate over the handle to receive the state yielded after each step,
+    or await ``result()`` for the final state. Sessions never wait for
+    their reader: at most ``update_buffer`` unread states are kept, and
+    when a new one arrives the oldest is dropped and counted in
+    ``dropped_updates``. The last state is always in ``latest_state``.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        tenant: str,
+        orchestrator: AsyncLocalOrchestrator,
+        initial_state: Dict[str, Any],
+        max_steps: int,
+        update_buffer: int = 16,
+    ):
+        self.session_id = session_id
+        self.tenant = tenant
+        self.orchestrator = orchestrator
+        self.initial_state = initial_state
+        self.max_steps = max_steps
+        self.status = SessionStatus.QUEUED
+        self.steps_completed = 0
+        self.latest_state: Optional[Dict[str, Any]] = None
+        self.dropped_updates = 0
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._done = asyncio.get_running_loop().create_future()
+        self._updates: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(
+            update_buffer
+        )
+        self._scheduler: Optional["SessionScheduler"] = None
+
+    def done(self) -> bool:
+        """
+        Whether the session has finished, failed or been cancelled.
+        """
+        return self._done.done()
+
+    async def result(self) -> Optional[Dict[str, Any]]:
+        """
+        Waits for the session to finish and returns its final state.
+
+        Raises:
+            asyncio.CancelledError: If the session was cancelled.
+        """
+        return await asyncio.shield(self._done)
+
+    def cancel(self):
+        """
+        Cancels the session, whether it is queued or running.
+        """
+        if self.done():
+            return
+        if self._task is not None:
+            self._task.cancel()
+        elif self._scheduler is not None:
+            self._scheduler._dequeue(self)
+            self._finish(SessionStatus.CANCELLED)
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            state = await self._updates.get()
+            if state is None:
+                return
+            yield state
+
+    def _finish(
+        self, status: SessionStatus, error: Optional[BaseException] = None
+    ):
+        self.status = status
+        if status == SessionStatus.DONE:
+            self._done.set_result(self.latest_state)
+        elif status == SessionStatus.CANCELLED:
+            self._done.cancel()
+        else:
+            self._done.set_exception(error)
+            # Failures are reported through result(); don't warn if unread.
+            self._done.exception()
+        self._publish(None)
+
+    def _publish(self, update: Optional[Dict[str, Any]]):
+        if self._updates.full():
+            self._updates.get_nowait()
+            self.dropped_updates += 1
+        self._updates.put_nowait(update)
+
+
+class SessionScheduler:
+    """
+    Multiplexes many orchestrator runs on one event loop.
+
+    At most ``max_active_sessions`` sessions run at once and at most
+    ``max_queued_sessions`` wait for admission; beyond that, ``submit``
+    either raises ``SchedulerFullError`` or, with ``wait=True``, blocks the
+    caller until there is room. LLM and tool calls made inside sessions are
+    bounded globally and per tenant, and slots are handed out round-robin
+    across tenants, so sessions advance step by step in a fair order.
+    Each session buffers up to ``update_buffer`` unread step states for
+    readers iterating over its handle (see ``SessionHandle``).
+    """
+
+    def __init__(
+        self,
+        max_active_sessions: int = 100,
+        max_queued_sessions: int = 1000,
+        llm_concurrency: Optional[int] = 16,
+        tool_concurrency: Optional[int] = 64,
+        tenant_llm_concurrency: Optional[int] = None,
+        tenant_tool_concurrency: Optional[int] = None,
+        update_buffer: int = 16,
+    ):
+        if max_active_sessions < 1:
+            raise ValueError("max_active_sessions must be at least 1.")
+        if max_queued_sessions < 0:
+            raise ValueError("max_queued_sessions must not be negative.")
+        if update_buffer < 1:
+            raise ValueError("update_buffer must be at least 1.")
+        self.max_active_sessions = max_active_sessions
+        self.max_queued_sessions = max_queued_sessions
+        self.update_buffer = update_buffer
+        self.llm_limiter = FairLimiter(llm_concurrency, tenant_llm_concurrency)
+        self.tool_limiter = FairLimiter(tool_concurrency, tenant_tool_concurrency)
+        self._active: Dict[str, SessionHandle] = {}
+        self._queue: Deque[SessionHandle] = deque()
+        self._space: Optional[asyncio.Condition] = None
+        self._notifications: Set["asyncio.Task[None]"] = set()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns admission and concurrency counters.
+        """
+        return {
+            "active_sessions": len(self._active),
+            "queued_sessions": len(self._queue),
+            "llm_active": self.llm_limiter.active,
+            "llm_waiting": self.llm_limiter.waiting,
+            "tools_active": self.tool_limiter.active,
+            "tools_waiting": self.tool_limiter.waiting,
+        }
+
+    async def submit(
+        self,
+        session_id: str,
+        orchestrator: AsyncLocalOrchestrator,
+        initial_state: Dict[str, Any],
+        tenant: str = "default",
+        max_steps: int = 5,
+        wait: bool = False,
+    ) -> SessionHandle:
+        """
+        Admits a session, starting it right away if there is capacity.
+
+        Raises:
+            ValueError: If a session with the same id is still active or queued.
+            SchedulerFullError: If the scheduler is full and ``wait`` is False.
+        """
+        if self._space is None:
+            self._space = asyncio.Condition()
+        async with self._space:
+            while True:
+                # Checked again after every wait: the lock is released while
+                # waiting, so the same id may have been admitted meanwhile.
+                if self._is_scheduled(session_id):
+                    raise ValueError(f"Session '{session_id}' is already scheduled.")
+                if not self._is_full():
+                    break
+                if not wait:
+                    raise SchedulerFullError(
+                        f"Cannot admit session '{session_id}': "
+                        f"{len(self._active)} active, {len(self._queue)} queued."
+                    )
+                await self._space.wait()
+            handle = SessionHandle(
+                session_id,
+                tenant,
+                orchestrator,
+                initial_state,
+                max_steps,
+                update_buffer=self.update_buffer,
+            )
+            handle._scheduler = self
+            if len(self._active) < self.max_active_sessions:
+                self._start(handle)
+            else:
+                self._queue.append(handle)
+                logger.info(
+                    "Queued session %s (%d queued)", session_id, len(self._queue)
+                )
+        return handle
+
+    def cancel(self, session_id: str):
+        """
+        Cancels an active or queued session.
+        """
+        handle = self._active.get(session_id)
+        if handle is None:
+            handle = next((h for h in self._queue if h.session_id == session_id), None)
+        if handle is not None:
+            handle.cancel()
+
+    async def shutdown(self):
+        """
+        Cancels every session and waits for running ones to stop.
+        """
+        for handle in list(self._queue):
+            handle.cancel()
+        tasks = [h._task for h in self._active.values() if h._task is not None]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _is_scheduled(self, session_id: str) -> bool:
+        return session_id in self._active or any(
+            h.session_id == session_id for h in self._queue
+        )
+
+    def _is_full(self) -> bool:
+        return (
+            len(self._active) >= self.max_active_sessions
+            and len(self._queue) >= self.max_queued_sessions
+        )
+
+    def _start(self, handle: SessionHandle):
+        handle.status = SessionStatus.RUNNING
+        self._active[handle.session_id] = handle
+        handle._task = asyncio.ensure_future(self._run(handle))
+        # Cleanup runs as a callback, not in _run, so a session cancelled
+        # before its first step is released as well.
+        handle._task.add_done_callback(lambda task: self._release(handle, task))
+        logger.info(
+            "Started session %s for tenant %s", handle.session_id, handle.tenant
+        )
+
+    def _dequeue(self, handle: SessionHandle):
+        if handle in self._queue:
+            self._queue.remove(handle)
+            self._notify_space()
+
+    async def _run(self, handle: SessionHandle):
+        token = set_scope(handle.tenant, self.llm_limiter, self.tool_limiter)
+        try:
+            async for state in handle.orchestrator.run(
+                handle.initial_state, max_steps=handle.max_steps
+            ):
+                handle.steps_completed += 1
+                handle.latest_state = state
+                handle._publish(state)
+        except Exception as e:
+            logger.error("Session %s failed: %s", handle.session_id, e)
+            handle._finish(SessionStatus.FAILED, e)
+        else:
+            handle._finish(SessionStatus.DONE)
+        finally:
+            reset_scope(token)
+
+    def _release(self, handle: SessionHandle, task: "asyncio.Task[None]"):
+        if not handle.done():
+            handle._finish(SessionStatus.CANCELLED)
+        self._active.pop(handle.session_id, None)
+        if self._queue:
+            self._start(self._queue.popleft())
+        self._notify_space()
+
+    def _notify_space(self):
+        if self._space is None:
+            return
+        space = self._space
+
+        async def notify():
+            async with space:
+                space.notify_all()
+
+        task = asyncio.ensure_future(notify())
+        self._notifications.add(task)
+        task.add_done_callback(self._notifications.discard)
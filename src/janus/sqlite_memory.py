@@ -0,0 +1,269 @@
+# src/janus/sqlite_memory.py
+import asyncio
+import json
+import logging
+import sqlite3
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from janus.memory import BaseMemory
+from janus.models import Role
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID
+"""
+
+
+class SQLiteMemoryStore:
+    """
+    An append-only message log in a SQLite database running in WAL mode.
+
+    All database access happens on a single background thread, so the event
+    loop never blocks on disk I/O. Writes are group-committed: every message
+    added while a commit is in flight is written by the next commit, in one
+    transaction, no matter how many sessions it came from.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_batch_size: int = 512,
+        durable: bool = True,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        self.path = path
+        self.max_batch_size = max_batch_size
+        self.durable = durable
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="janus-sqlite"
+        )
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending: List[
+            Tuple[str, int, str, Optional["asyncio.Future[None]"]]
+        ] = []
+        self._writer: Optional["asyncio.Task[None]"] = None
+
+    def session(self, session_id: str, tail_size: int = 200) -> "SQLiteMemory":
+        """
+        Returns a memory bound to one session of this store.
+        """
+        return SQLiteMemory(self, session_id, tail_size=tail_size)
+
+    async def append(self, session_id: str, seq: int, payload: str):
+        """
+        Queues a message for the next group commit. Waits for the commit
+        when the store is durable.
+        """
+        future = asyncio.get_running_loop().create_future() if self.durable else None
+        self._pending.append((session_id, seq, payload, future))
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.ensure_future(self._write_pending())
+        if future is not None:
+            await asyncio.shield(future)
+
+    async def flush(self):
+        """
+        Waits until every queued message has been committed.
+        """
+        while self._pending or (
+            self._writer is not None and not self._writer.done()
+        ):
+            if self._writer is None or self._writer.done():
+                self._writer = asyncio.ensure_future(self._write_pending())
+            await asyncio.shield(self._writer)
+
+    async def load_tail(
+        self, session_id: str, limit: int, before_seq: Optional[int] = None
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Loads up to ``limit`` of the newest messages of a session (older than
+        ``before_seq`` if given), oldest first.
+        """
+        rows = await self._run(self._select_tail, session_id, limit, before_seq)
+        return [(seq, json.loads(payload)) for seq, payload in reversed(rows)]
+
+    async def count(self, session_id: str) -> int:
+        """
+        Returns the number of committed messages in a session.
+        """
+        return await self._run(self._select_count, session_id)
+
+    async def close(self):
+        """
+        Flushes pending writes and closes the database.
+        """
+        await self.flush()
+        await self._run(self._close_connection)
+        self._executor.shutdown(wait=True)
+
+    async def _write_pending(self):
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            rows = [(session_id, seq, payload) for session_id, seq, payload, _ in batch]
+            try:
+                await self._run(self._insert, rows)
+            except asyncio.CancelledError:
+                # The batch stays queued for the next flush. The insert may
+                # still commit on the database thread; the retry then
+                # ignores the rows already written.
+                raise
+            except Exception as e:
+                del self._pending[: len(batch)]
+                logger.error("Failed to commit %d messages: %s", len(rows), e)
+                for *_, future in batch:
+                    if future is not None and not future.done():
+                        future.set_exception(e)
+                continue
+            # Only the writer removes from the front, so the batch is still
+            # there; messages added meanwhile were appended after it.
+            del self._pending[: len(batch)]
+            logger.debug("Committed %d messages", len(rows))
+            for *_, future in batch:
+                if future is not None and not future.done():
+                    future.set_result(None)
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _insert(self, rows: List[Tuple[str, int, str]]):
+        connection = self._connect()
+        connection.execute("BEGIN")
+        try:
+            connection.executemany(
+                "INSERT OR IGNORE INTO messages (session_id, seq, payload) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _select_tail(
+        self, session_id: str, limit: int, before_seq: Optional[int]
+    ) -> List[Tuple[int, str]]:
+        connection = self._connect()
+        if before_seq is None:
+            before_seq = 2**63 - 1
+        return connection.execute(
+            "SELECT seq, payload FROM messages WHERE session_id = ? AND seq < ? "
+            "ORDER BY seq DESC LIMIT ?",
+            (session_id, before_seq, limit),
+        ).fetchall()
+
+    def _select_count(self, session_id: str) -> int:
+        connection = self._connect()
+        return connection.execute(
+            "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+        ).fetchone()[0]
+
+    def _close_connection(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class SQLiteMemory(BaseMemory):
+    """
+    A durable working memory for one session of a ``SQLiteMemoryStore``.
+
+    Only the newest ``tail_size`` messages are kept in RAM, and only they
+    are returned by ``get_context``. They are loaded lazily on first use,
+    so resuming a long session reads its tail and nothing else. Each
+    session must have a single writer.
+    """
+
+    def __init__(
+        self, store: SQLiteMemoryStore, session_id: str, tail_size: int = 200
+    ):
+        if tail_size < 1:
+            raise ValueError("tail_size must be at least 1.")
+        self.store = store
+        self.session_id = session_id
+        self.tail_size = tail_size
+        self._tail: Deque[Dict[str, Any]] = deque(maxlen=tail_size)
+        self._next_seq = 0
+        self._oldest_seq = 0
+        self._loaded = False
+
+    async def add(self, entry: BaseModel):
+        """
+        Appends an entry to the session log. With a durable store the entry
+        joins the in-memory tail only once it is committed, so a failed
+        write leaves both unchanged (and raises).
+        """
+        await self._ensure_loaded()
+        message = entry.model_dump(mode="json")
+        payload = json.dumps(message)
+        seq = self._next_seq
+        self._next_seq += 1
+        try:
+            await self.store.append(self.session_id, seq, payload)
+        except Exception:
+            if self._next_seq == seq + 1:
+                self._next_seq = seq
+            raise
+        if len(self._tail) == self.tail_size:
+            self._oldest_seq += 1
+        self._tail.append(message)
+
+    async def get_context(self) -> Dict[str, Any]:
+        """
+        Returns the resident tail of the session: at most ``tail_size``
+        messages (200 by default), not the whole history. Tool results
+        whose tool call fell outside the tail are dropped. Older messages
+        are read with ``load_history``.
+        """
+        await self._ensure_loaded()
+        messages = list(self._tail)
+        start = 0
+        while start < len(messages) and messages[start].get("role") == Role.TOOL:
+            start += 1
+        return {"messages": messages[start:]}
+
+    async def load_history(
+        self, limit: int, before_seq: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Pages older messages from disk without making them resident.
+        """
+        await self.store.flush()
+        if before_seq is None:
+            await self._ensure_loaded()
+            before_seq = self._oldest_seq
+        rows = await self.store.load_tail(self.session_id, limit, before_seq)
+        return [message for _, message in rows]
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        rows = await self.store.load_tail(self.session_id, self.tail_size)
+        if self._loaded:
+            return
+        self._tail.extend(message for _, message in rows)
+        if rows:
+            self._oldest_seq = rows[0][0]
+            self._next_seq = rows[-1][0] + 1
+        self._loaded = True
@@ -0,0 +1,201 @@
+# src/janus/termination.py
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class StopReason(str, Enum):
+    CONVERGED = "converged"
+    MAX_STEPS = "max_steps"
+    TIME_BUDGET = "time_budget"
+    TOKEN_BUDGET = "token_budget"
+    COST_BUDGET = "cost_budget"
+
+
+class RunProgress:
+    """
+    What an orchestration run has done so far, as seen by termination
+    policies after each step.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.started_at = clock()
+        self.steps = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.last_messages: List[Any] = []
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def elapsed(self) -> float:
+        return self.clock() - self.started_at
+
+    def record_step(self, messages: Sequence[Any], usage: Optional[Dict[str, int]]):
+        """
+        Accounts for one finished step.
+        """
+        self.steps += 1
+        self.last_messages = list(messages)
+        if usage:
+            self.prompt_tokens += usage.get("prompt_tokens", 0)
+            self.completion_tokens += usage.get("completion_tokens", 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "steps": self.steps,
+            "elapsed": self.elapsed,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+        }
+
+
+def stop_state(
+    context: Dict[str, Any], reason: StopReason, progress: RunProgress
+) -> Dict[str, Any]:
+    """
+    Returns the final state of a run: the memory context plus the stop
+    reason and a summary of the run's progress.
+    """
+    return {**context, "stop_reason": reason.value, "progress": progress.to_dict()}
+
+
+class TerminationPolicy(ABC):
+    """
+    Decides after each step whether an orchestration run should stop.
+    Policies combine with ``|``: the run stops as soon as any one fires.
+    """
+
+    @abstractmethod
+    def check(self, progress: RunProgress) -> Optional[StopReason]:
+        """
+        Returns the reason to stop, or None to keep going.
+        """
+        raise NotImplementedError
+
+    def __or__(self, other: "TerminationPolicy") -> "AnyOf":
+        return AnyOf(self, other)
+
+
+class AnyOf(TerminationPolicy):
+    """
+    Stops when any of the given policies does, reporting the first reason.
+    """
+
+    def __init__(self, *policies: TerminationPolicy):
+        self.policies: List[TerminationPolicy] = []
+        for policy in policies:
+            if isinstance(policy, AnyOf):
+                self.policies.extend(policy.policies)
+            else:
+                self.policies.append(policy)
+
+    def check(self, progress: RunProgress) -> Optional[StopReason]:
+        for policy in self.policies:
+            reason = policy.check(progress)
+            if reason is not None:
+                return reason
+        return None
+
+
+def _field(message: Any, name: str) -> Any:
+    if isinstance(message, dict):
+        return message.get(name)
+    return getattr(message, name, None)
+
+
+class Converged(TerminationPolicy):
+    """
+    Stops once the assistant answers without requesting any tool calls.
+    """
+
+    def check(self, progress: RunProgress) -> Optional[StopReason]:
+        assistant = [
+            m for m in progress.last_messages if _field(m, "role") == "assistant"
+        ]
+        if assistant and not any(_field(m, "tool_calls") for m in assistant):
+            return StopReason.CONVERGED
+        return None
+
+
+class MaxSteps(TerminationPolicy):
+    def __init__(self, max_steps: int):
+        if max_steps < 1:
+            raise ValueError("max_steps must be at least 1.")
+        self.max_steps = max_steps
+
+    def check(self, progress: RunProgress) -> Optional[StopReason]:
+        if progress.steps >= self.max_steps:
+            return StopReason.MAX_STEPS
+        return None
+
+
+class TimeBudget(TerminationPolicy):
+    """
+    Stops once the run has taken ``seconds`` of wall-clock time. The check
+    happens between steps, so a step in progress is not interrupted.
+    """
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("seconds must be positive.")
+        self.seconds = seconds
+
+    def check(self, progress: RunProgress) -> Optional[StopReason]:
+        if progress.elapsed >= self.seconds:
+            return StopReason.TIME_BUDGET
+        return None
+
+
+class TokenBudget(TerminationPolicy):
+    """
+    Stops once the LLM calls of the run have used ``max_tokens`` tokens.
+    """
+
+    def __init__(self, max_tokens: int):
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1.")
+        self.max_tokens = max_tokens
+
+    def check(self, progress: RunProgress) -> Optional[StopReason]:
+        if progress.total_tokens >= self.max_tokens:
+            return StopReason.TOKEN_BUDGET
+        return None
+
+
+class CostBudget(TerminationPolicy):
+    """
+    Stops once the estimated cost of the run reaches ``max_cost``, given
+    prices per million prompt and completion tokens.
+    """
+
+    def __init__(
+        self,
+        max_cost: float,
+        prompt_price_per_million: float,
+        completion_price_per_million: float,
+    ):
+        if max_cost <= 0:
+            raise ValueError("max_cost must be positive.")
+        self.max_cost = max_cost
+        self.prompt_price_per_million = prompt_price_per_million
+        self.completion_price_per_million = completion_price_per_million
+
+    def estimate(self, progress: RunProgress) -> float:
+        """
+        Returns the estimated cost of the run so far.
+        """
+        return (
+            progress.prompt_tokens * self.prompt_price_per_million
+            + progress.completion_tokens * self.completion_price_per_million
+        ) / 1_000_000
+
+    def check(self, progress: RunProgress) -> Optional[StopReason]:
+        if self.estimate(progress) >= self.max_cost:
+            return StopReason.COST_BUDGET
+        return None
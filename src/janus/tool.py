@@ -1,36 +1,343 @@
 # src/janus/tool.py
+import asyncio
+import functools
+import inspect
+import json
 import logging
-from typing import Any, Callable, Coroutine, Dict, List, Type
+import pickle
+from concurrent.futures import Executor, ThreadPoolExecutor
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+
+from janus import events, tracing
+from janus.cache import SingleFlight, TTLCache, canonical_hash, estimate_size
+from janus.concurrency import tool_slot
 
 logger = logging.getLogger(__name__)
 
 
-def agent_tool(args_schema: Type[BaseModel]):
+class ExecutionMode(str, Enum):
+    """
+    Where the registry runs a tool.
+    """
+
+    ASYNC = "async"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+def agent_tool(
+    args_schema: Type[BaseModel],
+    cacheable: bool = False,
+    cache_ttl: Optional[float] = None,
+    cache_max_entries: int = 1024,
+    cache_max_bytes: Optional[int] = None,
+    execution: Optional[Union[ExecutionMode, str]] = None,
+    side_effect_free: bool = False,
+):
     """
     Decorator to register a function as an agent tool.
     Attaches the Pydantic schema to the function.
+
+    Tools marked ``cacheable`` must be idempotent: the registry memoizes
+    their results per validated arguments, for at most ``cache_ttl``
+    seconds, in an LRU cache bounded by entry count and bytes.
+
+    ``execution`` selects where the tool runs: inline on the event loop
+    (``async``, the default for ``async def`` tools), on the registry's
+    thread pool (``thread``, the default for plain functions) or on its
+    process pool (``process``, for CPU-bound module-level functions).
+
+    Tools marked ``side_effect_free`` only read: running them with
+    arguments that end up discarded is harmless, so agents may start them
+    speculatively, before the LLM has finished its response.
+
+    Concurrent calls of a cacheable or side-effect-free tool with the same
+    validated arguments are coalesced into a single execution.
     """
 
-    def decorator(
-        func: Callable[..., Coroutine[Any, Any, Any]]
-    ) -> Callable[..., Coroutine[Any, Any, Any]]:
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         setattr(func, "_pydantic_schema", args_schema)
+        if side_effect_free:
+            setattr(func, "_side_effect_free", True)
+        if execution is not None:
+            setattr(func, "_execution_mode", ExecutionMode(execution))
+        if cacheable:
+            setattr(
+                func,
+                "_cache_options",
+                {
+                    "ttl": cache_ttl,
+                    "max_entries": cache_max_entries,
+                    "max_bytes": cache_max_bytes,
+                },
+            )
         return func
 
     return decorator
 
 
+class ToolArgumentsError(ValueError):
+    """
+    Raised when tool arguments are not valid JSON or do not match the
+    tool's schema.
+    """
+
+
+def _process_pool(max_workers: int, mp_context: Any = None) -> Executor:
+    # Imported on first use: it pulls in multiprocessing.
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(max_workers, mp_context=mp_context)
+
+
+def _run_pickled(func: Callable[..., Any], payload: bytes) -> bytes:
+    """
+    Runs in a worker process: unpickles the arguments, calls the tool and
+    pickles its result, both with the highest protocol.
+    """
+    kwargs = pickle.loads(payload)
+    return pickle.dumps(func(**kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class _PoolRunner:
+    """
+    A lazily created executor with a bounded submission queue.
+
+    At most ``max_workers + max_queue`` calls are submitted at once; further
+    callers wait on the event loop, which applies backpressure instead of
+    growing the executor's internal queue without limit.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[int], Executor],
+        max_workers: int,
+        max_queue: int,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative.")
+        self._factory = factory
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs ``func(*args)`` on the executor once a submission slot is free.
+        """
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+            self._slots_loop = loop
+        if self._executor is None:
+            self._executor = self._factory(self.max_workers)
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            result = await loop.run_in_executor(self._executor, func, *args)
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+        self.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns queue-depth and throughput counters.
+        """
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.max_workers),
+            "waiting": self.waiting,
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shuts the executor down; it is recreated on next use.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+class _CompiledTool:
+    """
+    Everything the registry needs to dispatch a tool, built once at
+    registration: its schema spec, argument validator, result cache and
+    execution mode.
+    """
+
+    __slots__ = (
+        "name",
+        "func",
+        "args_schema",
+        "spec",
+        "nested_arguments",
+        "cache",
+        "coalesced",
+        "execution",
+        "side_effect_free",
+    )
+
+    def __init__(self, name: str, func: Callable[..., Any]):
+        self.name = name
+        self.func = func
+        default_execution = (
+            ExecutionMode.ASYNC
+            if inspect.iscoroutinefunction(func)
+            else ExecutionMode.THREAD
+        )
+        self.execution: ExecutionMode = getattr(
+            func, "_execution_mode", default_execution
+        )
+        if self.execution != ExecutionMode.ASYNC and inspect.iscoroutinefunction(
+            func
+        ):
+            raise ValueError(
+                f"Tool '{name}' is a coroutine function and must use "
+                f"execution mode '{ExecutionMode.ASYNC.value}'."
+            )
+        self.args_schema: Optional[Type[BaseModel]] = getattr(
+            func, "_pydantic_schema", None
+        )
+        self.spec: Optional[Dict[str, Any]] = None
+        # Whether the schema nests other models, whose instances are dumped
+        # back to plain dicts before they are passed to the tool.
+        self.nested_arguments = False
+        if self.args_schema is not None:
+            parameters = self.args_schema.model_json_schema()
+            self.nested_arguments = "$defs" in parameters
+            self.spec = {
+                "type": "function",
+                "function": {
+                    "name": name,
+                    "description": func.__doc__ or "",
+                    "parameters": parameters,
+                },
+            }
+        cache_options = getattr(func, "_cache_options", None)
+        self.cache = TTLCache(**cache_options) if cache_options is not None else None
+        self.coalesced = 0
+        self.side_effect_free: bool = getattr(func, "_side_effect_free", False)
+
+    def validate(self, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Any]:
+        """
+        Validates keyword arguments. Returns the arguments to call the tool
+        with and their JSON-compatible form. Nested models are passed to the
+        tool as plain dicts, as they arrive from the LLM.
+        """
+        if self.args_schema is None:
+            return kwargs, kwargs
+        try:
+            model = self.args_schema.model_validate(kwargs)
+        except ValidationError as e:
+            raise ToolArgumentsError(str(e)) from e
+        return self._call_kwargs(model), model
+
+    def validate_json(self, arguments: str) -> Tuple[Dict[str, Any], Any]:
+        """
+        Parses and validates a JSON arguments string in a single pass.
+        """
+        if self.args_schema is None:
+            try:
+                kwargs = json.loads(arguments or "{}")
+            except json.JSONDecodeError as e:
+                raise ToolArgumentsError(str(e)) from e
+            if not isinstance(kwargs, dict):
+                raise ToolArgumentsError("Tool arguments must be a JSON object.")
+            return kwargs, kwargs
+        try:
+            model = self.args_schema.model_validate_json(arguments or "{}")
+        except ValidationError as e:
+            raise ToolArgumentsError(str(e)) from e
+        return self._call_kwargs(model), model
+
+    def _call_kwargs(self, model: BaseModel) -> Dict[str, Any]:
+        if self.nested_arguments:
+            return model.model_dump()
+        return dict(model)
+
+
+def _annotated(span: Any, result: Any) -> Any:
+    if span.recording:
+        span.set("result_chars", estimate_size(result))
+    return result
+
+
 class ToolRegistry:
     """
     A simple registry for agent tools.
+
+    Each tool is compiled once when it is registered. The schema list
+    returned by ``get_schemas`` is built lazily and reused until the set of
+    registered tools changes.
+
+    Blocking tools run on a bounded thread pool and CPU-bound tools on a
+    bounded process pool, both owned by the registry and created on first
+    use. Call ``shutdown`` to release them.
+
+    Identical concurrent calls of cacheable and side-effect-free tools
+    share one execution; ``coalescing_stats`` reports the calls saved.
     """
 
-    def __init__(self):
-        self._tools: Dict[str, Callable[..., Coroutine[Any, Any, Any]]] = {}
+    def __init__(
+        self,
+        max_thread_workers: int = 8,
+        max_thread_queue: int = 64,
+        max_process_workers: int = 2,
+        max_process_queue: int = 16,
+        mp_context: Any = None,
+    ):
+        self._tools: Dict[str, _CompiledTool] = {}
+        self._schemas: Optional[Tuple[Dict[str, Any], ...]] = None
+        self._inflight = SingleFlight()
+        self._pools: Dict[ExecutionMode, _PoolRunner] = {
+            ExecutionMode.THREAD: _PoolRunner(
+                functools.partial(ThreadPoolExecutor, thread_name_prefix="janus-tool"),
+                max_thread_workers,
+                max_thread_queue,
+            ),
+            ExecutionMode.PROCESS: _PoolRunner(
+                functools.partial(_process_pool, mp_context=mp_context),
+                max_process_workers,
+                max_process_queue,
+            ),
+        }
 
-    def register(self, tool_func: Callable[..., Coroutine[Any, Any, Any]]):
+    def register(self, tool_func: Callable[..., Any]):
         """
         Registers a tool function.
 
@@ -41,7 +348,8 @@ class ToolRegistry:
         if tool_name in self._tools:
             raise ValueError(f"Tool '{tool_name}' is already registered.")
         logger.info(f"Registering tool: {tool_name}")
-        self._tools[tool_name] = tool_func
+        self._tools[tool_name] = _CompiledTool(tool_name, tool_func)
+        self._schemas = None
 
     async def execute(self, tool_name: str, **kwargs: Any) -> Any:
         """
@@ -49,29 +357,138 @@ class ToolRegistry:
 
         Raises:
             ValueError: If the tool is not found.
+            ToolArgumentsError: If the arguments do not match the tool's schema.
+        """
+        tool = self._get(tool_name)
+        logger.debug("Executing tool: %s with args: %s", tool_name, kwargs)
+        events.emit("tool.execute", {"tool": tool_name, "args": kwargs})
+        with tracing.span("tool.execute", tool=tool_name) as span:
+            call_kwargs, validated = tool.validate(kwargs)
+            return _annotated(span, await self._dispatch(tool, call_kwargs, validated))
+
+    async def execute_json(self, tool_name: str, arguments: str) -> Any:
+        """
+        Executes a tool with arguments given as a JSON object string, as
+        produced by the LLM. Parsing and validation happen in one pass.
+
+        Raises:
+            ValueError: If the tool is not found.
+            ToolArgumentsError: If the arguments are not valid for the tool.
+        """
+        tool = self._get(tool_name)
+        logger.debug("Executing tool: %s with args: %s", tool_name, arguments)
+        events.emit("tool.execute", {"tool": tool_name, "args": arguments})
+        with tracing.span(
+            "tool.execute", tool=tool_name, args_chars=len(arguments)
+        ) as span:
+            call_kwargs, validated = tool.validate_json(arguments)
+            return _annotated(span, await self._dispatch(tool, call_kwargs, validated))
+
+    def is_side_effect_free(self, tool_name: str) -> bool:
+        """
+        Whether a registered tool may be run speculatively.
+        """
+        tool = self._tools.get(tool_name)
+        return tool is not None and tool.side_effect_free
+
+    def executor_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns queue-depth metrics of the thread and process pools.
         """
-        if tool_name not in self._tools:
+        return {mode.value: pool.stats() for mode, pool in self._pools.items()}
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shuts down the registry's executors.
+        """
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns per-tool cache statistics for all cacheable tools.
+        """
+        return {
+            name: {**tool.cache.stats(), "coalesced": tool.coalesced}
+            for name, tool in self._tools.items()
+            if tool.cache is not None
+        }
+
+    def coalescing_stats(self) -> Dict[str, Any]:
+        """
+        Returns how many duplicate tool calls were coalesced, in total and
+        per tool, and how many coalescable calls are in flight.
+        """
+        return {
+            **self._inflight.stats(),
+            "by_tool": {
+                name: tool.coalesced
+                for name, tool in self._tools.items()
+                if tool.coalesced
+            },
+        }
+
+    def clear_cache(self, tool_name: Optional[str] = None):
+        """
+        Drops cached results of one tool, or of every tool.
+        """
+        for name, tool in self._tools.items():
+            if tool.cache is not None and tool_name in (None, name):
+                tool.cache.clear()
+
+    def _get(self, tool_name: str) -> _CompiledTool:
+        tool = self._tools.get(tool_name)
+        if tool is None:
             raise ValueError(f"Tool '{tool_name}' not found.")
-        tool_func = self._tools[tool_name]
-        logger.info(f"Executing tool: {tool_name} with args: {kwargs}")
-        return await tool_func(**kwargs)
-
-    def get_schemas(self) -> List[Dict[str, Any]]:
-        """
-        Returns a list of Pydantic schemas for all registered tools.
-        """
-        schemas = []
-        for name, func in self._tools.items():
-            schema = getattr(func, "_pydantic_schema", None)
-            if schema:
-                schemas.append(
-                    {
-                        "type": "function",
-                        "function": {
-                            "name": name,
-                            "description": func.__doc__ or "",
-                            "parameters": schema.model_json_schema(),
-                        },
-                    }
-                )
-        return schemas
+        return tool
+
+    async def _dispatch(
+        self, tool: _CompiledTool, call_kwargs: Dict[str, Any], validated: Any
+    ) -> Any:
+        if tool.cache is None and not tool.side_effect_free:
+            return await self._invoke(tool, call_kwargs)
+
+        if isinstance(validated, BaseModel):
+            validated = validated.model_dump(mode="json")
+        key_hash = canonical_hash(validated)
+        if tool.cache is not None and (tool.name, key_hash) not in self._inflight:
+            found, result = tool.cache.get(key_hash)
+            if found:
+                return result
+
+        result, shared = await self._inflight.do(
+            (tool.name, key_hash),
+            lambda: self._execute_and_cache(tool, key_hash, call_kwargs),
+        )
+        if shared:
+            tool.coalesced += 1
+        return result
+
+    async def _execute_and_cache(
+        self, tool: _CompiledTool, key_hash: str, call_kwargs: Dict[str, Any]
+    ) -> Any:
+        result = await self._invoke(tool, call_kwargs)
+        if tool.cache is not None:
+            tool.cache.set(key_hash, result)
+        return result
+
+    async def _invoke(self, tool: _CompiledTool, call_kwargs: Dict[str, Any]) -> Any:
+        async with tool_slot():
+            if tool.execution == ExecutionMode.ASYNC:
+                return await tool.func(**call_kwargs)
+            pool = self._pools[tool.execution]
+            if tool.execution == ExecutionMode.THREAD:
+                return await pool.run(functools.partial(tool.func, **call_kwargs))
+            payload = pickle.dumps(call_kwargs, protocol=pickle.HIGHEST_PROTOCOL)
+            return pickle.loads(await pool.run(_run_pickled, tool.func, payload))
+
+    def get_schemas(self) -> Sequence[Dict[str, Any]]:
+        """
+        Returns the schemas of all registered tools that have one. The
+        returned sequence is shared between calls and must not be mutated.
+        """
+        if self._schemas is None:
+            self._schemas = tuple(
+                tool.spec for tool in self._tools.values() if tool.spec is not None
+            )
+        return self._schemas
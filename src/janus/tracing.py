@@ -0,0 +1,376 @@
+# src/janus/tracing.py
+import contextvars
+import itertools
+import json
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from janus.events import EventPipeline, EventSink
+
+logger = logging.getLogger(__name__)
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar(
+    "janus_current_span", default=None
+)
+
+
+class Span:
+    """
+    One timed operation: an orchestrator step, an LLM call, a tool run or
+    a memory operation. Used as a context manager, a span is the parent of
+    the spans started inside it. Async generators that yield mid-operation
+    must not leak it into their consumer: they call ``finish()`` instead.
+    """
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start",
+        "end",
+        "attributes",
+        "error",
+        "_tracer",
+        "_token",
+    )
+
+    recording = True
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        span_id: str,
+        parent: Optional["Span"],
+        attributes: Dict[str, Any],
+    ):
+        self.name = name
+        self.span_id = span_id
+        self.trace_id = parent.trace_id if parent is not None else span_id
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = tracer.clock()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self._tracer = tracer
+        self._token: Optional[contextvars.Token] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.end - self.start if self.end is not None else None
+
+    def set(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def finish(self, error: Optional[BaseException] = None):
+        """
+        Ends the span. Finishing twice has no effect.
+        """
+        if self.end is not None:
+            return
+        self.end = self._tracer.clock()
+        if error is not None:
+            self.error = type(error).__name__
+        self._tracer._finish(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        self.finish(exc)
+
+
+class _NoopSpan:
+    """
+    Stands in for a span while tracing is off.
+    """
+
+    __slots__ = ()
+
+    recording = False
+
+    def set(self, key: str, value: Any):
+        pass
+
+    def finish(self, error: Optional[BaseException] = None):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class LatencyHistogram:
+    """
+    An HDR-style latency histogram.
+
+    Values are counted in log-linear buckets: exact below
+    ``sub_buckets`` microseconds, then ``sub_buckets / 2`` buckets per
+    power of two, so every recorded latency is kept to within a relative
+    error of about ``2 / sub_buckets`` at constant memory per magnitude.
+    """
+
+    def __init__(self, sub_buckets: int = 256):
+        if sub_buckets < 2 or sub_buckets & (sub_buckets - 1):
+            raise ValueError("sub_buckets must be a power of two, at least 2.")
+        self.sub_buckets = sub_buckets
+        self._half = sub_buckets // 2
+        self._half_bits = self._half.bit_length()
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float):
+        index = self._index(max(int(seconds * 1e6), 0))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram"):
+        """
+        Adds the counts of a histogram with the same bucket layout.
+        """
+        if other.sub_buckets != self.sub_buckets:
+            raise ValueError("Cannot merge histograms with different layouts.")
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for bound in (other.min, other.max):
+            if bound is not None:
+                self.min = bound if self.min is None else min(self.min, bound)
+                self.max = bound if self.max is None else max(self.max, bound)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Returns the ``q`` quantile (0 to 1) in seconds, or None if empty.
+        """
+        if not self.count:
+            return None
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                value = self._value(index) / 1e6
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "p999": self.percentile(0.999),
+            "max": self.max,
+        }
+
+    def _index(self, micros: int) -> int:
+        if micros < self.sub_buckets:
+            return micros
+        shift = micros.bit_length() - self._half_bits
+        return shift * self._half + (micros >> shift)
+
+    def _value(self, index: int) -> float:
+        # The midpoint of the bucket.
+        if index < self.sub_buckets:
+            return float(index)
+        shift = index // self._half - 1
+        low = (index - shift * self._half) << shift
+        return low + ((1 << shift) - 1) / 2
+
+
+class SpanExporter(ABC):
+    """
+    Abstract base class for span exporters. Spans arrive in batches.
+    """
+
+    @abstractmethod
+    def export(self, spans: List[Span]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class RingBufferExporter(SpanExporter):
+    """
+    Keeps the last ``capacity`` finished spans in memory.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self._spans: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self.dropped = 0
+
+    def export(self, spans: List[Span]):
+        overflow = len(self._spans) + len(spans) - self._spans.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self._spans.extend(span.to_dict() for span in spans)
+
+    def spans(self, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [s for s in self._spans if name is None or s["name"] == name]
+
+
+class _SpanLinesSink(EventSink):
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, events: List[Dict[str, Any]]):
+        self._file.write(
+            "".join(json.dumps(e["payload"], default=str) + "\n" for e in events)
+        )
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class JSONLExporter(SpanExporter):
+    """
+    Appends spans to a JSON-lines file.
+
+    Spans are queued on a private ``EventPipeline``, which serializes and
+    writes them on its flusher thread, so exporting never blocks the event
+    loop on disk I/O. If the file falls behind by more than ``capacity``
+    spans, the oldest are dropped (see ``pipeline.stats()``).
+    """
+
+    def __init__(self, path: str, capacity: int = 10000, flush_interval: float = 0.25):
+        self.path = path
+        self.pipeline = EventPipeline(
+            [_SpanLinesSink(path)], capacity=capacity, flush_interval=flush_interval
+        )
+        self.pipeline.start()
+
+    def export(self, spans: List[Span]):
+        for span in spans:
+            self.pipeline.emit("span", span, renderer=Span.to_dict)
+
+    def close(self):
+        self.pipeline.close()
+
+
+class Tracer:
+    """
+    Records spans, keeps a latency histogram per span name and hands
+    finished spans to an exporter in batches of ``batch_size``.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[SpanExporter] = None,
+        batch_size: int = 64,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.clock = clock
+        self._ids = itertools.count(1)
+        self._batch: List[Span] = []
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def span(self, name: str, **attributes: Any) -> Span:
+        """
+        Starts a span under the current one. Entering it makes it current.
+        """
+        return Span(
+            self, name, f"{next(self._ids):x}", _current_span.get(), attributes
+        )
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """
+        Returns the latency histogram of the spans called ``name``.
+        """
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = LatencyHistogram()
+        return histogram
+
+    def latency_summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns count, mean and percentiles of every span name.
+        """
+        return {name: h.summary() for name, h in sorted(self._histograms.items())}
+
+    def flush(self):
+        """
+        Exports the spans finished since the last batch.
+        """
+        batch, self._batch = self._batch, []
+        if batch and self.exporter is not None:
+            try:
+                self.exporter.export(batch)
+            except Exception as e:
+                logger.warning(f"Dropped {len(batch)} spans: {e}")
+
+    def close(self):
+        self.flush()
+        if self.exporter is not None:
+            self.exporter.close()
+
+    def _finish(self, span: Span):
+        self.histogram(span.name).record(span.duration)
+        if self.exporter is not None:
+            self._batch.append(span)
+            if len(self._batch) >= self.batch_size:
+                self.flush()
+
+
+_tracer: Optional[Tracer] = None
+
+
+def set_tracer(tracer: Optional[Tracer]):
+    """
+    Installs the process-wide tracer; None turns tracing off.
+    """
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """
+    Returns a span of the installed tracer, or a no-op one.
+    """
+    if _tracer is None:
+        return NOOP_SPAN
+    return _tracer.span(name, **attributes)
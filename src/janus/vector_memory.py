@@ -0,0 +1,286 @@
+# src/janus/vector_memory.py
+import hashlib
+import json
+import logging
+import re
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+import numpy as np
+from pydantic import BaseModel
+
+from janus.memory import BaseMemory, MessageView
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[List[str]], Awaitable[np.ndarray]]
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """
+    A deterministic, local embedder based on feature hashing of words.
+
+    It needs no network or model weights, which makes it suitable for tests
+    and offline runs. Vectors are L2-normalized.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    async def __call__(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN_RE.findall(text.lower()):
+                digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                vectors[row, (value >> 1) % self.dim] += sign
+        return vectors
+
+
+class MemoryHit(NamedTuple):
+    message: Dict[str, Any]
+    score: float
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the ``k`` highest scores, best first.
+    """
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class VectorMemory(BaseMemory):
+    """
+    A long-term memory that supports similarity search over its entries.
+
+    Embeddings live in one contiguous float32 matrix that grows by doubling,
+    and queries are scored with batched matrix products. If ``n_partitions``
+    is set, an IVF index (spherical k-means over the stored vectors) is
+    trained once ``index_threshold`` entries are stored, and a search only
+    scores the entries of the ``n_probe`` closest partitions.
+
+    Entries added after training are assigned to the existing partitions,
+    which drift from the data as it grows. The index is retrained each time
+    the memory grows by a factor of ``retrain_growth`` since it was last
+    trained; pass None to train only once. Retraining at geometric sizes
+    keeps its amortized cost per entry constant.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        initial_capacity: int = 1024,
+        n_partitions: Optional[int] = None,
+        n_probe: int = 8,
+        index_threshold: Optional[int] = None,
+        retrain_growth: Optional[float] = 2.0,
+        seed: int = 0,
+    ):
+        if initial_capacity < 1:
+            raise ValueError("initial_capacity must be at least 1.")
+        if n_partitions is not None and n_partitions < 1:
+            raise ValueError("n_partitions must be at least 1.")
+        if retrain_growth is not None and retrain_growth <= 1:
+            raise ValueError("retrain_growth must be greater than 1.")
+        self.embedder = embedder
+        self.n_partitions = n_partitions
+        self.n_probe = n_probe
+        self.index_threshold = (
+            index_threshold
+            if index_threshold is not None
+            else (n_partitions or 0) * 40
+        )
+        self.retrain_growth = retrain_growth
+        self._rng = np.random.default_rng(seed)
+        self._initial_capacity = initial_capacity
+        self._vectors: Optional[np.ndarray] = None
+        self._count = 0
+        self._messages: List[Dict[str, Any]] = []
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._list_sizes: List[int] = []
+        self._trained_count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def indexed(self) -> bool:
+        """
+        Whether the IVF index has been trained.
+        """
+        return self._centroids is not None
+
+    async def add(self, entry: BaseModel):
+        """
+        Embeds and stores an entry.
+        """
+        await self.add_many([entry])
+
+    async def add_many(self, entries: Sequence[BaseModel]):
+        """
+        Embeds and stores several entries with a single embedder call.
+        """
+        if not entries:
+            return
+        messages = [entry.model_dump() for entry in entries]
+        texts = [self._text_of(message) for message in messages]
+        embeddings = await self.embedder(texts)
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        start = self._count
+        self._reserve(start + len(messages), vectors.shape[1])
+        self._vectors[start : start + len(messages)] = vectors
+        self._count += len(messages)
+        self._messages.extend(messages)
+        if self._centroids is None:
+            if self.n_partitions and self._count >= self.index_threshold:
+                self.build_index()
+        elif (
+            self.retrain_growth is not None
+            and self._count >= self._trained_count * self.retrain_growth
+        ):
+            self.build_index()
+        else:
+            self._assign(np.arange(start, self._count))
+
+    async def get_context(self) -> Dict[str, Any]:
+        """
+        Returns a read-only view of every stored message.
+        """
+        return {"messages": MessageView(self._messages, len(self._messages))}
+
+    async def search(self, query: str, k: int = 5) -> List[MemoryHit]:
+        """
+        Returns the ``k`` stored messages most similar to ``query``.
+        """
+        return (await self.search_many([query], k))[0]
+
+    async def search_many(
+        self, queries: List[str], k: int = 5
+    ) -> List[List[MemoryHit]]:
+        """
+        Scores several queries at once and returns the top ``k`` per query.
+        """
+        if not queries:
+            return []
+        if self._count == 0 or k < 1:
+            return [[] for _ in queries]
+        query_vectors = _normalize(
+            np.asarray(await self.embedder(queries), dtype=np.float32)
+        )
+        vectors = self._vectors[: self._count]
+        if self._centroids is None:
+            scores = query_vectors @ vectors.T
+            return [self._hits(np.arange(self._count), row, k) for row in scores]
+
+        n_probe = min(self.n_probe, len(self._centroids))
+        centroid_scores = query_vectors @ self._centroids.T
+        results = []
+        for query_vector, row in zip(query_vectors, centroid_scores):
+            probes = _top_k(row, n_probe)
+            candidates = np.concatenate(
+                [self._lists[p][: self._list_sizes[p]] for p in probes]
+            )
+            scores = vectors[candidates] @ query_vector
+            results.append(self._hits(candidates, scores, k))
+        return results
+
+    def build_index(self, iterations: int = 10, sample_size: Optional[int] = None):
+        """
+        Trains the IVF partitions with spherical k-means and assigns every
+        stored vector to its closest partition.
+        """
+        if not self.n_partitions:
+            raise ValueError("build_index requires n_partitions to be set.")
+        if self._count == 0:
+            raise ValueError("Cannot build an index over an empty memory.")
+        n_partitions = min(self.n_partitions, self._count)
+        vectors = self._vectors[: self._count]
+        sample_size = sample_size or n_partitions * 256
+        if self._count > sample_size:
+            sample = vectors[self._rng.choice(self._count, sample_size, replace=False)]
+        else:
+            sample = vectors
+        centroids = sample[self._rng.choice(len(sample), n_partitions, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+        logger.info(
+            "Built IVF index with %d partitions over %d entries",
+            n_partitions,
+            self._count,
+        )
+        self._centroids = centroids
+        self._trained_count = self._count
+        self._lists = [np.empty(16, dtype=np.int64) for _ in range(n_partitions)]
+        self._list_sizes = [0] * n_partitions
+        self._assign(np.arange(self._count))
+
+    def _assign(self, ids: np.ndarray):
+        partitions = np.argmax(self._vectors[ids] @ self._centroids.T, axis=1)
+        order = np.argsort(partitions, kind="stable")
+        ids, partitions = ids[order], partitions[order]
+        starts = np.flatnonzero(np.r_[True, np.diff(partitions) != 0])
+        for start, group in zip(starts, np.split(ids, starts[1:])):
+            p = int(partitions[start])
+            size = self._list_sizes[p]
+            needed = size + len(group)
+            if needed > len(self._lists[p]):
+                grown = np.empty(max(needed, 2 * len(self._lists[p])), dtype=np.int64)
+                grown[:size] = self._lists[p][:size]
+                self._lists[p] = grown
+            self._lists[p][size:needed] = group
+            self._list_sizes[p] = needed
+
+    def _reserve(self, needed: int, dim: int):
+        if self._vectors is None:
+            capacity = max(needed, self._initial_capacity)
+            self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+            return
+        if self._vectors.shape[1] != dim:
+            raise ValueError(
+                f"Embedding dimension changed from {self._vectors.shape[1]} to {dim}."
+            )
+        if needed > len(self._vectors):
+            capacity = max(needed, 2 * len(self._vectors))
+            grown = np.zeros((capacity, dim), dtype=np.float32)
+            grown[: self._count] = self._vectors[: self._count]
+            self._vectors = grown
+
+    def _hits(self, ids: np.ndarray, scores: np.ndarray, k: int) -> List[MemoryHit]:
+        return [
+            MemoryHit(self._messages[int(ids[i])], float(scores[i]))
+            for i in _top_k(scores, k)
+        ]
+
+    @staticmethod
+    def _text_of(message: Dict[str, Any]) -> str:
+        if message.get("content"):
+            return message["content"]
+        if message.get("tool_calls"):
+            return json.dumps(message["tool_calls"], default=str)
+        return ""
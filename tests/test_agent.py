@@ -1,78 +1,286 @@
 # tests/test_agent.py
+import asyncio
 import json
+from types import SimpleNamespace
+from typing import Any, Dict
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from janus.agent import StandardPlannerAgent
+from janus.agent import StandardPlannerAgent, ToolCancelPolicy
+from janus.fake_llm import FakeChatBackend
+from janus.models import EventType, WeatherArgs
+from janus.tool import ToolRegistry, agent_tool
 
 
 @pytest.fixture
 def mock_tool_registry():
     registry = MagicMock()
     registry.get_schemas.return_value = [{"name": "get_weather", "parameters": {}}]
-    registry.execute = AsyncMock(return_value="Sunny")
+    registry.execute_json = AsyncMock(return_value="Sunny")
     return registry
 
 
 @pytest.fixture
-def agent():
-    return StandardPlannerAgent(api_key="test-key")
+def weather_registry():
+    @agent_tool(args_schema=WeatherArgs)
+    async def get_weather(location: str) -> str:
+        """Gets the weather."""
+        return "Sunny"
 
+    registry = ToolRegistry()
+    registry.register(get_weather)
+    return registry
 
-@pytest.mark.asyncio
-async def test__agent_execute(agent: StandardPlannerAgent, mock_tool_registry):
-    mock_function = MagicMock()
-    mock_function.name = "get_weather"
-    mock_function.arguments = json.dumps({"location": "SF"})
-    mock_tool_call = MagicMock()
-    mock_tool_call.function = mock_function
-    agent._call_openai_api = AsyncMock(
-        return_value=MagicMock(
-            tool_calls=[mock_tool_call]
-        )
+
+def fake_agent(*tool_calls: Dict[str, Any], **kwargs: Any) -> StandardPlannerAgent:
+    """
+    An agent whose LLM answers every request with ``tool_calls``.
+    """
+    backend = FakeChatBackend([{"tool_calls": list(tool_calls)}])
+    return StandardPlannerAgent(
+        api_key="test-key", client_pool=backend.client_pool(), **kwargs
     )
+
+
+def tool_call(name: str, arguments: Any) -> Dict[str, Any]:
+    if not isinstance(arguments, str):
+        arguments = json.dumps(arguments)
+    return {"name": name, "arguments": arguments}
+
+
+@pytest.mark.asyncio
+async def test__agent_execute(mock_tool_registry):
+    agent = fake_agent(tool_call("get_weather", {"location": "SF"}))
     state = {"messages": [{"role": "user", "content": "What's the weather in SF?"}]}
     result = await agent.execute(state, mock_tool_registry)
     assert result["messages_to_add"][1].role == "tool"
     assert "Sunny" in result["messages_to_add"][1].content
-    mock_tool_registry.execute.assert_awaited_once_with(
-        "get_weather", location="SF"
+    mock_tool_registry.execute_json.assert_awaited_once_with(
+        "get_weather", json.dumps({"location": "SF"})
     )
 
 
 @pytest.mark.asyncio
-async def test_agent_llm_parse_error(agent: StandardPlannerAgent, mock_tool_registry):
-    mock_function = MagicMock()
-    mock_function.name = "get_weather"
-    mock_function.arguments = "invalid json"
-    mock_tool_call = MagicMock()
-    mock_tool_call.function = mock_function
-    agent._call_openai_api = AsyncMock(
-        return_value=MagicMock(
-            tool_calls=[mock_tool_call]
-        )
-    )
-    state = {"messages": []}
-    result = await agent.execute(state, mock_tool_registry)
+async def test_agent_llm_parse_error(weather_registry):
+    agent = fake_agent(tool_call("get_weather", "invalid json"))
+    result = await agent.execute({"messages": []}, weather_registry)
+    assert "Error parsing arguments" in result["messages_to_add"][1].content
+
+
+@pytest.mark.asyncio
+async def test_agent_schema_validation_error(weather_registry):
+    agent = fake_agent(tool_call("get_weather", {"city": "SF"}))
+    result = await agent.execute({"messages": []}, weather_registry)
     assert "Error parsing arguments" in result["messages_to_add"][1].content
+    assert "location" in result["messages_to_add"][1].content
+
+
+@pytest.mark.asyncio
+async def test_agent_tool_execution_error(mock_tool_registry):
+    agent = fake_agent(tool_call("get_weather", {"location": "SF"}))
+    mock_tool_registry.execute_json.side_effect = Exception("Tool failed")
+    result = await agent.execute({"messages": []}, mock_tool_registry)
+    assert "Error executing tool" in result["messages_to_add"][1].content
+
+
+@pytest.mark.asyncio
+async def test_agent_parallel_tool_calls_keep_order(mock_tool_registry):
+    agent = fake_agent(
+        tool_call("slow", {"delay": 0.03}),
+        tool_call("fast", {"delay": 0.0}),
+        tool_call("medium", {"delay": 0.01}),
+        parallel_tool_calls=True,
+        max_concurrent_tools=2,
+    )
+    running = 0
+    peak = 0
+
+    async def execute(tool_name, arguments):
+        nonlocal running, peak
+        delay = json.loads(arguments)["delay"]
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(delay)
+        running -= 1
+        return f"{tool_name}:{delay}"
+
+    mock_tool_registry.execute_json = AsyncMock(side_effect=execute)
+    result = await agent.execute({"messages": []}, mock_tool_registry)
+    contents = [msg.content for msg in result["messages_to_add"][1:]]
+    assert contents == ["slow:0.03", "fast:0.0", "medium:0.01"]
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_agent_tool_timeout(mock_tool_registry):
+    agent = fake_agent(
+        tool_call("slow", {"delay": 1}),
+        tool_call("fast", {"delay": 0}),
+        parallel_tool_calls=True,
+        tool_timeouts={"slow": 0.01},
+    )
+
+    async def execute(tool_name, arguments):
+        delay = json.loads(arguments)["delay"]
+        await asyncio.sleep(delay)
+        return tool_name
+
+    mock_tool_registry.execute_json = AsyncMock(side_effect=execute)
+    result = await agent.execute({"messages": []}, mock_tool_registry)
+    assert "timed out" in result["messages_to_add"][1].content
+    assert result["messages_to_add"][2].content == "fast"
 
 
 @pytest.mark.asyncio
-async def test_agent_tool_execution_error(
-    agent: StandardPlannerAgent, mock_tool_registry
-):
-    mock_function = MagicMock()
-    mock_function.name = "get_weather"
-    mock_function.arguments = json.dumps({"location": "SF"})
-    mock_tool_call = MagicMock()
-    mock_tool_call.function = mock_function
-    agent._call_openai_api = AsyncMock(
-        return_value=MagicMock(
-            tool_calls=[mock_tool_call]
+async def test_agent_cancel_remaining_on_error(mock_tool_registry):
+    agent = fake_agent(
+        tool_call("slow", {"delay": 1}),
+        tool_call("broken", {"delay": 0}),
+        parallel_tool_calls=True,
+        cancel_policy=ToolCancelPolicy.CANCEL_REMAINING,
+    )
+
+    async def execute(tool_name, arguments):
+        delay = json.loads(arguments)["delay"]
+        await asyncio.sleep(delay)
+        if tool_name == "broken":
+            raise RuntimeError("boom")
+        return tool_name
+
+    mock_tool_registry.execute_json = AsyncMock(side_effect=execute)
+    result = await agent.execute({"messages": []}, mock_tool_registry)
+    assert "cancelled" in result["messages_to_add"][1].content
+    assert "Error executing tool broken: boom" in result["messages_to_add"][2].content
+
+
+@pytest.mark.asyncio
+async def test_agent_stream_reassembles_tool_calls(mock_tool_registry):
+    backend = FakeChatBackend(
+        [
+            {
+                "content": "Let me check.",
+                "tool_calls": [tool_call("get_weather", {"location": "SF"})],
+            }
+        ],
+        stream_chunk_chars=7,
+    )
+    agent = StandardPlannerAgent(api_key="test-key", client_pool=backend.client_pool())
+    events = [
+        event async for event in agent.stream({"messages": []}, mock_tool_registry)
+    ]
+    assert [event.type for event in events] == [
+        EventType.TOKEN,
+        EventType.TOKEN,
+        EventType.TOOL_CALL_STARTED,
+        EventType.TOOL_CALL_FINISHED,
+        EventType.STEP_DONE,
+    ]
+    assert events[2].data["name"] == "get_weather"
+    assert events[3].data["content"] == "Sunny"
+    assistant, tool = events[-1].data["messages_to_add"]
+    assert assistant.content == "Let me check."
+    assert assistant.tool_calls[0]["function"]["arguments"] == '{"location": "SF"}'
+    assert tool.tool_call_id == assistant.tool_calls[0]["id"]
+    mock_tool_registry.execute_json.assert_awaited_once_with(
+        "get_weather", '{"location": "SF"}'
+    )
+
+
+def make_chunk(content=None, tool_calls=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def make_call_delta(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(
+        index=index,
+        id=id,
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+@pytest.mark.asyncio
+async def test_agent_speculatively_starts_side_effect_free_tools():
+    log = []
+
+    @agent_tool(args_schema=WeatherArgs, side_effect_free=True)
+    async def lookup(location: str) -> str:
+        """Looks up the weather."""
+        log.append(f"start {location}")
+        await asyncio.sleep(0.01)
+        return f"Sunny in {location}"
+
+    @agent_tool(args_schema=WeatherArgs)
+    async def book(location: str) -> str:
+        """Books a trip."""
+        log.append(f"book {location}")
+        return "Booked"
+
+    registry = ToolRegistry()
+    registry.register(lookup)
+    registry.register(book)
+    chunks = [
+        make_chunk(tool_calls=[make_call_delta(0, "c1", "lookup", '{"location": ')]),
+        make_chunk(tool_calls=[make_call_delta(0, arguments='"SF"}')]),
+        make_chunk(tool_calls=[make_call_delta(1, "c2", "book", '{"location": "SF"}')]),
+        make_chunk(content=None),
+    ]
+
+    async def stream_api(messages, tools):
+        for chunk in chunks:
+            yield chunk
+            await asyncio.sleep(0.02)
+        log.append("stream done")
+
+    agent = StandardPlannerAgent(api_key="test-key", speculative_tools=True)
+    agent._stream_openai_api = stream_api
+    events = [event async for event in agent.stream({"messages": []}, registry)]
+    assert log == ["start SF", "stream done", "book SF"]
+    assert agent.speculation_stats == {"started": 1, "used": 1, "discarded": 0}
+    _, lookup_result, book_result = events[-1].data["messages_to_add"]
+    assert lookup_result.content == "Sunny in SF"
+    assert book_result.content == "Booked"
+
+
+@pytest.mark.asyncio
+async def test_agent_discards_speculation_that_does_not_match(mock_tool_registry):
+    mock_tool_registry.is_side_effect_free.return_value = True
+    chunks = [
+        make_chunk(tool_calls=[make_call_delta(0, "c1", "get_weather", '{"a": 1}')]),
+        make_chunk(tool_calls=[make_call_delta(0, arguments=" ")]),
+    ]
+
+    async def stream_api(messages, tools):
+        for chunk in chunks:
+            yield chunk
+
+    agent = StandardPlannerAgent(api_key="test-key", speculative_tools=True)
+    agent._stream_openai_api = stream_api
+    events = [
+        event async for event in agent.stream({"messages": []}, mock_tool_registry)
+    ]
+    assert agent.speculation_stats == {"started": 1, "used": 0, "discarded": 1}
+    assert events[-1].data["messages_to_add"][1].content == "Sunny"
+    mock_tool_registry.execute_json.assert_awaited_with("get_weather", '{"a": 1} ')
+
+
+@pytest.mark.asyncio
+async def test_agents_coalesce_identical_requests(mock_tool_registry):
+    backend = FakeChatBackend([{"content": "Hi", "latency": 0.01}])
+    pool = backend.client_pool()
+    agents = [
+        StandardPlannerAgent(
+            api_key="test-key", client_pool=pool, coalesce_requests=True
         )
+        for _ in range(3)
+    ]
+    state = {"messages": [{"role": "user", "content": "Hello"}]}
+    results = await asyncio.gather(
+        *(agent.execute(state, mock_tool_registry) for agent in agents)
     )
-    mock_tool_registry.execute.side_effect = Exception("Tool failed")
-    state = {"messages": []}
-    result = await agent.execute(state, mock_tool_registry)
-    assert "Error executing tool" in result["messages_to_add"][1].content
+    assert backend.request_count == 1
+    assert [r["messages_to_add"][0].content for r in results] == ["Hi"] * 3
+    # Only the agent whose request went out reports its usage.
+    assert [bool(r["usage"]) for r in results].count(True) == 1
+    assert pool.single_flight("test-key").stats()["saved"] == 2
@@ -0,0 +1,132 @@
+# tests/test_cache.py
+import asyncio
+
+import pytest
+
+from janus.cache import SingleFlight, TTLCache, canonical_hash
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_canonical_hash_ignores_key_order():
+    first = canonical_hash({"a": 1, "b": [1, 2]})
+    assert first == canonical_hash({"b": [1, 2], "a": 1})
+    assert canonical_hash({"a": 1}) != canonical_hash({"a": 2})
+
+
+def test_lru_eviction_by_entries():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_eviction_by_bytes():
+    cache = TTLCache(max_entries=10, max_bytes=10)
+    cache.set("a", "12345")
+    cache.set("b", "12345")
+    cache.set("c", "123")
+    assert "a" not in cache
+    assert cache.stats()["bytes"] == 8
+    cache.set("d", "x" * 11)
+    assert "d" not in cache
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == (True, 1)
+    clock.now = 5
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_call():
+    flights = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "done"
+
+    results = await asyncio.gather(*(flights.do("k", work) for _ in range(4)))
+    assert [r for r, _ in results] == ["done"] * 4
+    assert [shared for _, shared in results] == [False, True, True, True]
+    assert len(calls) == 1
+    assert flights.stats() == {"leaders": 1, "saved": 3, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancelled_waiter_does_not_cancel_others():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return 42
+
+    first = asyncio.ensure_future(flights.do("k", work))
+    second = asyncio.ensure_future(flights.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await second == (42, True)
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancels_call_once_every_waiter_is_gone():
+    flights = SingleFlight()
+    started = asyncio.Event()
+    cancelled = []
+
+    async def work():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    waiter = asyncio.ensure_future(flights.do("k", work))
+    await started.wait()
+    waiter.cancel()
+    await asyncio.sleep(0.01)
+    assert cancelled == [True]
+
+    async def quick():
+        return "fresh"
+
+    # A new caller starts a new call rather than joining the abandoned one.
+    assert await flights.do("k", quick) == ("fresh", False)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_exceptions():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flights.do("k", fail), flights.do("k", fail), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(flights) == 0
@@ -0,0 +1,265 @@
+# tests/test_checkpoint.py
+import os
+from typing import Any, Dict
+
+import pytest
+from pydantic import BaseModel
+
+from janus.agent import BaseAgent
+from janus.checkpoint import Checkpoint, CheckpointDelta, FileCheckpointStore
+from janus.memory import InMemoryWorkingMemory, TokenWindowMemory
+from janus.models import ChatMessage, Role
+from janus.orchestrator import AsyncLocalOrchestrator
+from janus.tool import ToolRegistry, agent_tool
+
+
+class CountingAgent(BaseAgent):
+    """
+    Requests a tool on steps before ``answer_at`` and answers on that step.
+    Can be told to crash on a given call to simulate a process dying.
+    """
+
+    def __init__(self, answer_at: int = 3, crash_on_call: int = 0):
+        self.answer_at = answer_at
+        self.crash_on_call = crash_on_call
+        self.calls = 0
+
+    async def execute(self, state: Dict[str, Any], tools) -> Dict[str, Any]:
+        self.calls += 1
+        if self.calls == self.crash_on_call:
+            raise RuntimeError("Process died.")
+        step = sum(1 for m in state["messages"] if m["role"] == Role.ASSISTANT) + 1
+        if step == self.answer_at:
+            answer = ChatMessage(role=Role.ASSISTANT, content="Done")
+            return {"messages_to_add": [answer]}
+        call_id = f"call-{step}"
+        return {
+            "messages_to_add": [
+                ChatMessage(
+                    role=Role.ASSISTANT,
+                    tool_calls=[
+                        {"id": call_id, "function": {"name": "f", "arguments": "{}"}}
+                    ],
+                ),
+                ChatMessage(role=Role.TOOL, content=str(step), tool_call_id=call_id),
+            ],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 1},
+        }
+
+
+USER_STATE = {"messages": [{"role": "user", "content": "Go"}], "topic": "x"}
+
+
+@pytest.mark.asyncio
+async def test__store_folds_deltas_into_snapshots(tmp_path):
+    store = FileCheckpointStore(str(tmp_path), snapshot_every=2)
+    await store.start(Checkpoint(session_id="s1", max_steps=5, messages=[{"a": 0}]))
+    for step in range(1, 4):
+        await store.record(
+            "s1",
+            CheckpointDelta(
+                step=step, messages=[{"a": step}], usage={"prompt_tokens": 2}
+            ),
+        )
+    session_dir = os.path.join(str(tmp_path), "s1")
+    with open(os.path.join(session_dir, "deltas.jsonl")) as f:
+        assert len(f.readlines()) == 1  # steps 1-2 are in the snapshot
+
+    checkpoint = await FileCheckpointStore(str(tmp_path)).load("s1")
+    assert checkpoint.step == 3
+    assert checkpoint.messages == [{"a": 0}, {"a": 1}, {"a": 2}, {"a": 3}]
+    assert checkpoint.prompt_tokens == 6
+
+
+@pytest.mark.asyncio
+async def test__torn_delta_is_ignored(tmp_path):
+    store = FileCheckpointStore(str(tmp_path))
+    await store.start(Checkpoint(session_id="s1", max_steps=5))
+    await store.record("s1", CheckpointDelta(step=1, messages=[{"a": 1}]))
+    with open(os.path.join(str(tmp_path), "s1", "deltas.jsonl"), "a") as f:
+        f.write('{"step": 2, "mess')
+    checkpoint = await FileCheckpointStore(str(tmp_path)).load("s1")
+    assert checkpoint.step == 1
+    assert (await FileCheckpointStore(str(tmp_path)).load("s1")).step == 1
+
+
+@pytest.mark.asyncio
+async def test__resume_skips_completed_steps(tmp_path):
+    store = FileCheckpointStore(str(tmp_path))
+    agent = CountingAgent(crash_on_call=2)
+    orchestrator = AsyncLocalOrchestrator(
+        agent, ToolRegistry(), InMemoryWorkingMemory(), checkpoints=store
+    )
+    with pytest.raises(RuntimeError):
+        async for _ in orchestrator.run(USER_STATE, session_id="s1"):
+            pass
+
+    # A new process: fresh agent, memory and store over the same directory.
+    agent = CountingAgent()
+    memory = InMemoryWorkingMemory()
+    orchestrator = AsyncLocalOrchestrator(
+        agent, ToolRegistry(), memory, checkpoints=FileCheckpointStore(str(tmp_path))
+    )
+    states = [state async for state in orchestrator.resume("s1")]
+    assert agent.calls == 2  # step 1 was not redone
+    assert states[-1]["stop_reason"] == "converged"
+    assert states[-1]["progress"]["steps"] == 3
+    assert states[-1]["progress"]["prompt_tokens"] == 20
+    assert [m["content"] for m in states[-1]["messages"]] == [
+        "Go",
+        None,
+        "1",
+        None,
+        "2",
+        "Done",
+    ]
+
+    checkpoint = await orchestrator.checkpoints.load("s1")
+    assert checkpoint.stop_reason == "converged"
+    assert checkpoint.state == {"topic": "x"}
+    assert [state async for state in orchestrator.resume("s1")] == []
+
+
+@pytest.mark.asyncio
+async def test__streamed_runs_are_checkpointed(tmp_path):
+    store = FileCheckpointStore(str(tmp_path))
+    orchestrator = AsyncLocalOrchestrator(
+        CountingAgent(crash_on_call=2),
+        ToolRegistry(),
+        InMemoryWorkingMemory(),
+        checkpoints=store,
+    )
+    with pytest.raises(RuntimeError):
+        async for _ in orchestrator.run_stream(USER_STATE, session_id="s1"):
+            pass
+    checkpoint = await store.load("s1")
+    assert checkpoint.step == 1
+    assert [m["content"] for m in checkpoint.messages] == ["Go", None, "1"]
+
+    agent = CountingAgent()
+    orchestrator = AsyncLocalOrchestrator(
+        agent, ToolRegistry(), InMemoryWorkingMemory(), checkpoints=store
+    )
+    states = [state async for state in orchestrator.resume("s1")]
+    assert agent.calls == 2
+    assert states[-1]["stop_reason"] == "converged"
+
+
+@pytest.mark.asyncio
+async def test__resume_restores_the_token_window_summary(tmp_path):
+    store = FileCheckpointStore(str(tmp_path))
+    memory = TokenWindowMemory(max_tokens=60, summary_max_tokens=30)
+    for i in range(12):
+        await memory.add(ChatMessage(role=Role.USER, content=f"Earlier message {i}"))
+    orchestrator = AsyncLocalOrchestrator(
+        CountingAgent(crash_on_call=1), ToolRegistry(), memory, checkpoints=store
+    )
+    with pytest.raises(RuntimeError):
+        async for _ in orchestrator.run(USER_STATE, session_id="s1"):
+            pass
+    saved = (await store.load("s1")).messages
+    assert saved[0]["role"] == Role.SYSTEM
+
+    restored = TokenWindowMemory(max_tokens=60, summary_max_tokens=30)
+    await restored.restore(saved)
+    # The summary is restored as the summary, not as a window message.
+    assert restored.summary == memory.summary
+    assert restored.total_tokens == memory.total_tokens
+    assert (await restored.get_context())["messages"][0]["content"] == (
+        saved[0]["content"]
+    )
+
+
+@pytest.mark.asyncio
+async def test__resume_without_checkpoint_raises(tmp_path):
+    orchestrator = AsyncLocalOrchestrator(
+        CountingAgent(),
+        ToolRegistry(),
+        InMemoryWorkingMemory(),
+        checkpoints=FileCheckpointStore(str(tmp_path)),
+    )
+    with pytest.raises(ValueError):
+        async for _ in orchestrator.resume("missing"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test__session_ids_cannot_escape_or_collide(tmp_path):
+    root = tmp_path / "checkpoints"
+    store = FileCheckpointStore(str(root))
+    for session_id, message in (("a/b", {"a": 1}), ("a_b", {"a": 2})):
+        await store.start(
+            Checkpoint(session_id=session_id, max_steps=1, messages=[message])
+        )
+    await store.start(Checkpoint(session_id="..x", max_steps=1))
+    assert sorted(os.listdir(root)) == ["%2E%2Ex", "a%2Fb", "a_b"]
+    assert (await store.load("a/b")).messages == [{"a": 1}]
+    assert (await store.load("a_b")).messages == [{"a": 2}]
+    for session_id in (".", ".."):
+        with pytest.raises(ValueError):
+            await store.delete(session_id)
+    assert os.path.isdir(root)
+    assert len(os.listdir(root)) == 3
+
+
+class DeferringAgent(BaseAgent):
+    """
+    Requests a tool and leaves running it to the orchestrator's caller;
+    crashes on its second call.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, state: Dict[str, Any], tools) -> Dict[str, Any]:
+        self.calls += 1
+        if any(m["role"] == Role.TOOL for m in state["messages"]):
+            answer = ChatMessage(role=Role.ASSISTANT, content="Ok")
+            return {"messages_to_add": [answer]}
+        if self.calls == 2:
+            raise RuntimeError("Process died.")
+        call = {"id": "call-1", "function": {"name": "lookup", "arguments": "{}"}}
+        request = ChatMessage(role=Role.ASSISTANT, tool_calls=[call])
+        return {"messages_to_add": [request]}
+
+
+class NoArgs(BaseModel):
+    pass
+
+
+@pytest.mark.asyncio
+async def test__resume_runs_pending_tool_calls(tmp_path):
+    runs = []
+
+    async def lookup() -> str:
+        runs.append(1)
+        return "found"
+
+    tools = ToolRegistry()
+    tools.register(agent_tool(args_schema=NoArgs)(lookup))
+    orchestrator = AsyncLocalOrchestrator(
+        DeferringAgent(),
+        tools,
+        InMemoryWorkingMemory(),
+        checkpoints=FileCheckpointStore(str(tmp_path)),
+    )
+    with pytest.raises(RuntimeError):
+        async for _ in orchestrator.run(USER_STATE, session_id="s1"):
+            pass
+    checkpoint = await orchestrator.checkpoints.load("s1")
+    assert [c["id"] for c in checkpoint.pending_tool_calls] == ["call-1"]
+
+    # A new process resumes: the tool runs once, then the agent answers.
+    orchestrator = AsyncLocalOrchestrator(
+        DeferringAgent(),
+        tools,
+        InMemoryWorkingMemory(),
+        checkpoints=FileCheckpointStore(str(tmp_path)),
+    )
+    states = [state async for state in orchestrator.resume("s1")]
+    assert runs == [1]
+    contents = [m["content"] for m in states[-1]["messages"]]
+    assert contents == ["Go", None, "found", "Ok"]
+    checkpoint = await orchestrator.checkpoints.load("s1")
+    assert checkpoint.pending_tool_calls == []
+    assert [m["content"] for m in checkpoint.messages] == contents
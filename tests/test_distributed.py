@@ -0,0 +1,145 @@
+# tests/test_distributed.py
+import asyncio
+import multiprocessing
+from typing import Any, Dict
+
+import pytest
+
+from janus.agent import BaseAgent
+from janus.distributed import (
+    DistributedOrchestrator,
+    InProcessWorkQueue,
+    SocketWorkQueue,
+    SocketWorkQueueServer,
+    StepFailedError,
+    Worker,
+)
+from janus.memory import InMemoryWorkingMemory
+from janus.models import ChatMessage, Role
+from janus.sqlite_memory import SQLiteMemoryStore
+from janus.tool import ToolRegistry
+
+
+class LookupAgent(BaseAgent):
+    """
+    Calls a tool on the first step of each user turn, then answers.
+    """
+
+    async def execute(self, state: Dict[str, Any], tools) -> Dict[str, Any]:
+        last = state["messages"][-1]
+        if last["role"] == Role.USER:
+            return {
+                "messages_to_add": [
+                    ChatMessage(
+                        role=Role.ASSISTANT,
+                        tool_calls=[
+                            {"id": "1", "function": {"name": "f", "arguments": "{}"}}
+                        ],
+                    ),
+                    ChatMessage(role=Role.TOOL, content="42", tool_call_id="1"),
+                ],
+                "usage": {"prompt_tokens": 5, "completion_tokens": 5},
+            }
+        if last["role"] == Role.TOOL:
+            return {
+                "messages_to_add": [
+                    ChatMessage(role=Role.ASSISTANT, content=f"It is {last['content']}")
+                ]
+            }
+        raise RuntimeError("Nothing to answer.")
+
+
+@pytest.fixture
+def memories():
+    sessions: Dict[str, InMemoryWorkingMemory] = {}
+    return lambda session_id: sessions.setdefault(
+        session_id, InMemoryWorkingMemory()
+    )
+
+
+async def start_workers(queue, memory_for, count: int = 2):
+    workers = [
+        Worker(queue, LookupAgent(), ToolRegistry(), memory_for) for _ in range(count)
+    ]
+    return workers, [asyncio.ensure_future(w.run()) for w in workers]
+
+
+async def test__session_runs_on_in_process_workers(memories):
+    queue = InProcessWorkQueue()
+    workers, tasks = await start_workers(queue, memories)
+    orchestrator = DistributedOrchestrator(queue, memories, step_timeout=5)
+    user = {"messages": [{"role": "user", "content": "?"}]}
+    try:
+        states = [s async for s in orchestrator.run("s1", user)]
+        assert len(states) == 2
+        assert states[-1]["stop_reason"] == "converged"
+        assert states[-1]["progress"]["total_tokens"] == 10
+        assert states[-1]["messages"][-1]["content"] == "It is 42"
+
+        # Resume the same session later, through a new coordinator.
+        await orchestrator.aclose()
+        resumed = DistributedOrchestrator(queue, memories, step_timeout=5)
+        states = [s async for s in resumed.run("s1", user)]
+        assert len(states[-1]["messages"]) == 8
+        assert sum(w.completed for w in workers) == 4
+        await resumed.aclose()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await orchestrator.aclose()
+
+
+async def test__worker_failure_is_reported(memories):
+    queue = InProcessWorkQueue()
+    workers, tasks = await start_workers(queue, memories, count=1)
+    orchestrator = DistributedOrchestrator(queue, memories, step_timeout=5)
+    await memories("s1").add(ChatMessage(role=Role.ASSISTANT, content="Done"))
+    try:
+        with pytest.raises(StepFailedError):
+            async for _ in orchestrator.run("s1", {}):
+                pass
+        assert workers[0].failed == 1
+    finally:
+        tasks[0].cancel()
+        await orchestrator.aclose()
+
+
+def run_socket_worker(port: int, db_path: str, steps: int):
+    async def main():
+        store = SQLiteMemoryStore(db_path)
+        queue = SocketWorkQueue("127.0.0.1", port)
+        worker = Worker(queue, LookupAgent(), ToolRegistry(), store.session)
+        for _ in range(steps):
+            await worker.run_once()
+        await queue.close()
+        await store.close()
+
+    asyncio.run(main())
+
+
+async def test__session_runs_on_worker_process(tmp_path):
+    db_path = str(tmp_path / "memory.db")
+    server = SocketWorkQueueServer()
+    await server.start()
+    process = multiprocessing.get_context("spawn").Process(
+        target=run_socket_worker, args=(server.port, db_path, 2)
+    )
+    process.start()
+    store = SQLiteMemoryStore(db_path)
+    orchestrator = DistributedOrchestrator(server, store.session, step_timeout=30)
+    try:
+        user = {"messages": [{"role": "user", "content": "?"}]}
+        states = [s async for s in orchestrator.run("remote", user)]
+        assert states[-1]["stop_reason"] == "converged"
+        assert [m["role"] for m in states[-1]["messages"]] == [
+            "user",
+            "assistant",
+            "tool",
+            "assistant",
+        ]
+    finally:
+        await orchestrator.aclose()
+        await asyncio.get_running_loop().run_in_executor(None, process.join, 30)
+        await server.close()
+        await store.close()
+    assert process.exitcode == 0
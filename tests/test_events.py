@@ -0,0 +1,104 @@
+# tests/test_events.py
+import json
+import logging
+import threading
+
+from janus import events
+from janus.events import (
+    EventPipeline,
+    JSONLinesSink,
+    PipelineHandler,
+    RingBufferSink,
+)
+from janus.memory import InMemoryWorkingMemory
+from janus.models import ChatMessage, Role
+
+
+def test_payloads_are_rendered_off_the_emitting_thread():
+    sink = RingBufferSink()
+    pipeline = EventPipeline([sink], batch_size=1, flush_interval=0.01)
+    rendered_on = []
+
+    def payload():
+        rendered_on.append(threading.current_thread().name)
+        return {"size": 3}
+
+    pipeline.start()
+    pipeline.emit("custom", payload)
+    pipeline.close()
+    assert rendered_on == ["janus-events"]
+    assert sink.events()[0]["payload"] == {"size": 3}
+    assert pipeline.stats()["flushed"] == 1
+
+
+def test_full_buffer_drops_oldest_and_sampling_thins_events():
+    sink = RingBufferSink()
+    pipeline = EventPipeline(
+        [sink], capacity=3, sample_rates={"noisy": 0.25, "muted": 0}
+    )
+    for i in range(8):
+        pipeline.emit("noisy", i)
+    pipeline.emit("muted", "never")
+    for i in range(3):
+        pipeline.emit("other", i)
+    pipeline.flush()
+    assert [e["payload"] for e in sink.events()] == [0, 1, 2]
+    stats = pipeline.stats()
+    assert stats["sampled_out"] == 7
+    assert stats["dropped"] == 2
+    assert stats["pending"] == 0
+
+
+def test_log_arguments_are_captured_when_the_record_is_queued(tmp_path):
+    path = tmp_path / "events.jsonl"
+    pipeline = EventPipeline([JSONLinesSink(str(path))])
+    handler = PipelineHandler(pipeline)
+    log = logging.getLogger("janus.test_events")
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    payload = {"value": 1}
+    try:
+        log.info("Payload: %s", payload)
+        payload["value"] = 2
+    finally:
+        log.removeHandler(handler)
+    pipeline.close()
+    (line,) = [json.loads(line) for line in path.read_text().splitlines()]
+    assert line["name"] == "janus.test_events"
+    assert line["level"] == "INFO"
+    # The arguments were merged before the payload changed.
+    assert line["payload"] == "Payload: {'value': 1}"
+
+
+def test_sampling_counts_every_event_across_threads():
+    pipeline = EventPipeline([RingBufferSink()], sample_rates={"tick": 0.5})
+
+    def emit_ticks():
+        for _ in range(1000):
+            pipeline.emit("tick")
+
+    threads = [threading.Thread(target=emit_ticks) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = pipeline.stats()
+    assert stats["emitted"] == 2000
+    assert stats["sampled_out"] == 2000
+    pipeline.close()
+
+
+async def test_memory_events_go_through_the_installed_pipeline():
+    sink = RingBufferSink()
+    pipeline = EventPipeline([sink])
+    events.set_pipeline(pipeline)
+    try:
+        memory = InMemoryWorkingMemory()
+        await memory.add(ChatMessage(role=Role.USER, content="hi"))
+    finally:
+        events.set_pipeline(None)
+    pipeline.flush()
+    (event,) = sink.events()
+    assert event["name"] == "memory.add"
+    assert event["payload"]["content"] == "hi"
+    assert not events.emit("memory.add", {})
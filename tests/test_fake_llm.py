@@ -0,0 +1,86 @@
+# tests/test_fake_llm.py
+import pytest
+
+from janus.agent import StandardPlannerAgent
+from janus.fake_llm import FakeChatBackend, FakeTurn
+from janus.memory import InMemoryWorkingMemory
+from janus.models import EventType, WeatherArgs
+from janus.orchestrator import AsyncLocalOrchestrator
+from janus.tool import ToolRegistry, agent_tool
+
+SCRIPT = [
+    {"tool_calls": [{"name": "get_weather", "arguments": {"location": "SF"}}]},
+    {"content": "It is sunny in San Francisco today."},
+]
+
+
+@pytest.fixture
+def tools():
+    @agent_tool(args_schema=WeatherArgs)
+    async def get_weather(location: str) -> str:
+        """Gets the weather."""
+        return f"Sunny in {location}"
+
+    registry = ToolRegistry()
+    registry.register(get_weather)
+    return registry
+
+
+def make_orchestrator(backend: FakeChatBackend, tools: ToolRegistry):
+    agent = StandardPlannerAgent(api_key="fake", client_pool=backend.client_pool())
+    return AsyncLocalOrchestrator(agent, tools, InMemoryWorkingMemory())
+
+
+async def test_agent_runs_a_scripted_conversation(tools):
+    backend = FakeChatBackend(SCRIPT)
+    user = {"messages": [{"role": "user", "content": "Weather?"}]}
+    runs = []
+    for _ in range(2):
+        orchestrator = make_orchestrator(backend, tools)
+        runs.append([s async for s in orchestrator.run(user)])
+    final = runs[0][-1]
+    assert final["stop_reason"] == "converged"
+    assert [m["content"] for m in final["messages"][-2:]] == [
+        "Sunny in SF",
+        "It is sunny in San Francisco today.",
+    ]
+    assert final["progress"]["total_tokens"] > 0
+    # The same script gives the same run, token counts included.
+    for first, second in zip(runs[0], runs[1]):
+        assert first["messages"] == second["messages"]
+    assert runs[1][-1]["progress"]["total_tokens"] == final["progress"]["total_tokens"]
+    assert backend.request_count == len(backend.requests) == 4
+
+
+async def test_recorded_requests_are_capped(tools):
+    backend = FakeChatBackend(SCRIPT, record_requests=1)
+    user = {"messages": [{"role": "user", "content": "Weather?"}]}
+    async for _ in make_orchestrator(backend, tools).run(user):
+        pass
+    assert backend.request_count == 2
+    assert len(backend.requests) == 1
+    assert backend.requests[0]["messages"][-1]["role"] == "tool"
+
+
+async def test_agent_streams_from_the_fake_backend(tools):
+    backend = FakeChatBackend(SCRIPT, stream_chunk_chars=4)
+    orchestrator = make_orchestrator(backend, tools)
+    user = {"messages": [{"role": "user", "content": "Weather?"}]}
+    events = [e async for e in orchestrator.run_stream(user)]
+    tokens = "".join(e.data["delta"] for e in events if e.type == EventType.TOKEN)
+    assert tokens == "It is sunny in San Francisco today."
+    started = [e for e in events if e.type == EventType.TOOL_CALL_STARTED]
+    assert [e.data["name"] for e in started] == ["get_weather"]
+    assert events[-1].data["state"]["stop_reason"] == "converged"
+
+
+async def test_responder_and_turn_latency():
+    backend = FakeChatBackend(
+        responder=lambda messages, tools: FakeTurn(
+            content=str(len(messages)), latency=0.01
+        )
+    )
+    reply = backend.reply({"messages": [{"role": "user", "content": "hi"}]})
+    assert reply == {"role": "assistant", "content": "1"}
+    with pytest.raises(ValueError):
+        FakeChatBackend()
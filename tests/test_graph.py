@@ -0,0 +1,177 @@
+# tests/test_graph.py
+import asyncio
+import gc
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from janus.agent import BaseAgent
+from janus.graph import END, AgentGraph, GraphError, GraphRecursionError, MessageChain
+from janus.memory import InMemoryWorkingMemory
+from janus.models import ChatMessage, Role
+from janus.orchestrator import AsyncLocalOrchestrator
+from janus.tool import ToolRegistry
+
+
+class EchoAgent(BaseAgent):
+    """
+    Answers with its name and records the messages it was shown.
+    """
+
+    def __init__(self, name: str, delay: float = 0.0):
+        self.name = name
+        self.delay = delay
+        self.seen: List[List[str]] = []
+
+    async def execute(self, state: Dict[str, Any], tools) -> Dict[str, Any]:
+        self.seen.append([m["content"] for m in state["messages"]])
+        await asyncio.sleep(self.delay)
+        return {
+            "messages_to_add": [ChatMessage(role=Role.ASSISTANT, content=self.name)],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1},
+        }
+
+
+USER_STATE = {"messages": [{"role": "user", "content": "hi"}]}
+
+
+@pytest.mark.asyncio
+async def test__fan_out_runs_concurrently_and_joins():
+    agents = {name: EchoAgent(name, delay=0.05) for name in ("a", "b")}
+    agents["plan"] = EchoAgent("plan")
+    agents["merge"] = EchoAgent("merge")
+    graph = AgentGraph()
+    for name, agent in agents.items():
+        graph.add_node(name, agent)
+    graph.set_entry("plan")
+    graph.add_edge("plan", "a").add_edge("plan", "b")
+    graph.add_edge(("a", "b"), "merge")
+    graph.add_edge("merge", END)
+
+    started = time.monotonic()
+    output = await graph.execute(USER_STATE, ToolRegistry())
+    assert time.monotonic() - started < 0.09
+
+    assert agents["merge"].seen == [["hi", "plan", "a", "b"]]
+    contents = [m.content for m in output["messages_to_add"]]
+    assert contents[0] == "plan" and contents[-1] == "merge"
+    assert contents[1:3] == ["a", "b"]
+    assert output["usage"] == {"prompt_tokens": 4, "completion_tokens": 4}
+
+
+@pytest.mark.asyncio
+async def test__branches_merge_in_declaration_order():
+    graph = AgentGraph()
+    # "slow" is declared first but finishes last, and so does its child.
+    graph.add_node("slow", EchoAgent("slow", delay=0.03))
+    graph.add_node("fast", EchoAgent("fast"))
+    graph.add_node("after_slow", EchoAgent("after_slow"))
+    graph.add_node("after_fast", EchoAgent("after_fast", delay=0.05))
+    graph.set_entry("slow", "fast")
+    graph.add_edge("slow", "after_slow").add_edge("fast", "after_fast")
+    output = await graph.execute(USER_STATE, ToolRegistry())
+    contents = [m.content for m in output["messages_to_add"]]
+    assert contents == ["slow", "after_slow", "fast", "after_fast"]
+
+
+@pytest.mark.asyncio
+async def test__conditional_edges_loop_until_end():
+    writer, critic = EchoAgent("draft"), EchoAgent("critique")
+    graph = AgentGraph().add_node("writer", writer).add_node("critic", critic)
+    graph.set_entry("writer")
+    graph.add_edge("writer", "critic")
+    graph.add_conditional_edges(
+        "critic",
+        lambda state: END if len(state["messages"]) >= 5 else "writer",
+    )
+    output = await graph.execute(USER_STATE, ToolRegistry())
+    assert [m.content for m in output["messages_to_add"]] == [
+        "draft",
+        "critique",
+        "draft",
+        "critique",
+    ]
+    assert writer.seen[1] == ["hi", "draft", "critique"]
+
+
+@pytest.mark.asyncio
+async def test__runaway_cycle_and_bad_routes_raise():
+    graph = AgentGraph(max_node_runs=3).add_node("a", EchoAgent("a"))
+    graph.set_entry("a")
+    graph.add_conditional_edges("a", lambda state: "a")
+    with pytest.raises(GraphRecursionError):
+        await graph.execute(USER_STATE, ToolRegistry())
+
+    graph = AgentGraph().add_node("a", EchoAgent("a"))
+    graph.set_entry("a")
+    graph.add_conditional_edges("a", lambda state: "missing")
+    with pytest.raises(GraphError):
+        await graph.execute(USER_STATE, ToolRegistry())
+    with pytest.raises(GraphError):
+        graph.add_edge("a", "missing")
+
+
+class FailingAgent(BaseAgent):
+    def __init__(self, name: str):
+        self.name = name
+
+    async def execute(self, state: Dict[str, Any], tools) -> Dict[str, Any]:
+        raise RuntimeError(self.name)
+
+
+class SlowAgent(BaseAgent):
+    def __init__(self):
+        self.cancelled = False
+
+    async def execute(self, state: Dict[str, Any], tools) -> Dict[str, Any]:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {}
+
+
+@pytest.mark.asyncio
+async def test__failed_branch_cancels_siblings_and_retrieves_every_error():
+    unretrieved = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda loop, context: unretrieved.append(context))
+    slow = SlowAgent()
+    graph = AgentGraph()
+    graph.add_node("first", FailingAgent("first"))
+    graph.add_node("second", FailingAgent("second"))
+    graph.add_node("slow", slow)
+    graph.set_entry("first", "second", "slow")
+    with pytest.raises(RuntimeError, match="first"):
+        await graph.execute(USER_STATE, ToolRegistry())
+    # The sibling was cancelled and awaited before the error propagated.
+    assert slow.cancelled
+    gc.collect()
+    assert unretrieved == []
+    loop.set_exception_handler(None)
+
+
+@pytest.mark.asyncio
+async def test__graph_runs_behind_orchestrator():
+    graph = AgentGraph()
+    graph.add_node("a", EchoAgent("a")).add_node("b", EchoAgent("b"))
+    graph.set_entry("a", "b")
+    memory = InMemoryWorkingMemory()
+    orchestrator = AsyncLocalOrchestrator(
+        agent=graph, tools=ToolRegistry(), memory=memory
+    )
+    states = [state async for state in orchestrator.run(USER_STATE)]
+    assert len(states) == 1
+    assert states[-1]["stop_reason"] == "converged"
+    assert sorted(m["content"] for m in states[-1]["messages"][1:]) == ["a", "b"]
+
+
+def test__message_chain_shares_segments():
+    base = [{"content": "a"}, {"content": "b"}]
+    view = MessageChain((base, (), ({"content": "c"},)))
+    assert len(view) == 3
+    assert view[2] == {"content": "c"} and view[-3] is base[0]
+    assert view == [{"content": "a"}, {"content": "b"}, {"content": "c"}]
+    assert [{"content": "s"}] + view == [{"content": "s"}, *view]
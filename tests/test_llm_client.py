@@ -0,0 +1,89 @@
+# tests/test_llm_client.py
+from unittest.mock import MagicMock
+
+import pytest
+
+from janus.llm_client import (
+    LLMClientPool,
+    RateLimiter,
+    TokenBucket,
+    parse_reset_duration,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fake_sleep(monkeypatch, clock):
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+        clock.now += delay
+
+    monkeypatch.setattr("janus.llm_client.asyncio.sleep", sleep)
+    return sleeps
+
+
+def test_parse_reset_duration():
+    assert parse_reset_duration("1s") == 1
+    assert parse_reset_duration("6m0s") == 360
+    assert parse_reset_duration("20ms") == pytest.approx(0.02)
+    assert parse_reset_duration("1.5") == 1.5
+    assert parse_reset_duration("soon") is None
+
+
+def test_token_bucket_refills_over_time(clock):
+    bucket = TokenBucket(rate_per_minute=60, clock=clock)
+    bucket.consume(60)
+    assert bucket.delay_for(1) == pytest.approx(1.0)
+    clock.now = 30
+    assert bucket.delay_for(30) == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_throttles_requests(clock, fake_sleep):
+    limiter = RateLimiter(requests_per_minute=2, clock=clock)
+    await limiter.acquire()
+    await limiter.acquire()
+    assert fake_sleep == []
+    await limiter.acquire()
+    assert sum(fake_sleep) == pytest.approx(30.0)
+    assert limiter.stats()["throttled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_adapts_to_headers(clock, fake_sleep):
+    limiter = RateLimiter(clock=clock)
+    await limiter.acquire(estimated_tokens=100)
+    limiter.update_from_headers(
+        {
+            "x-ratelimit-limit-tokens": "1000",
+            "x-ratelimit-remaining-tokens": "0",
+            "x-ratelimit-reset-tokens": "2s",
+        }
+    )
+    await limiter.acquire(estimated_tokens=10)
+    assert sum(fake_sleep) >= 2.0
+
+
+@pytest.mark.asyncio
+async def test_client_pool_reuses_clients():
+    factory = MagicMock(side_effect=lambda **kwargs: object())
+    pool = LLMClientPool(client_factory=factory)
+    first = pool.client("key")
+    assert pool.client("key") is first
+    assert pool.client("other") is not first
+    assert pool.rate_limiter("key") is pool.rate_limiter("key")
+    assert factory.call_count == 2
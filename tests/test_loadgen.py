@@ -0,0 +1,60 @@
+# tests/test_loadgen.py
+import pytest
+from openai import AsyncOpenAI, InternalServerError
+
+from janus.loadgen import run_load
+from janus.mock_server import MockChatServer
+
+
+async def test_load_run_reports_throughput_and_latency():
+    report = await run_load(sessions=20, turns=2, latency=0.01, tokens_per_second=2000)
+    assert report.completed_sessions == 20
+    assert report.failed_sessions == 0
+    # Two turns of a tool call and an answer each.
+    assert report.steps == 80
+    assert report.server == {"requests": 80, "completed": 80, "errors": 0}
+    assert report.steps_per_second > 0
+    assert 0 < report.step_latency["p50"] <= report.step_latency["p99"]
+    assert report.loop_lag["p50"] is not None
+
+
+async def test_injected_errors_are_retried():
+    report = await run_load(sessions=10, latency=0.0, error_rate=0.2, retries=8, seed=1)
+    assert report.failed_sessions == 0
+    assert report.server["errors"] > 0
+    assert report.server["requests"] == 20 + report.server["errors"]
+
+
+async def test_mock_server_streams_content_and_usage():
+    async with MockChatServer(tokens_per_second=1000) as server:
+        client = AsyncOpenAI(api_key="k", base_url=server.base_url, max_retries=0)
+        stream = await client.chat.completions.create(
+            model="m",
+            stream=True,
+            stream_options={"include_usage": True},
+            messages=[{"role": "user", "content": "hello there"}],
+        )
+        chunks = [chunk async for chunk in stream]
+        await client.close()
+    content = "".join(
+        choice.delta.content or "" for chunk in chunks for choice in chunk.choices
+    )
+    assert "hello there" in content
+    # Content arrives over several chunks, then a usage-only chunk.
+    assert len(chunks) > 3
+    assert chunks[-1].usage.completion_tokens > 0
+
+
+async def test_mock_server_answers_500_when_the_reply_fails():
+    def reply(request):
+        raise KeyError("no scripted turn")
+
+    async with MockChatServer(reply=reply) as server:
+        client = AsyncOpenAI(api_key="k", base_url=server.base_url, max_retries=0)
+        with pytest.raises(InternalServerError):
+            await client.chat.completions.create(
+                model="m", messages=[{"role": "user", "content": "hi"}]
+            )
+        await client.close()
+    assert server.errors == 1
+    assert server.completed == 0
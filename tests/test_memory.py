@@ -1,8 +1,10 @@
 # tests/test_memory.py
+from unittest.mock import patch
+
 import pytest
 from pydantic import BaseModel
 
-from janus.memory import InMemoryWorkingMemory
+from janus.memory import InMemoryWorkingMemory, TokenWindowMemory
 from janus.models import ChatMessage, Role
 
 
@@ -36,3 +38,93 @@ async def test_get_context(memory: InMemoryWorkingMemory):
             entry2.model_dump(),
         ]
     }
+
+
+@pytest.mark.asyncio
+async def test_get_context_is_a_snapshot(memory: InMemoryWorkingMemory):
+    await memory.add(ChatMessage(role=Role.USER, content="test1"))
+    context = await memory.get_context()
+    await memory.add(ChatMessage(role=Role.ASSISTANT, content="test2"))
+    assert len(context["messages"]) == 1
+    assert len((await memory.get_context())["messages"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_entries_are_serialized_once(memory: InMemoryWorkingMemory):
+    entry = ChatMessage(role=Role.USER, content="test")
+    await memory.add(entry)
+    with patch.object(ChatMessage, "model_dump", side_effect=AssertionError):
+        await memory.get_context()
+        await memory.get_context()
+
+
+@pytest.mark.asyncio
+async def test_direct_appends_are_picked_up(memory: InMemoryWorkingMemory):
+    entry = ChatMessage(role=Role.USER, content="test")
+    memory.entries.append(entry)
+    context = await memory.get_context()
+    assert context["messages"] == [entry.model_dump()]
+
+
+def count_words(message):
+    return len((message.get("content") or "").split()) + (
+        5 if message.get("tool_calls") else 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_token_window_keeps_newest_turns_within_budget():
+    memory = TokenWindowMemory(
+        max_tokens=10, token_counter=count_words, summarize=False
+    )
+    for i in range(6):
+        await memory.add(ChatMessage(role=Role.USER, content=f"turn {i} a b"))
+    context = await memory.get_context()
+    assert [m["content"] for m in context["messages"]] == ["turn 4 a b", "turn 5 a b"]
+    assert memory.total_tokens == 8
+
+
+@pytest.mark.asyncio
+async def test_token_window_never_splits_tool_results():
+    memory = TokenWindowMemory(
+        max_tokens=11, token_counter=count_words, summarize=False
+    )
+    await memory.add(ChatMessage(role=Role.USER, content="one two three four"))
+    await memory.add(
+        ChatMessage(
+            role=Role.ASSISTANT,
+            tool_calls=[{"id": "1", "function": {"name": "get_weather"}}],
+        )
+    )
+    await memory.add(ChatMessage(role=Role.TOOL, content="sunny"))
+    await memory.add(ChatMessage(role=Role.TOOL, content="cloudy"))
+    await memory.add(ChatMessage(role=Role.ASSISTANT, content="done"))
+    roles = [m["role"] for m in (await memory.get_context())["messages"]]
+    assert roles == [Role.ASSISTANT, Role.TOOL, Role.TOOL, Role.ASSISTANT]
+    await memory.add(ChatMessage(role=Role.USER, content="a b c d e"))
+    roles = [m["role"] for m in (await memory.get_context())["messages"]]
+    assert roles == [Role.ASSISTANT, Role.USER]
+
+
+@pytest.mark.asyncio
+async def test_token_window_folds_evicted_turns_into_summary():
+    calls = []
+
+    async def summarizer(previous, messages):
+        calls.append(len(messages))
+        return (previous or "") + "".join(m["content"][0] for m in messages)
+
+    memory = TokenWindowMemory(
+        max_tokens=20,
+        summary_max_tokens=10,
+        token_counter=count_words,
+        summarizer=summarizer,
+    )
+    for word in ["alpha", "beta", "gamma", "delta"]:
+        await memory.add(ChatMessage(role=Role.USER, content=f"{word} x x x x x"))
+    messages = (await memory.get_context())["messages"]
+    assert messages[0]["role"] == Role.SYSTEM
+    assert messages[0]["content"].endswith("ab")
+    assert [m["content"][:5] for m in messages[1:]] == ["gamma", "delta"]
+    assert memory.total_tokens <= 20
+    assert calls == [1, 1]
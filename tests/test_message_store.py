@@ -0,0 +1,68 @@
+# tests/test_message_store.py
+from unittest.mock import patch
+
+import pytest
+
+from janus.agent import StandardPlannerAgent
+from janus.message_store import CompactWorkingMemory, MessageStore
+from janus.models import ChatMessage, Role
+
+TOOL_CALL = {
+    "id": "1",
+    "type": "function",
+    "function": {"name": "f", "arguments": "{}"},
+}
+
+
+def test__messages_are_stored_in_wire_format():
+    store = MessageStore()
+    store.append(ChatMessage(role=Role.USER, content="ok"))
+    store.append(ChatMessage(role=Role.ASSISTANT, tool_calls=[TOOL_CALL]))
+    store.append({"role": "tool", "content": "".join(["o", "k"]), "tool_call_id": "1"})
+    assert list(store.wire()) == [
+        {"role": "user", "content": "ok"},
+        {"role": "assistant", "content": None, "tool_calls": [TOOL_CALL]},
+        {"role": "tool", "content": "ok", "tool_call_id": "1"},
+    ]
+    # Repeated short contents share one string object.
+    assert store.wire()[0]["content"] is store.wire()[2]["content"]
+    assert store.role(1) == Role.ASSISTANT
+    assert store.count(Role.TOOL) == 1
+    assert store.tool_call_positions() == [1]
+    with pytest.raises(ValueError):
+        store.append("not a message")
+
+
+def test__wire_views_are_snapshots_of_dicts_built_once():
+    store = MessageStore()
+    store.extend(ChatMessage(role=Role.USER, content=str(i)) for i in range(3))
+    view = store.wire()
+    store.append(ChatMessage(role=Role.ASSISTANT, content="3"))
+    assert len(view) == 3 and len(store.wire()) == 4
+    assert [m["content"] for m in view[1:]] == ["1", "2"]
+    assert view[-1] == {"role": "user", "content": "2"}
+    # Reading the history again hands out the same dicts, not new ones.
+    assert all(a is b for a, b in zip(view, store.wire()))
+    assert store.message(3) is store.wire()[3]
+    with pytest.raises(IndexError):
+        view[3]
+
+
+@pytest.mark.asyncio
+async def test__compact_memory_never_dumps_models():
+    memory = CompactWorkingMemory()
+    with patch.object(ChatMessage, "model_dump", side_effect=AssertionError):
+        await memory.add(ChatMessage(role=Role.USER, content="hi"))
+        context = await memory.get_context()
+        await memory.add(ChatMessage(role=Role.ASSISTANT, content="hello"))
+    assert context["messages"] == [{"role": "user", "content": "hi"}]
+    assert len((await memory.get_context())["messages"]) == 2
+
+
+def test__system_prompt_is_serialized_once():
+    agent = StandardPlannerAgent(api_key="test-key", system_prompt="Be brief.")
+    wire = agent._system_message()
+    assert wire == {"role": "system", "content": "Be brief."}
+    assert agent._system_message() is wire
+    agent.system_prompt = ChatMessage(role=Role.SYSTEM, content="Be kind.")
+    assert agent._system_message()["content"] == "Be kind."
@@ -4,7 +4,8 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from janus.orchestrator import AsyncLocalOrchestrator
-from janus.models import ChatMessage, Role
+from janus.models import AgentEvent, ChatMessage, EventType, Role
+from janus.termination import TokenBudget
 
 
 @pytest.fixture
@@ -51,6 +52,89 @@ async def test_orchestrator_run(
     async for state in orchestrator.run(initial_state, max_steps=2):
         final_state = state
 
-    assert mock_agent.execute.call_count == 2
-    assert mock_memory.add.call_count == 3  # 1 initial + 2 new
+    # The assistant answered without tool calls, so the run converged.
+    assert mock_agent.execute.call_count == 1
+    assert mock_memory.add.call_count == 2  # 1 initial + 1 new
     assert "messages" in final_state
+    assert final_state["stop_reason"] == "converged"
+    assert final_state["progress"]["steps"] == 1
+
+
+def tool_call_output(prompt_tokens: int = 0, completion_tokens: int = 0):
+    return {
+        "messages_to_add": [
+            ChatMessage(
+                role=Role.ASSISTANT,
+                tool_calls=[{"id": "1", "function": {"name": "f", "arguments": "{}"}}],
+            ),
+            ChatMessage(role=Role.TOOL, content="Result", tool_call_id="1"),
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_stops_at_max_steps_while_tools_pending(
+    orchestrator: AsyncLocalOrchestrator, mock_agent
+):
+    mock_agent.execute.return_value = tool_call_output()
+    states = [state async for state in orchestrator.run({}, max_steps=3)]
+    assert mock_agent.execute.call_count == 3
+    assert "stop_reason" not in states[0]
+    assert states[-1]["stop_reason"] == "max_steps"
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_with_zero_max_steps_runs_no_steps(
+    orchestrator: AsyncLocalOrchestrator, mock_agent, mock_memory
+):
+    initial_state = {"messages": [{"role": "user", "content": "Hello"}]}
+    assert [state async for state in orchestrator.run(initial_state, 0)] == []
+    assert [event async for event in orchestrator.run_stream({}, 0)] == []
+    assert mock_agent.execute.call_count == 0
+    assert mock_memory.add.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_token_budget(
+    orchestrator: AsyncLocalOrchestrator, mock_agent
+):
+    mock_agent.execute.return_value = tool_call_output(80, 20)
+    states = [
+        state
+        async for state in orchestrator.run(
+            {}, max_steps=10, termination=TokenBudget(250)
+        )
+    ]
+    assert len(states) == 3
+    assert states[-1]["stop_reason"] == "token_budget"
+    assert states[-1]["progress"]["total_tokens"] == 300
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_run_stream(
+    orchestrator: AsyncLocalOrchestrator, mock_agent, mock_memory
+):
+    async def stream(state, tools):
+        yield AgentEvent(type=EventType.TOKEN, data={"delta": "Test"})
+        yield AgentEvent(
+            type=EventType.STEP_DONE,
+            data={
+                "messages_to_add": [
+                    ChatMessage(role=Role.ASSISTANT, content="Test response")
+                ]
+            },
+        )
+
+    mock_agent.stream = stream
+    events = [event async for event in orchestrator.run_stream({}, max_steps=2)]
+    assert [(event.type, event.step) for event in events] == [
+        (EventType.TOKEN, 1),
+        (EventType.STEP_DONE, 1),
+    ]
+    assert mock_memory.add.call_count == 1
+    assert "messages" in events[-1].data["state"]
+    assert events[-1].data["state"]["stop_reason"] == "converged"
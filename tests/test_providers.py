@@ -0,0 +1,73 @@
+# tests/test_providers.py
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+
+import janus
+from janus import providers
+from janus.agent import StandardPlannerAgent
+from janus.fake_llm import FakeChatBackend
+from janus.llm_client import LLMClientPool
+from janus.memory import InMemoryWorkingMemory
+from janus.orchestrator import AsyncLocalOrchestrator
+from janus.providers import UnknownProviderError, get_provider, register_provider
+from janus.tool import ToolRegistry
+
+
+@pytest.fixture(autouse=True)
+def restore_registry(monkeypatch):
+    monkeypatch.setattr(providers, "_providers", dict(providers._providers))
+    monkeypatch.setattr(providers, "_factories", dict(providers._factories))
+
+
+def test_importing_janus_does_not_load_provider_sdks():
+    src = os.path.dirname(os.path.dirname(os.path.abspath(janus.__file__)))
+    code = (
+        "import importlib, pkgutil, sys\n"
+        "import janus\n"
+        "for info in pkgutil.walk_packages(janus.__path__, 'janus.'):\n"
+        "    importlib.import_module(info.name)\n"
+        "print('openai' in sys.modules)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([src, *sys.path])}
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+    assert result.stdout.strip() == "False", result.stderr
+
+
+def test_lazy_providers_resolve_on_first_use():
+    register_provider("namespace", "types:SimpleNamespace")
+    assert get_provider("namespace") is types.SimpleNamespace
+    register_provider("missing", "janus_missing_sdk:Client")
+    with pytest.raises(ImportError, match="janus_missing_sdk"):
+        get_provider("missing")
+    with pytest.raises(UnknownProviderError, match="namespace, openai"):
+        get_provider("nope")
+    with pytest.raises(ValueError):
+        register_provider("bad", "no_attribute")
+
+
+async def test_agents_select_providers_from_one_pool():
+    first = FakeChatBackend([{"content": "From the first provider."}])
+    second = FakeChatBackend([{"content": "From the second provider."}])
+    register_provider("first", first.client_factory)
+    register_provider("second", second.client_factory)
+    pool = LLMClientPool(provider="first", client_options={"timeout": 5})
+    user = {"messages": [{"role": "user", "content": "Hi"}]}
+    answers = []
+    for provider in (None, "second"):
+        agent = StandardPlannerAgent(api_key="k", client_pool=pool, provider=provider)
+        orchestrator = AsyncLocalOrchestrator(
+            agent, ToolRegistry(), InMemoryWorkingMemory()
+        )
+        async for state in orchestrator.run(user, max_steps=1):
+            answers.append(state["messages"][-1]["content"])
+    assert answers == ["From the first provider.", "From the second provider."]
+    assert pool.client("k") is not pool.client("k", provider="second")
+    assert pool.rate_limiter("k") is not pool.rate_limiter("k", provider="second")
+    with pytest.raises(UnknownProviderError):
+        pool.client("k", provider="nope")
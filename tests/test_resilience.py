@@ -0,0 +1,156 @@
+# tests/test_resilience.py
+import asyncio
+import functools
+import random
+
+import pytest
+from openai import AsyncOpenAI
+
+from janus.agent import StandardPlannerAgent
+from janus.concurrency import FairLimiter, reset_scope, set_scope
+from janus.llm_client import LLMClientPool
+from janus.mock_server import MockChatServer
+from janus.models import ChatMessage, Role
+from janus.resilience import (
+    LatencyTracker,
+    LLMTimeoutError,
+    ResilientCaller,
+    is_retryable,
+)
+from janus.tool import ToolRegistry
+
+
+def make_agent(server: MockChatServer, resilience: ResilientCaller):
+    pool = LLMClientPool(
+        client_factory=functools.partial(AsyncOpenAI, max_retries=0)
+    )
+    agent = StandardPlannerAgent(
+        api_key="test-key",
+        base_url=server.base_url,
+        client_pool=pool,
+        resilience=resilience,
+    )
+    return agent, pool
+
+
+def warmed_up(latency: float, **options) -> ResilientCaller:
+    caller = ResilientCaller(min_samples=5, min_timeout=0.01, **options)
+    for _ in range(5):
+        caller.latencies.record(latency)
+    return caller
+
+
+def test_latency_percentiles_and_adaptive_timeout():
+    tracker = LatencyTracker(window=100)
+    for i in range(1, 101):
+        tracker.record(i / 100)
+    assert tracker.percentile(0.5) == 0.5
+    assert tracker.percentile(0.95) == 0.95
+
+    caller = warmed_up(0.2, timeout_multiplier=3.0)
+    assert caller.hedge_delay() == 0.2
+    assert caller.timeout() == pytest.approx(0.6)
+    assert ResilientCaller().hedge_delay() is None
+
+
+def test_backoff_is_jittered_and_capped():
+    caller = ResilientCaller(
+        backoff_base=1.0, backoff_max=4.0, rng=random.Random(7)
+    )
+    delays = [caller.backoff(retry) for retry in range(6)]
+    assert all(0 <= d <= min(4.0, 2**i) for i, d in enumerate(delays))
+    assert len(set(delays)) == len(delays)
+    assert is_retryable(ConnectionResetError())
+    assert not is_retryable(ValueError())
+
+
+async def test_slow_request_is_hedged_against_fake_server():
+    # The first request to arrive stalls; the other one answers at once.
+    server = MockChatServer(latency=lambda n: 5.0 if n == 0 else 0.01)
+    async with server:
+        caller = warmed_up(0.1, timeout_multiplier=20.0)
+        agent, pool = make_agent(server, caller)
+        state = {"messages": [{"role": "user", "content": "hi"}]}
+        started = asyncio.get_running_loop().time()
+        result = await agent.execute(state, ToolRegistry())
+        elapsed = asyncio.get_running_loop().time() - started
+        await pool.aclose()
+    assert result["messages_to_add"][0].content == "echo: hi"
+    assert result["usage"]["total_tokens"] > 0
+    assert elapsed < 2.0
+    assert caller.hedges == 1
+    assert server.requests == 2
+
+
+async def test_errors_and_timeouts_are_retried_against_fake_server():
+    server = MockChatServer(
+        latency=lambda n: 1.0 if n == 1 else 0.0,
+        status=lambda n: 503 if n == 0 else None,
+    )
+    async with server:
+        caller = ResilientCaller(
+            hedge_percentile=None,
+            default_timeout=0.2,
+            min_timeout=0.01,
+            backoff_base=0.01,
+        )
+        agent, pool = make_agent(server, caller)
+        state = {"messages": [{"role": "user", "content": "hi"}]}
+        result = await agent.execute(state, ToolRegistry())
+
+        caller.max_retries = 0
+        server.latency = 1.0
+        with pytest.raises(LLMTimeoutError):
+            await agent.execute(state, ToolRegistry())
+        await pool.aclose()
+    assert result["messages_to_add"][0].content == "echo: hi"
+    assert caller.retries == 2 and caller.timeouts == 2
+    assert server.requests == 4
+
+
+async def test_hedge_latency_is_measured_from_its_own_start():
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1.0 if calls == 1 else 0.01)
+        return calls
+
+    caller = warmed_up(0.1, timeout_multiplier=50.0)
+    assert await caller.call(factory) == 2
+    assert caller.hedge_wins == 1
+    # The hedge was sent after about 0.1s and took about 0.01s.
+    assert caller.latencies._samples[-1] < 0.08
+
+
+async def test_hedged_attempts_each_hold_an_llm_slot():
+    llm = FairLimiter(limit=1)
+    token = set_scope("tenant", llm, FairLimiter())
+    in_flight = 0
+    peak = 0
+    calls = 0
+
+    async def call_api(messages, tools, usage=None):
+        nonlocal in_flight, peak, calls
+        calls += 1
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(0.2 if calls == 1 else 0.0)
+        finally:
+            in_flight -= 1
+        return ChatMessage(role=Role.ASSISTANT, content=str(calls))
+
+    caller = warmed_up(0.05, timeout_multiplier=50.0)
+    agent = StandardPlannerAgent(api_key="test-key", resilience=caller)
+    agent._call_openai_api = call_api
+    try:
+        result = await agent.execute({"messages": []}, ToolRegistry())
+    finally:
+        reset_scope(token)
+    # The hedge waited for the only slot instead of running beside the
+    # original attempt.
+    assert caller.hedges == 1
+    assert peak == 1
+    assert result["messages_to_add"][0].content in ("1", "2")
@@ -0,0 +1,69 @@
+# tests/test_response_cache.py
+from unittest.mock import MagicMock
+
+import pytest
+
+from janus.agent import StandardPlannerAgent
+from janus.fake_llm import FakeChatBackend
+from janus.models import ChatMessage, EventType, Role
+from janus.response_cache import LLMResponseCache, ReplayMissError
+
+MESSAGES = [{"role": "user", "content": "Hi"}]
+
+
+@pytest.fixture
+def tool_registry():
+    registry = MagicMock()
+    registry.get_schemas.return_value = []
+    return registry
+
+
+def test__key_is_content_addressed():
+    key = LLMResponseCache.key("gpt-4o", MESSAGES, [])
+    reordered = [{"content": "Hi", "role": "user"}]
+    assert key == LLMResponseCache.key("gpt-4o", reordered, [])
+    assert key != LLMResponseCache.key("gpt-4o-mini", MESSAGES, [])
+
+
+@pytest.mark.asyncio
+async def test__responses_persist_on_disk(tmp_path):
+    key = LLMResponseCache.key("gpt-4o", MESSAGES, [])
+    message = ChatMessage(role=Role.ASSISTANT, content="Hello")
+    cache = LLMResponseCache(directory=str(tmp_path))
+    assert await cache.get(key) is None
+    await cache.put(key, message)
+    assert await cache.get(key) == message
+
+    reopened = LLMResponseCache(directory=str(tmp_path))
+    assert await reopened.get(key) == message
+    assert reopened.stats()["disk_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test__replay_only_miss_raises(tmp_path):
+    cache = LLMResponseCache(directory=str(tmp_path), replay_only=True)
+    key = LLMResponseCache.key("gpt-4o", MESSAGES, [])
+    await cache.put(key, ChatMessage(role=Role.ASSISTANT, content="Hello"))
+    with pytest.raises(ReplayMissError):
+        await cache.get(key)
+
+
+@pytest.mark.asyncio
+async def test__agent_reuses_cached_response(tool_registry):
+    backend = FakeChatBackend([{"content": "Hello"}])
+    agent = StandardPlannerAgent(
+        api_key="test-key",
+        client_pool=backend.client_pool(),
+        response_cache=LLMResponseCache(),
+    )
+    state = {"messages": MESSAGES}
+    first = await agent.execute(state, tool_registry)
+    second = await agent.execute(state, tool_registry)
+    assert first["messages_to_add"] == second["messages_to_add"]
+    assert backend.request_count == 1
+
+    events = [event async for event in agent.stream(state, tool_registry)]
+    assert events[0].type == EventType.TOKEN
+    assert events[0].data == {"delta": "Hello"}
+    assert events[-1].data["messages_to_add"][0].content == "Hello"
+    assert backend.request_count == 1
@@ -0,0 +1,140 @@
+# tests/test_scheduler.py
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from janus.agent import BaseAgent
+from janus.concurrency import llm_slot
+from janus.memory import InMemoryWorkingMemory
+from janus.models import ChatMessage, Role
+from janus.orchestrator import AsyncLocalOrchestrator
+from janus.scheduler import SchedulerFullError, SessionScheduler, SessionStatus
+from janus.termination import MaxSteps
+from janus.tool import ToolRegistry
+
+
+class FakeAgent(BaseAgent):
+    def __init__(self, name: str, log: List[str], delay: float = 0.01):
+        self.name = name
+        self.log = log
+        self.delay = delay
+
+    async def execute(self, state: Dict[str, Any], tools) -> Dict[str, Any]:
+        async with llm_slot():
+            self.log.append(self.name)
+            await asyncio.sleep(self.delay)
+        return {
+            "messages_to_add": [ChatMessage(role=Role.ASSISTANT, content=self.name)]
+        }
+
+
+def make_orchestrator(name: str, log: List[str], delay: float = 0.01):
+    return AsyncLocalOrchestrator(
+        agent=FakeAgent(name, log, delay),
+        tools=ToolRegistry(),
+        memory=InMemoryWorkingMemory(),
+        # Fake agents answer directly; keep stepping up to max_steps anyway.
+        termination=MaxSteps(1000),
+    )
+
+
+@pytest.mark.asyncio
+async def test_llm_concurrency_is_bounded():
+    scheduler = SessionScheduler(llm_concurrency=3)
+    log: List[str] = []
+    handles = [
+        await scheduler.submit(
+            f"s{i}", make_orchestrator(f"s{i}", log), {}, max_steps=2
+        )
+        for i in range(10)
+    ]
+    peak = 0
+    while not all(h.done() for h in handles):
+        peak = max(peak, scheduler.llm_limiter.active)
+        await asyncio.sleep(0.001)
+    assert peak == 3
+    assert len(log) == 20
+    results = [await h.result() for h in handles]
+    assert all(len(r["messages"]) == 2 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_llm_slots_are_shared_round_robin_across_tenants():
+    scheduler = SessionScheduler(llm_concurrency=1)
+    log: List[str] = []
+    handles = [
+        await scheduler.submit(
+            f"a{i}", make_orchestrator("a", log), {}, tenant="a", max_steps=2
+        )
+        for i in range(4)
+    ]
+    handles.append(
+        await scheduler.submit("b", make_orchestrator("b", log), {}, tenant="b")
+    )
+    await asyncio.gather(*(h.result() for h in handles))
+    assert log[:4] == ["a", "b", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_admission_control_and_backpressure():
+    scheduler = SessionScheduler(max_active_sessions=1, max_queued_sessions=1)
+    log: List[str] = []
+    first = await scheduler.submit("s1", make_orchestrator("s1", log), {}, max_steps=1)
+    second = await scheduler.submit("s2", make_orchestrator("s2", log), {}, max_steps=1)
+    assert second.status == SessionStatus.QUEUED
+    with pytest.raises(SchedulerFullError):
+        await scheduler.submit("s3", make_orchestrator("s3", log), {})
+    third = await scheduler.submit(
+        "s3", make_orchestrator("s3", log), {}, max_steps=1, wait=True
+    )
+    await asyncio.gather(first.result(), second.result(), third.result())
+    assert log == ["s1", "s2", "s3"]
+
+
+@pytest.mark.asyncio
+async def test_cancel_session():
+    scheduler = SessionScheduler(max_active_sessions=1)
+    log: List[str] = []
+    running = await scheduler.submit("s1", make_orchestrator("s1", log, delay=10), {})
+    queued = await scheduler.submit("s2", make_orchestrator("s2", log), {}, max_steps=1)
+    await asyncio.sleep(0.01)
+    scheduler.cancel("s1")
+    with pytest.raises(asyncio.CancelledError):
+        await running.result()
+    assert running.status == SessionStatus.CANCELLED
+    assert await queued.result() is not None
+    assert scheduler.stats()["active_sessions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_before_first_step_releases_the_slot():
+    scheduler = SessionScheduler(max_active_sessions=1, max_queued_sessions=1)
+    log: List[str] = []
+    handle = await scheduler.submit("s1", make_orchestrator("s1", log), {})
+    handle.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(handle.result(), 1)
+    assert handle.done()
+    assert handle.status == SessionStatus.CANCELLED
+    assert scheduler.stats()["active_sessions"] == 0
+    second = await scheduler.submit(
+        "s2", make_orchestrator("s2", log), {}, max_steps=1
+    )
+    assert second.status == SessionStatus.RUNNING
+    await asyncio.wait_for(second.result(), 1)
+    assert log == ["s2"]
+
+
+@pytest.mark.asyncio
+async def test_unread_updates_are_bounded():
+    scheduler = SessionScheduler(update_buffer=2)
+    log: List[str] = []
+    handle = await scheduler.submit(
+        "s1", make_orchestrator("s1", log, delay=0), {}, max_steps=10
+    )
+    final = await handle.result()
+    # Nobody read the updates: only the last step and the end marker remain.
+    assert [len(state["messages"]) async for state in handle] == [10]
+    assert handle.dropped_updates == 9
+    assert handle.latest_state is final
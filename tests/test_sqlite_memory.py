@@ -0,0 +1,107 @@
+# tests/test_sqlite_memory.py
+import asyncio
+
+import pytest
+
+from janus.models import ChatMessage, Role
+from janus.sqlite_memory import SQLiteMemoryStore
+
+
+@pytest.fixture
+async def store(tmp_path):
+    store = SQLiteMemoryStore(str(tmp_path / "memory.db"))
+    yield store
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_add_and_get_context(store: SQLiteMemoryStore):
+    memory = store.session("s1")
+    await memory.add(ChatMessage(role=Role.USER, content="hello"))
+    await memory.add(ChatMessage(role=Role.ASSISTANT, content="hi"))
+    context = await memory.get_context()
+    assert [m["content"] for m in context["messages"]] == ["hello", "hi"]
+    assert await store.count("s1") == 2
+
+
+@pytest.mark.asyncio
+async def test_resume_loads_only_the_tail(tmp_path):
+    path = str(tmp_path / "memory.db")
+    store = SQLiteMemoryStore(path)
+    memory = store.session("s1")
+    for i in range(10):
+        await memory.add(ChatMessage(role=Role.USER, content=str(i)))
+    await store.close()
+
+    store = SQLiteMemoryStore(path)
+    resumed = store.session("s1", tail_size=3)
+    context = await resumed.get_context()
+    assert [m["content"] for m in context["messages"]] == ["7", "8", "9"]
+    older = await resumed.load_history(limit=2)
+    assert [m["content"] for m in older] == ["5", "6"]
+    await resumed.add(ChatMessage(role=Role.USER, content="10"))
+    assert await store.count("s1") == 11
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sessions_are_group_committed(store: SQLiteMemoryStore):
+    commits = []
+    insert = store._insert
+
+    def counting_insert(rows):
+        commits.append(len(rows))
+        insert(rows)
+
+    store._insert = counting_insert
+    memories = [store.session(f"s{i}") for i in range(20)]
+    await asyncio.gather(
+        *(m.add(ChatMessage(role=Role.USER, content="hi")) for m in memories)
+    )
+    assert sum(commits) == 20
+    assert len(commits) < 20
+
+
+@pytest.mark.asyncio
+async def test_tail_does_not_start_with_orphan_tool_results(store: SQLiteMemoryStore):
+    memory = store.session("s1", tail_size=2)
+    await memory.add(
+        ChatMessage(role=Role.ASSISTANT, tool_calls=[{"id": "1", "type": "function"}])
+    )
+    await memory.add(ChatMessage(role=Role.TOOL, content="sunny"))
+    await memory.add(ChatMessage(role=Role.ASSISTANT, content="It is sunny."))
+    context = await memory.get_context()
+    assert [m["role"] for m in context["messages"]] == ["assistant"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_and_failed_writes_are_not_lost_or_half_applied(tmp_path):
+    store = SQLiteMemoryStore(str(tmp_path / "memory.db"), durable=False)
+    memory = store.session("s1")
+    await memory.add(ChatMessage(role=Role.USER, content="hello"))
+    await asyncio.sleep(0)  # the writer starts its insert
+    store._writer.cancel()
+    await asyncio.gather(store._writer, return_exceptions=True)
+    await store.flush()
+    assert await store.count("s1") == 1
+
+    durable = SQLiteMemoryStore(str(tmp_path / "memory.db"))
+    memory = durable.session("s1")
+    insert = durable._insert
+
+    def failing_insert(rows):
+        raise OSError("disk full")
+
+    durable._insert = failing_insert
+    with pytest.raises(OSError):
+        await memory.add(ChatMessage(role=Role.ASSISTANT, content="lost"))
+    durable._insert = insert
+    await memory.add(ChatMessage(role=Role.ASSISTANT, content="hi"))
+    context = await memory.get_context()
+    assert [m["content"] for m in context["messages"]] == ["hello", "hi"]
+    assert [m["content"] for m in await memory.load_history(10, 10)] == [
+        "hello",
+        "hi",
+    ]
+    await store.close()
+    await durable.close()
@@ -0,0 +1,62 @@
+# tests/test_termination.py
+import pytest
+
+from janus.models import ChatMessage, Role
+from janus.termination import (
+    Converged,
+    CostBudget,
+    MaxSteps,
+    RunProgress,
+    StopReason,
+    TimeBudget,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test__converged_only_without_tool_calls():
+    progress = RunProgress()
+    progress.record_step(
+        [ChatMessage(role=Role.ASSISTANT, tool_calls=[{"id": "1"}])], None
+    )
+    assert Converged().check(progress) is None
+    progress.record_step([{"role": "assistant", "content": "Done"}], None)
+    assert Converged().check(progress) == StopReason.CONVERGED
+
+
+def test__combined_policies_report_first_reason():
+    clock = FakeClock()
+    progress = RunProgress(clock=clock)
+    policy = TimeBudget(5) | MaxSteps(2)
+    progress.record_step([], None)
+    assert policy.check(progress) is None
+    clock.now = 6
+    assert policy.check(progress) == StopReason.TIME_BUDGET
+    clock.now = 0
+    progress.record_step([], None)
+    assert policy.check(progress) == StopReason.MAX_STEPS
+
+
+def test__cost_budget_uses_token_prices():
+    budget = CostBudget(
+        0.01, prompt_price_per_million=2.5, completion_price_per_million=10
+    )
+    progress = RunProgress()
+    progress.record_step([], {"prompt_tokens": 2000, "completion_tokens": 400})
+    assert budget.estimate(progress) == pytest.approx(0.009)
+    assert budget.check(progress) is None
+    progress.record_step([], {"prompt_tokens": 400, "completion_tokens": 0})
+    assert budget.check(progress) == StopReason.COST_BUDGET
+
+
+def test__invalid_budgets_raise():
+    with pytest.raises(ValueError):
+        MaxSteps(0)
+    with pytest.raises(ValueError):
+        TimeBudget(0)
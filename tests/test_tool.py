@@ -1,8 +1,17 @@
 # tests/test_tool.py
+import asyncio
+import threading
+from typing import Any, Dict, List
+
 import pytest
 from pydantic import BaseModel
 
-from janus.tool import ToolRegistry, agent_tool
+from janus.tool import (
+    ExecutionMode,
+    ToolArgumentsError,
+    ToolRegistry,
+    agent_tool,
+)
 
 
 class DummySchema(BaseModel):
@@ -56,3 +65,193 @@ def test_get_schemas(tool_registry: ToolRegistry):
     assert function_spec["name"] == "dummy_tool"
     assert function_spec["description"] == "A dummy tool for testing."
     assert "arg1" in function_spec["parameters"]["properties"]
+
+
+def make_counting_tool(delay: float = 0.0, **cache_options):
+    calls = []
+
+    @agent_tool(args_schema=DummySchema, cacheable=True, **cache_options)
+    async def counting_tool(arg1: str, arg2: int):
+        """Counts its invocations."""
+        calls.append((arg1, arg2))
+        await asyncio.sleep(delay)
+        return f"{arg1}-{arg2}"
+
+    return counting_tool, calls
+
+
+@pytest.mark.asyncio
+async def test_cacheable_tool_results_are_reused(tool_registry: ToolRegistry):
+    counting_tool, calls = make_counting_tool()
+    tool_registry.register(counting_tool)
+    assert await tool_registry.execute("counting_tool", arg1="a", arg2=1) == "a-1"
+    assert await tool_registry.execute("counting_tool", arg2="1", arg1="a") == "a-1"
+    await tool_registry.execute("counting_tool", arg1="b", arg2=1)
+    assert len(calls) == 2
+    stats = tool_registry.cache_stats()["counting_tool"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_are_coalesced(tool_registry: ToolRegistry):
+    counting_tool, calls = make_counting_tool(delay=0.01)
+    tool_registry.register(counting_tool)
+    results = await asyncio.gather(
+        *(tool_registry.execute("counting_tool", arg1="a", arg2=1) for _ in range(5))
+    )
+    assert results == ["a-1"] * 5
+    assert len(calls) == 1
+    assert tool_registry.cache_stats()["counting_tool"]["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_side_effect_free_tools_are_coalesced(tool_registry: ToolRegistry):
+    calls = []
+
+    @agent_tool(args_schema=DummySchema, side_effect_free=True)
+    async def lookup_tool(arg1: str, arg2: int):
+        """Reads without side effects."""
+        calls.append(arg1)
+        await asyncio.sleep(0.01)
+        return arg1
+
+    tool_registry.register(lookup_tool)
+    await asyncio.gather(
+        *(tool_registry.execute("lookup_tool", arg1="a", arg2=1) for _ in range(3)),
+        tool_registry.execute("lookup_tool", arg1="b", arg2=1),
+    )
+    assert calls == ["a", "b"]
+    stats = tool_registry.coalescing_stats()
+    assert stats["saved"] == 2
+    assert stats["by_tool"] == {"lookup_tool": 2}
+    # Once finished, calls run again: results are not cached.
+    await tool_registry.execute("lookup_tool", arg1="a", arg2=1)
+    assert calls == ["a", "b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_non_cacheable_tools_always_run(tool_registry: ToolRegistry):
+    tool_registry.register(dummy_tool)
+    await tool_registry.execute("dummy_tool", arg1="test", arg2=123)
+    assert tool_registry.cache_stats() == {}
+
+
+def test_get_schemas_is_cached_until_registry_changes(tool_registry: ToolRegistry):
+    tool_registry.register(dummy_tool)
+    schemas = tool_registry.get_schemas()
+    assert tool_registry.get_schemas() is schemas
+    counting_tool, _ = make_counting_tool()
+    tool_registry.register(counting_tool)
+    assert len(tool_registry.get_schemas()) == 2
+
+
+@pytest.mark.asyncio
+async def test_execute_json_validates_arguments(tool_registry: ToolRegistry):
+    tool_registry.register(dummy_tool)
+    arguments = '{"arg1": "a", "arg2": "7"}'
+    result = await tool_registry.execute_json("dummy_tool", arguments)
+    assert result == "a-7"
+    with pytest.raises(ToolArgumentsError):
+        await tool_registry.execute_json("dummy_tool", '{"arg1": "a"}')
+    with pytest.raises(ToolArgumentsError):
+        await tool_registry.execute_json("dummy_tool", "not json")
+
+
+class Stop(BaseModel):
+    city: str
+    nights: int
+
+
+class TripArgs(BaseModel):
+    traveller: str
+    stops: List[Stop]
+
+
+@agent_tool(args_schema=TripArgs)
+async def plan_trip(traveller: str, stops: List[Dict[str, Any]]) -> str:
+    """Plans a trip."""
+    assert all(type(stop) is dict for stop in stops)
+    return ", ".join(f"{stop['city']}x{stop['nights']}" for stop in stops)
+
+
+@pytest.mark.asyncio
+async def test_nested_arguments_reach_tools_as_plain_dicts(
+    tool_registry: ToolRegistry,
+):
+    tool_registry.register(plan_trip)
+    arguments = '{"traveller": "ada", "stops": [{"city": "Oslo", "nights": "2"}]}'
+    assert await tool_registry.execute_json("plan_trip", arguments) == "Oslox2"
+    result = await tool_registry.execute(
+        "plan_trip", traveller="ada", stops=[{"city": "Rome", "nights": 1}]
+    )
+    assert result == "Romex1"
+
+
+class SquareArgs(BaseModel):
+    n: int
+
+
+@agent_tool(args_schema=SquareArgs, execution=ExecutionMode.PROCESS)
+def square(n: int) -> int:
+    """Squares a number in a worker process."""
+    return n * n
+
+
+@pytest.mark.asyncio
+async def test_sync_tools_run_on_thread_pool(tool_registry: ToolRegistry):
+    @agent_tool(args_schema=DummySchema)
+    def blocking_tool(arg1: str, arg2: int):
+        """A blocking tool."""
+        return threading.current_thread().name
+
+    tool_registry.register(blocking_tool)
+    thread_name = await tool_registry.execute("blocking_tool", arg1="a", arg2=1)
+    assert thread_name.startswith("janus-tool")
+    stats = tool_registry.executor_stats()["thread"]
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+    tool_registry.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_thread_pool_queue_is_bounded():
+    tool_registry = ToolRegistry(max_thread_workers=1, max_thread_queue=1)
+    release = threading.Event()
+
+    @agent_tool(args_schema=DummySchema)
+    def blocking_tool(arg1: str, arg2: int):
+        """A blocking tool."""
+        release.wait(5)
+        return arg2
+
+    tool_registry.register(blocking_tool)
+    calls = [
+        asyncio.ensure_future(tool_registry.execute("blocking_tool", arg1="a", arg2=i))
+        for i in range(4)
+    ]
+    await asyncio.sleep(0.05)
+    stats = tool_registry.executor_stats()["thread"]
+    assert stats["in_flight"] == 2
+    assert stats["queued"] == 1
+    assert stats["waiting"] == 2
+    release.set()
+    assert await asyncio.gather(*calls) == [0, 1, 2, 3]
+    tool_registry.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_tool(tool_registry: ToolRegistry):
+    tool_registry.register(square)
+    assert await tool_registry.execute_json("square", '{"n": 12}') == 144
+    assert tool_registry.executor_stats()["process"]["completed"] == 1
+    tool_registry.shutdown()
+
+
+def test_async_tool_cannot_use_process_pool(tool_registry: ToolRegistry):
+    @agent_tool(args_schema=DummySchema, execution="process")
+    async def async_tool(arg1: str, arg2: int):
+        """An async tool."""
+
+    with pytest.raises(ValueError):
+        tool_registry.register(async_tool)
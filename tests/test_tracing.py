@@ -0,0 +1,110 @@
+# tests/test_tracing.py
+import json
+import random
+
+import pytest
+
+from janus import tracing
+from janus.agent import StandardPlannerAgent
+from janus.fake_llm import FakeChatBackend
+from janus.memory import InMemoryWorkingMemory
+from janus.models import WeatherArgs
+from janus.orchestrator import AsyncLocalOrchestrator
+from janus.tool import ToolRegistry, agent_tool
+from janus.tracing import (
+    JSONLExporter,
+    LatencyHistogram,
+    RingBufferExporter,
+    Tracer,
+)
+
+
+@pytest.fixture
+def exporter():
+    exporter = RingBufferExporter(capacity=100)
+    tracer = Tracer(exporter, batch_size=1)
+    tracing.set_tracer(tracer)
+    yield exporter
+    tracing.set_tracer(None)
+
+
+def test_histogram_percentiles_are_accurate():
+    histogram = LatencyHistogram()
+    values = [random.Random(i).uniform(0.0001, 30.0) for i in range(5000)]
+    for value in values:
+        histogram.record(value)
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.99):
+        exact = ordered[int(q * len(ordered)) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=0.01)
+    assert histogram.percentile(1.0) == pytest.approx(max(values), rel=0.01)
+
+    other = LatencyHistogram()
+    other.record(100.0)
+    histogram.merge(other)
+    assert histogram.count == 5001 and histogram.max == 100.0
+
+
+def test_spans_nest_and_are_exported(exporter):
+    with tracing.span("outer") as outer:
+        with tracing.span("inner", size=3):
+            pass
+        outer.set("done", True)
+    with pytest.raises(KeyError):
+        with tracing.span("failing"):
+            raise KeyError("x")
+    inner, outer_dict, failing = exporter.spans()
+    assert inner["parent_id"] == outer_dict["span_id"]
+    assert inner["trace_id"] == outer_dict["trace_id"]
+    assert inner["attributes"] == {"size": 3}
+    assert outer_dict["attributes"] == {"done": True}
+    assert failing["error"] == "KeyError" and failing["parent_id"] is None
+    summary = tracing.get_tracer().latency_summary()
+    assert summary["outer"]["count"] == 1
+
+
+def test_jsonl_exporter_writes_off_the_calling_thread(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    exporter = JSONLExporter(str(path), flush_interval=60)
+    tracer = Tracer(exporter, batch_size=2)
+    for i in range(3):
+        with tracer.span("op", i=i):
+            pass
+    # The first batch is queued, not written, when the span finishes.
+    assert exporter.pipeline.stats()["pending"] == 2
+    assert path.read_text() == ""
+    tracer.close()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["attributes"]["i"] for line in lines] == [0, 1, 2]
+
+
+async def test_orchestrator_step_spans_cover_llm_tools_and_memory(exporter):
+    @agent_tool(args_schema=WeatherArgs)
+    async def get_weather(location: str) -> str:
+        """Gets the weather."""
+        return "Sunny"
+
+    tools = ToolRegistry()
+    tools.register(get_weather)
+    backend = FakeChatBackend(
+        [
+            {"tool_calls": [{"name": "get_weather", "arguments": {"location": "SF"}}]},
+            {"content": "It is sunny."},
+        ]
+    )
+    agent = StandardPlannerAgent(api_key="test-key", client_pool=backend.client_pool())
+    orchestrator = AsyncLocalOrchestrator(agent, tools, InMemoryWorkingMemory())
+    user = {"messages": [{"role": "user", "content": "Weather?"}]}
+    [state async for state in orchestrator.run(user)]
+
+    steps = exporter.spans("orchestrator.step")
+    assert [s["attributes"]["step"] for s in steps] == [1, 2]
+    assert steps[0]["attributes"]["prompt_tokens"] > 0
+    step_ids = {s["span_id"] for s in steps}
+    for name in ("llm.call", "tool.execute", "memory.add", "memory.get_context"):
+        assert exporter.spans(name)
+        assert all(s["parent_id"] in step_ids for s in exporter.spans(name))
+    llm_call = exporter.spans("llm.call")[1]
+    assert llm_call["attributes"]["response_chars"] == len("It is sunny.")
+    tool_call = exporter.spans("tool.execute")[0]
+    assert tool_call["attributes"]["result_chars"] == len("Sunny")
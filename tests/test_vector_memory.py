@@ -0,0 +1,92 @@
+# tests/test_vector_memory.py
+import numpy as np
+import pytest
+
+from janus.models import ChatMessage, Role
+from janus.vector_memory import HashingEmbedder, VectorMemory
+
+TOPICS = ["weather", "football", "cooking", "finance", "music", "travel"]
+
+
+@pytest.fixture
+def embedder():
+    return HashingEmbedder(dim=64)
+
+
+@pytest.mark.asyncio
+async def test_hashing_embedder_is_deterministic(embedder: HashingEmbedder):
+    first = await embedder(["sunny weather in SF"])
+    second = await HashingEmbedder(dim=64)(["sunny weather in SF"])
+    assert np.array_equal(first, second)
+
+
+@pytest.mark.asyncio
+async def test_search_returns_most_similar_entries(embedder: HashingEmbedder):
+    memory = VectorMemory(embedder, initial_capacity=2)
+    await memory.add_many(
+        [ChatMessage(role=Role.USER, content=f"I like {topic}") for topic in TOPICS]
+    )
+    assert len(memory) == len(TOPICS)
+    hits = await memory.search("cooking", k=2)
+    assert hits[0].message["content"] == "I like cooking"
+    assert hits[0].score > hits[1].score
+    context = await memory.get_context()
+    assert len(context["messages"]) == len(TOPICS)
+
+
+@pytest.mark.asyncio
+async def test_search_many_matches_single_queries(embedder: HashingEmbedder):
+    memory = VectorMemory(embedder)
+    for topic in TOPICS:
+        await memory.add(ChatMessage(role=Role.USER, content=f"talk about {topic}"))
+    batched = await memory.search_many(["music", "travel"], k=3)
+    assert batched == [
+        await memory.search("music", k=3),
+        await memory.search("travel", k=3),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ivf_index_with_full_probe_matches_exact_search(
+    embedder: HashingEmbedder,
+):
+    entries = [
+        ChatMessage(role=Role.USER, content=f"{topic} note {i}")
+        for i in range(50)
+        for topic in TOPICS
+    ]
+    exact = VectorMemory(embedder)
+    indexed = VectorMemory(embedder, n_partitions=4, n_probe=4, index_threshold=100)
+    await exact.add_many(entries[:200])
+    await indexed.add_many(entries[:200])
+    await exact.add_many(entries[200:])
+    await indexed.add_many(entries[200:])
+    assert indexed.indexed
+    assert sum(indexed._list_sizes) == len(entries)
+    for query in ["finance note 7", "music"]:
+        exact_hits = await exact.search(query, k=5)
+        indexed_hits = await indexed.search(query, k=5)
+        assert [h.score for h in indexed_hits] == pytest.approx(
+            [h.score for h in exact_hits]
+        )
+
+
+@pytest.mark.asyncio
+async def test_ivf_index_is_retrained_as_the_memory_grows(embedder: HashingEmbedder):
+    entries = [
+        ChatMessage(role=Role.USER, content=f"{topic} note {i}")
+        for i in range(50)
+        for topic in TOPICS
+    ]
+    memory = VectorMemory(embedder, n_partitions=4, index_threshold=20)
+    once = VectorMemory(
+        embedder, n_partitions=4, index_threshold=20, retrain_growth=None
+    )
+    for start in range(0, 80, 10):
+        await memory.add_many(entries[start : start + 10])
+        await once.add_many(entries[start : start + 10])
+    assert memory._trained_count == 80
+    assert once._trained_count == 20
+    assert sum(memory._list_sizes) == sum(once._list_sizes) == 80
+    with pytest.raises(ValueError):
+        VectorMemory(embedder, retrain_growth=1.0)